@@ -0,0 +1,55 @@
+# backend/applyday/ai/cache.py
+# Content-addressed store of LLM extraction results shared by every worker.
+import hashlib
+import json
+import re
+from typing import Optional
+
+from django.conf import settings
+
+from analysis.tools.sqlite_store import SQLiteLRUStore
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Collapses whitespace so that re-pasted copies of a JD share one entry."""
+    return _WS.sub(" ", text or "").strip()
+
+
+def extraction_key(text: Optional[str], prompt: str, provider: str, model: str, schema_version: str) -> str:
+    """Returns the cache key of a JD text extracted with this prompt, model and output schema."""
+    payload = json.dumps([normalize_text(text), prompt, provider, model, schema_version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache(SQLiteLRUStore):
+    """
+    SQLite-backed store of validated extraction results (JobSchema JSON).
+    Entries are keyed by `extraction_key`, so a change of prompt, model or schema
+    never serves stale results. Entries older than `max_age` seconds are expired
+    and the least recently used ones are evicted once the store grows past
+    `max_entries`. Hits and misses are counted in the store, across workers.
+    Args:
+        path (str): Path of the SQLite file, created on first use.
+        max_entries (int): Maximum number of cached results.
+        max_age (float): Maximum age of an entry in seconds (None keeps entries forever).
+    Methods:
+        get_many(keys): Returns the cached JSON of the given keys and counts hits and misses.
+        put_many(entries): Stores results and evicts expired and old entries.
+        stats(): Returns the number of entries, hits, misses and the hit rate.
+        clear(): Removes every entry and resets the counters.
+    """
+    table = "extraction_results"
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Returns the cache configured by the AI_EXTRACTION_CACHE_* settings, or None when disabled."""
+    if not settings.AI_EXTRACTION_CACHE_PATH:
+        return None
+    max_age_days = settings.AI_EXTRACTION_CACHE_MAX_AGE_DAYS
+    return ExtractionCache(
+        settings.AI_EXTRACTION_CACHE_PATH,
+        max_entries=settings.AI_EXTRACTION_CACHE_MAX_ENTRIES,
+        max_age=max_age_days * 86400 if max_age_days > 0 else None,
+    )
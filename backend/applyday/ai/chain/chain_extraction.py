@@ -1,44 +1,63 @@
 # ai/chain/jd_extract_chain.py
 # Build a LangChain chain to extract job description info using LLMs
+import hashlib
+import json
 import logging
-import sys, traceback
-from typing import Optional
+import traceback
+from typing import List, Optional
 from dotenv import load_dotenv
 load_dotenv() # Load environment variables from .env file
 from langchain.prompts import PromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 
-from ai.schema.jd_schema import JobSchema
+from ai.schema.jd_schema import JobSchema, SCHEMA_VERSION
 from ai.factory import get_llm
+from ai.cache import ExtractionCache, extraction_key, get_extraction_cache, normalize_text
 
 logger = logging.getLogger(__name__)
 
-def build_chain():
+# Prompt of the extraction chain; part of every extraction cache key
+EXTRACTION_PROMPT = (
+    "You are an information extractor. Extract job information from the following JD.\n"
+    "IMPORTANT rules:\n"
+    "- For `level`, only use one of: intern, junior, mid, senior, lead, manager.\n"
+    "- For `employment_type`, only use: full_time, contract, internship, part_time.\n"
+    "- For `remote_work`, only use: on-site, hybrid, remote.\n"
+    "- For `salary_eur_min` and `salary_eur_max`, output numeric values in euros (no units like k).\n"
+    "- For `location`, if available, always format as 'City, Country'.\n"
+    "- For skills/benefits lists, always return an array of strings.\n\n"
+    "- For `location`, if available, format as 'City, Country' (e.g., 'Dublin, Ireland').\n"
+    "{format_instructions}\n\n"
+    "JD:\n{jd_text}"
+)
+# Serialized once: the output schema only changes with the code
+SCHEMA_HASH = "{}:{}".format(
+    SCHEMA_VERSION,
+    hashlib.sha256(json.dumps(JobSchema.model_json_schema(), sort_keys=True).encode("utf-8")).hexdigest(),
+)
+_CACHE_METADATA = "extraction_cache"
+
+
+def build_chain(model=None):
     """
     Build a LangChain chain for extracting structured job description info.
     Uses a prompt template with specific instructions and a Pydantic output parser.
+    `model` defaults to the configured LLM (see ai.factory.get_llm). The chain carries
+    the provider and model name its extraction results are cached under.
     """
     try:
         parser = PydanticOutputParser(pydantic_object=JobSchema)
         prompt = PromptTemplate(
-            template=(
-                "You are an information extractor. Extract job information from the following JD.\n"
-                "IMPORTANT rules:\n"
-                "- For `level`, only use one of: intern, junior, mid, senior, lead, manager.\n"
-                "- For `employment_type`, only use: full_time, contract, internship, part_time.\n"
-                "- For `remote_work`, only use: on-site, hybrid, remote.\n"
-                "- For `salary_eur_min` and `salary_eur_max`, output numeric values in euros (no units like k).\n"
-                "- For `location`, if available, always format as 'City, Country'.\n"
-                "- For skills/benefits lists, always return an array of strings.\n\n"
-                "- For `location`, if available, format as 'City, Country' (e.g., 'Dublin, Ireland').\n"
-                "{format_instructions}\n\n"
-                "JD:\n{jd_text}"
-            ),
+            template=EXTRACTION_PROMPT,
             input_variables=["jd_text"],
             partial_variables={"format_instructions": parser.get_format_instructions()},
         )
-        model = get_llm()
-        chain = prompt | model | parser
+        model = model or get_llm()
+        provider = getattr(model, "_llm_type", type(model).__name__)
+        model_name = getattr(model, "model_name", None) or getattr(model, "model", None) or ""
+        chain = (prompt | model | parser).with_config(
+            metadata={_CACHE_METADATA: {"provider": provider, "model": str(model_name)}}
+        )
         logger.info("✅ Chain constructed.\n")
         return chain
     except Exception as e:
@@ -46,13 +65,82 @@ def build_chain():
         traceback.print_exc()
         raise RuntimeError(f"Failed to construct extraction chain: {e}")
 
-def extract_job_description(chain, jd_text:Optional[str]) -> JobSchema:
-    """Invoke the extraction chain on the provided job description text."""
+
+def _cache_identity(chain) -> Optional[dict]:
+    """Provider and model of a chain built by build_chain; None for any other chain, whose results are not cached."""
+    config = getattr(chain, "config", None) or {}
+    return (config.get("metadata") or {}).get(_CACHE_METADATA)
+
+
+def extraction_cache_key(identity: dict, jd_text: Optional[str]) -> str:
+    """Returns the ExtractionCache key of a JD text for a chain with the given `_cache_identity`."""
+    return extraction_key(jd_text, EXTRACTION_PROMPT, identity["provider"], identity["model"], SCHEMA_HASH)
+
+
+def _usable_cache(chain, cache: Optional[ExtractionCache]):
+    """Returns (cache, identity) when results of `chain` can be cached, else (None, None)."""
+    cache = cache if cache is not None else get_extraction_cache()
+    identity = _cache_identity(chain) if cache is not None else None
+    return (cache, identity) if identity is not None else (None, None)
+
+
+def extract_job_description(chain, jd_text:Optional[str], cache: ExtractionCache = None) -> JobSchema:
+    """
+    Invoke the extraction chain on the provided job description text.
+    The extraction cache (`cache`, default: the configured one) is consulted first,
+    and a new result is stored in it.
+    """
+    cache, identity = _usable_cache(chain, cache)
+    key = extraction_cache_key(identity, jd_text) if cache is not None else None
+    if cache is not None:
+        cached = cache.get_many([key])
+        if key in cached:
+            return JobSchema.model_validate_json(cached[key])
     try:
         one = chain.invoke({"jd_text": jd_text})
         logger.info("✅ Single invoke OK. Sample output keys: %s", list(one.dict().keys())[:5])
-        return one
     except Exception as e:
         logger.error("❌ Single invoke error: %s", repr(e))
         traceback.print_exc()
         raise RuntimeError(f"Failed to invoke extraction chain: {e}")
+    if cache is not None:
+        cache.put_many({key: one.model_dump_json()})
+    return one
+
+
+async def aextract_job_descriptions(chain, jd_texts: List[Optional[str]], max_concurrency: int = 8,
+                                    cache: ExtractionCache = None) -> list:
+    """
+    Invoke the extraction chain on many job description texts concurrently.
+    At most `max_concurrency` LLM calls are in flight at once. A failed text yields
+    its exception in place of a JobSchema, so one bad JD does not fail the batch.
+    Texts found in the extraction cache (`cache`, default: the configured one) and
+    repeated texts are not sent to the LLM again.
+    """
+    cache, identity = _usable_cache(chain, cache)
+    # Repeated texts are extracted once; cache keys are only built when there is a cache
+    if cache is not None:
+        keys = [extraction_cache_key(identity, text) for text in jd_texts]
+    else:
+        keys = [normalize_text(text) for text in jd_texts]
+    results = {}
+    if cache is not None:
+        results = {key: JobSchema.model_validate_json(value) for key, value in cache.get_many(keys).items()}
+    texts = dict(zip(keys, jd_texts))
+    missing = [key for key in texts if key not in results]
+
+    extracted = await chain.abatch(
+        [{"jd_text": texts[key]} for key in missing],
+        config={"max_concurrency": max_concurrency},
+        return_exceptions=True,
+    )
+    results.update(zip(missing, extracted))
+    failed = sum(isinstance(result, Exception) for result in extracted)
+    logger.info("✅ Batch invoke done: %d cached, %d ok, %d failed.",
+                len(texts) - len(missing), len(missing) - failed, failed)
+    if cache is not None:
+        cache.put_many({
+            key: result.model_dump_json()
+            for key, result in zip(missing, extracted) if not isinstance(result, Exception)
+        })
+    return [results[key] for key in keys]
@@ -0,0 +1,26 @@
+# backend/applyday/ai/management/commands/extraction_cache.py
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.cache import get_extraction_cache
+
+
+class Command(BaseCommand):
+    help = "Print the size and hit rate of the LLM extraction cache, or empty it with --clear."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clear", action="store_true", help="Remove every entry and reset the counters.")
+
+    def handle(self, *args, **options):
+        cache = get_extraction_cache()
+        if cache is None:
+            raise CommandError("The extraction cache is disabled (AI_EXTRACTION_CACHE_PATH is empty).")
+        if options["clear"]:
+            cache.clear()
+            self.stdout.write(self.style.SUCCESS("Extraction cache cleared."))
+            return
+
+        stats = cache.stats()
+        hit_rate = "-" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}"
+        self.stdout.write(
+            f"{stats['entries']} entries, {stats['hits']} hits, {stats['misses']} misses, hit rate {hit_rate}"
+        )
@@ -71,6 +71,9 @@ def to_bool_or_none(v):
             return False
     return None
 
+# Part of every extraction cache key; bump it when a validator changes what is stored
+SCHEMA_VERSION = 1
+
 # Define which fields are arrays for normalization
 ARRAY_FIELDS = [
     "benefits","responsibilities","required_core_skills","desirable_skills",
@@ -1,24 +1,103 @@
 #backend/applyday/ai/services/extract_jd.py
-# Author: Zhuang Xiaojian 
+# Author: Zhuang Xiaojian
 import logging
 from datetime import datetime
 
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
 from application.models import JobDescriptionText, JobDescription
-from ai.chain.chain_extraction import build_chain, extract_job_description
-from ai.schema.jd_schema import JobSchema
+from ai.cache import get_extraction_cache
+from ai.chain.chain_extraction import build_chain, extract_job_description, aextract_job_descriptions
+from analysis import duplicates
+from analysis.signals import sync_bulk_created
 
 logger = logging.getLogger(__name__)
 
-def process_extract(job_ids=None, start=None, end=None):
+
+def extraction_concurrency() -> int:
+    """Maximum number of concurrent LLM extraction calls (AI_EXTRACTION_CONCURRENCY, 1 = sequential)."""
+    return max(1, settings.AI_EXTRACTION_CONCURRENCY)
+
+
+def _extract_sequentially(chain, jd_texts, cache=None):
+    """Extracts one text at a time; a failed text yields its exception, like aextract_job_descriptions."""
+    results = []
+    for text in jd_texts:
+        try:
+            results.append(extract_job_description(chain, text, cache=cache))
+        except RuntimeError as e:
+            results.append(e)
+    return results
+
+
+def split_extracted(texts):
+    """
+    Splits a JobDescriptionText queryset with two queries, whatever its size.
+    Returns:
+        tuple (existing, pending): the JobDescriptions of the already extracted texts,
+        and the texts without a JobDescription.
+    """
+    existing = list(JobDescription.objects.filter(job_text__in=texts.values("id")))
+    pending = list(texts.filter(text_description__isnull=True))
+    return existing, pending
+
+
+def save_extracted(objs):
+    """
+    Inserts new JobDescriptions with one bulk insert, skipping the texts that got a
+    JobDescription since they were found pending, e.g. from a concurrent extraction.
+    Returns:
+        tuple (created, existing): the inserted JobDescriptions, and the ones found
+        for texts of `objs` that were extracted elsewhere.
+    """
+    text_ids = [obj.job_text_id for obj in objs]
+    with transaction.atomic():
+        # Re-check inside the transaction: the LLM calls leave plenty of time for another worker
+        existing = list(JobDescription.objects.filter(job_text_id__in=text_ids))
+        taken = {jd.job_text_id for jd in existing}
+        objs = [obj for obj in objs if obj.job_text_id not in taken]
+        try:
+            with transaction.atomic():
+                created = JobDescription.objects.bulk_create(objs)
+                # bulk_create sends no post_save, so update the aggregates and the snapshot explicitly
+                sync_bulk_created(created)
+        except IntegrityError:
+            # A text was extracted after the check: save one row at a time (post_save updates
+            # the aggregates and the snapshot) so one conflict does not drop the whole batch
+            logger.warning("Concurrent extraction detected, saving %d JobDescriptions one by one", len(objs))
+            created = []
+            for obj in objs:
+                try:
+                    with transaction.atomic():
+                        obj.save()
+                    created.append(obj)
+                except IntegrityError:
+                    obj.pk = None
+                    taken.add(obj.job_text_id)
+            existing = list(JobDescription.objects.filter(job_text_id__in=taken))
+    return created, existing
+
+
+def process_extract(job_ids=None, start=None, end=None, concurrency=None, chain=None, reuse_duplicates=None):
     """
     Process job description extraction for given job IDs or date range.
     If no parameters are provided, process all JobDescriptionText entries.
+    Texts without a JobDescription are sent to the LLM up to `concurrency` at a time,
+    unless their result is in the extraction cache; a text whose extraction fails is
+    logged and skipped, and the extracted JobDescriptions are written with one bulk insert.
+    With `reuse_duplicates` (default ANALYSIS_DUPLICATE_REUSE), a text whose near-duplicate
+    is already extracted gets that JobDescription instead of an extraction of its own.
     Args:
         job_ids (list of int, optional): List of JobDescriptionText IDs to process.
         start (str, optional): Start date in ISO format (YYYY-MM-DD).
         end (str, optional): End date in ISO format (YYYY-MM-DD).
+        concurrency (int, optional): Maximum concurrent LLM calls; defaults to AI_EXTRACTION_CONCURRENCY.
+        chain (optional): Extraction chain; defaults to build_chain().
+        reuse_duplicates (bool, optional): Reuse the JobDescriptions of near-duplicate texts.
     Returns:
-        list of JobDescription: Created JobDescription instances.
+        list of JobDescription: Existing, reused and created JobDescription instances.
     """
     qs = JobDescriptionText.objects.all()
 
@@ -28,24 +107,46 @@ def process_extract(job_ids=None, start=None, end=None):
         start_dt = datetime.fromisoformat(start)
         end_dt = datetime.fromisoformat(end)
         qs = qs.filter(created_at__range=[start_dt, end_dt])
-    
-    chain = build_chain()
-    results = []
 
-    for job in qs:
-        # Check JobDescription
-        jd = JobDescription.objects.filter(job_text=job).first()
-        if jd:
-            print(f"JobDescription exists, skipping extraction: {job.id}")
-            results.append(jd)
-            continue  # Skip LLM extraction
+    # Skip LLM extraction for the texts that already have a JobDescription
+    results, pending = split_extracted(qs)
+    if results:
+        logger.info("%d JobDescriptions exist, skipping their extraction", len(results))
 
-        # Only run LLM if not exists
-        obj: JobSchema = extract_job_description(chain, job.text)
-        data = obj.model_dump()
-        print("Extracted data:", data)
+    reuse_duplicates = settings.ANALYSIS_DUPLICATE_REUSE if reuse_duplicates is None else reuse_duplicates
+    if reuse_duplicates and pending:
+        reused = duplicates.extracted_duplicates(pending)
+        if reused:
+            logger.info("Reusing the JobDescriptions of %d near-duplicate texts", len(reused))
+            seen = {jd.id for jd in results}
+            results += [jd for jd in {jd.id: jd for jd in reused.values()}.values() if jd.id not in seen]
+            pending = [job for job in pending if job.id not in reused]
 
-        jd = JobDescription.objects.create(job_text=job, **data)
-        results.append(jd)
+    if not pending:
+        return results
 
-    return results
+    # Only run LLM for the texts without a JobDescription
+    chain = chain or build_chain()
+    concurrency = concurrency or extraction_concurrency()
+    cache = get_extraction_cache()
+    texts = [job.text for job in pending]
+    if concurrency > 1:
+        extracted = async_to_sync(aextract_job_descriptions)(chain, texts, max_concurrency=concurrency, cache=cache)
+    else:
+        extracted = _extract_sequentially(chain, texts, cache=cache)
+    if cache is not None:
+        logger.info("Extraction cache: %s", cache.stats())
+
+    objs = []
+    for job, obj in zip(pending, extracted):
+        if isinstance(obj, Exception):
+            logger.error("Extraction failed for JobDescriptionText %s: %r", job.id, obj)
+            continue
+        objs.append(JobDescription(job_text=job, **obj.model_dump()))
+
+    created, existing = save_extracted(objs)
+    if existing:
+        logger.info("%d texts were extracted concurrently, keeping their JobDescriptions", len(existing))
+    logger.info("Extracted %d of %d job descriptions", len(created), len(pending))
+
+    return results + existing + created
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from langchain_core.runnables import RunnableLambda
+
+from ai.cache import ExtractionCache, extraction_key
+from ai.chain.chain_extraction import aextract_job_descriptions, build_chain, extract_job_description
+from ai.schema.jd_schema import JobSchema
+from ai.tests.test_extract_jd import FakeExtractionLLM
+from asgiref.sync import async_to_sync
+
+
+class ExtractionCacheTest(SimpleTestCase):
+    """Test cases for the persistent ExtractionCache."""
+
+    def setUp(self):
+        """Set up a cache in a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ExtractionCache(os.path.join(self.tmpdir.name, "extractions.sqlite3"), max_entries=2)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_keys_ignore_whitespace_but_not_prompt_model_or_schema(self):
+        """Test that re-pasted text shares a key while any other input changes it."""
+        key = extraction_key("Backend  engineer\n python ", "prompt", "openai", "gpt-4o-mini", "1")
+
+        self.assertEqual(key, extraction_key("Backend engineer python", "prompt", "openai", "gpt-4o-mini", "1"))
+        for args in (
+            ("Frontend engineer python", "prompt", "openai", "gpt-4o-mini", "1"),
+            ("Backend engineer python", "other prompt", "openai", "gpt-4o-mini", "1"),
+            ("Backend engineer python", "prompt", "anthropic", "gpt-4o-mini", "1"),
+            ("Backend engineer python", "prompt", "openai", "gpt-4o", "1"),
+            ("Backend engineer python", "prompt", "openai", "gpt-4o-mini", "2"),
+        ):
+            self.assertNotEqual(key, extraction_key(*args))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the store never grows past max_entries."""
+        self.cache.put_many({"k1": "{}"})
+        self.cache.put_many({"k2": "{}"})
+        self.cache.get_many(["k1"])
+        self.cache.put_many({"k3": "{}"})
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(set(self.cache.get_many(["k1", "k2", "k3"])), {"k1", "k3"})
+
+    def test_expired_entries_are_misses_and_evicted(self):
+        """Test that entries older than max_age are not served and are dropped on the next write."""
+        self.cache.max_age = 60
+        self.cache.put_many({"old": "{}"})
+        with mock.patch("analysis.tools.sqlite_store.time.time", return_value=time.time() + 120):
+            self.assertEqual(self.cache.get_many(["old"]), {})
+            self.cache.put_many({"new": "{}"})
+        self.assertEqual(len(self.cache), 1)
+
+    def test_hit_rate_is_counted(self):
+        """Test that hits and misses are counted across cache instances."""
+        self.cache.put_many({"k1": "{}"})
+        self.cache.get_many(["k1", "k2"])
+        ExtractionCache(self.cache.path).get_many(["k1"])
+
+        self.assertEqual(self.cache.stats(), {"entries": 1, "hits": 2, "misses": 1, "hit_rate": 2 / 3})
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()["hit_rate"], None)
+
+    def test_cached_texts_skip_the_llm(self):
+        """Test that sequential and batch extraction call the LLM once per distinct text."""
+        self.cache.max_entries = 100
+        chain = build_chain(FakeExtractionLLM(latency=0))
+        with mock.patch.object(FakeExtractionLLM, "_answer", autospec=True,
+                               side_effect=FakeExtractionLLM._answer) as answer:
+            first = extract_job_description(chain, "backend python", cache=self.cache)
+            results = async_to_sync(aextract_job_descriptions)(
+                chain, ["backend  python", "devops go", "devops go"], cache=self.cache
+            )
+            extract_job_description(chain, "devops go", cache=self.cache)
+
+        self.assertEqual(answer.call_count, 2)
+        self.assertEqual(results[0], first)
+        self.assertEqual([r.role for r in results], ["backend", "devops", "devops"])
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+    def test_chains_not_built_by_build_chain_are_not_cached(self):
+        """Test that a plain runnable chain extracts with the cache on or off and never builds a key."""
+        chain = RunnableLambda(lambda inputs: JobSchema(role=inputs["jd_text"].split()[0]))
+        with mock.patch("ai.chain.chain_extraction.extraction_key") as key:
+            for path in ("", self.cache.path):
+                with override_settings(AI_EXTRACTION_CACHE_PATH=path):
+                    one = extract_job_description(chain, "backend python")
+                    batch = async_to_sync(aextract_job_descriptions)(chain, ["devops go", "devops  go"])
+
+                self.assertEqual(one.role, "backend")
+                self.assertEqual([r.role for r in batch], ["devops", "devops"])
+
+        key.assert_not_called()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_disabled_cache_builds_no_key(self):
+        """Test that extraction through build_chain does not hash texts when the cache is off."""
+        chain = build_chain(FakeExtractionLLM(latency=0))
+        with override_settings(AI_EXTRACTION_CACHE_PATH=""), \
+                mock.patch("ai.chain.chain_extraction.extraction_key") as key:
+            extract_job_description(chain, "backend python")
+            async_to_sync(aextract_job_descriptions)(chain, ["devops go"])
+
+        key.assert_not_called()
+
+    def test_command_prints_hit_rate(self):
+        """Test that the management command reports the configured cache."""
+        self.cache.put_many({"k1": "{}"})
+        self.cache.get_many(["k1", "k2"])
+        out = StringIO()
+        with override_settings(AI_EXTRACTION_CACHE_PATH=self.cache.path):
+            call_command("extraction_cache", stdout=out)
+
+        self.assertIn("1 entries, 1 hits, 1 misses, hit rate 50.0%", out.getvalue())
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import time
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from langchain_core.language_models.chat_models import SimpleChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from ai.chain.chain_extraction import build_chain
+from ai.services.extract_jd import process_extract, split_extracted
+from analysis import aggregates
+from application.models import Application, JobDescription, JobDescriptionText
+from report.services.pipeline_service import PipelineService
+
+
+class FakeExtractionLLM(SimpleChatModel):
+    """
+    Local chat model answering after `latency` seconds with the JD's first line as role and skills.
+    Counts its calls and the most calls it had in flight at once.
+    """
+    latency: float = 0.05
+    calls: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-extraction"
+
+    def _answer(self, messages) -> str:
+        text = messages[-1].content.rsplit("JD:\n", 1)[-1]
+        if "FAIL" in text:
+            raise ValueError("LLM error")
+        role, *skills = text.split()
+        return json.dumps({"role": role, "programming_languages": skills})
+
+    def _enter(self):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs) -> str:
+        self._enter()
+        try:
+            time.sleep(self.latency)
+            return self._answer(messages)
+        finally:
+            self.in_flight -= 1
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self._enter()
+        try:
+            await asyncio.sleep(self.latency)
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._answer(messages)))])
+        finally:
+            self.in_flight -= 1
+
+
+@override_settings(AI_EXTRACTION_CACHE_PATH="")
+class ProcessExtractTest(TestCase):
+    """Test cases for concurrent JD extraction."""
+
+    def setUp(self):
+        """Create JD texts for a fake LLM with 50ms latency."""
+        self.texts = [
+            JobDescriptionText.objects.create(text=f"{role} python sql" + " git" * (i // 4))
+            for i, role in enumerate(("backend", "frontend", "devops", "fullstack") * 4)
+        ]
+        self.use_llm(FakeExtractionLLM(latency=0.05))
+
+    def use_llm(self, llm):
+        self.llm = llm
+        self.chain = build_chain(llm)
+
+    def extract(self, concurrency):
+        return process_extract(job_ids=[t.id for t in self.texts], concurrency=concurrency, chain=self.chain)
+
+    def extract_texts(self, texts, **kwargs):
+        return process_extract(job_ids=[t.id for t in texts], concurrency=8, chain=self.chain, **kwargs)
+
+    def test_concurrent_calls_are_bounded_by_the_limit(self):
+        """Test that up to `concurrency` calls are in flight at once, and one at a time with 1."""
+        jds = self.extract(concurrency=8)
+
+        self.assertEqual(len(jds), 16)
+        self.assertEqual(self.llm.calls, 16)
+        self.assertEqual(self.llm.max_in_flight, 8)
+        self.assertEqual(
+            {(jd.job_text_id, jd.role) for jd in JobDescription.objects.all()},
+            {(t.id, t.text.split()[0]) for t in self.texts},
+        )
+
+        JobDescription.objects.all().delete()
+        self.use_llm(FakeExtractionLLM(latency=0.01))
+        self.extract(concurrency=1)
+        self.assertEqual(self.llm.calls, 16)
+        self.assertEqual(self.llm.max_in_flight, 1)
+
+    def test_failed_items_are_skipped(self):
+        """Test that one failing text does not fail the batch or get a JobDescription."""
+        failing = JobDescriptionText.objects.create(text="FAIL")
+        self.texts.append(failing)
+
+        jds = self.extract(concurrency=4)
+
+        self.assertEqual(len(jds), 16)
+        self.assertFalse(JobDescription.objects.filter(job_text=failing).exists())
+
+    def test_existing_descriptions_are_not_extracted_again(self):
+        """Test that a second run returns the stored JobDescriptions without calling the LLM."""
+        first = self.extract(concurrency=8)
+        self.use_llm(FakeExtractionLLM(latency=0))
+        second = self.extract(concurrency=8)
+
+        self.assertEqual({jd.id for jd in second}, {jd.id for jd in first})
+        self.assertEqual(self.llm.calls, 0)
+
+    def test_near_duplicates_reuse_the_extracted_job_description(self):
+        """Test that a repost with a changed date line gets no LLM call and no JobDescription of its own."""
+        posting = " ".join(f"backend python django aws skill{i}" for i in range(8))
+        original = JobDescriptionText.objects.create(text=f"{posting} posted 1 may")
+        first = self.extract_texts([original], reuse_duplicates=True)
+        repost = JobDescriptionText.objects.create(text=f"{posting} posted 9 may")
+
+        self.use_llm(FakeExtractionLLM(latency=0))
+        reused = self.extract_texts([repost], reuse_duplicates=True)
+
+        self.assertEqual([jd.id for jd in reused], [jd.id for jd in first])
+        self.assertEqual(self.llm.calls, 0)
+        self.assertFalse(JobDescription.objects.filter(job_text=repost).exists())
+
+    @override_settings(ANALYSIS_AGGREGATE_TABLES=True)
+    def test_texts_extracted_concurrently_keep_their_job_description(self):
+        """Test that texts stored by another worker during the LLM calls are skipped, not a failed batch."""
+        raced = []
+
+        def other_worker_extracts():
+            # Runs after the pending texts are resolved, before the LLM calls
+            raced.append(JobDescription.objects.create(job_text=self.texts[0], role="other"))
+            return None
+
+        with mock.patch("ai.services.extract_jd.get_extraction_cache", side_effect=other_worker_extracts):
+            jds = self.extract(concurrency=8)
+
+        self.assertEqual(len(jds), 16)
+        self.assertIn(raced[0], jds)
+        self.assertEqual(JobDescription.objects.get(job_text=self.texts[0]).role, "other")
+        self.assertTablesMatchRecompute()
+
+    @override_settings(ANALYSIS_AGGREGATE_TABLES=True)
+    def test_conflict_at_insert_time_saves_the_other_rows(self):
+        """Test that a text extracted between the re-check and the insert does not roll back the other rows."""
+        JobDescription.objects.create(job_text=self.texts[0], role="other")
+        filter_ = JobDescription.objects.filter
+        rechecks = []
+
+        def recheck_misses_the_other_worker(*args, **kwargs):
+            # The first re-check runs before the other worker's insert
+            if "job_text_id__in" in kwargs and not rechecks:
+                rechecks.append(kwargs)
+                return JobDescription.objects.none()
+            return filter_(*args, **kwargs)
+
+        with mock.patch("ai.services.extract_jd.split_extracted",
+                        return_value=([], self.texts)), \
+                mock.patch.object(JobDescription.objects, "filter", side_effect=recheck_misses_the_other_worker):
+            jds = self.extract(concurrency=8)
+
+        self.assertEqual(len(rechecks), 1)
+        self.assertEqual(len(jds), 16)
+        self.assertEqual(JobDescription.objects.count(), 16)
+        self.assertEqual(JobDescription.objects.get(job_text=self.texts[0]).role, "other")
+        self.assertTablesMatchRecompute()
+
+    def assertTablesMatchRecompute(self):
+        rows = JobDescription.objects.values(*aggregates.CONTRIBUTION_COLUMNS)
+        self.assertEqual(aggregates.stored_counts(), aggregates.compute_from_rows(rows))
+
+    @override_settings(ANALYSIS_AGGREGATE_TABLES=True)
+    def test_bulk_insert_updates_the_aggregates(self):
+        """Test that the aggregate tables include the bulk-created JobDescriptions."""
+        self.extract(concurrency=8)
+
+        self.assertTablesMatchRecompute()
+        self.assertEqual(aggregates.get_frequencies("programming_languages")["python"], 16)
+
+
+@override_settings(AI_EXTRACTION_CACHE_PATH="")
+class ExtractionQueryCountTest(TestCase):
+    """Test cases for the query count of resolving what needs extraction."""
+
+    def setUp(self):
+        """Create 1000 applications with texts, every other one already extracted."""
+        applications = Application.objects.bulk_create(
+            [Application(company=f"Company {i}", job_title="Engineer") for i in range(1000)]
+        )
+        self.texts = JobDescriptionText.objects.bulk_create(
+            [JobDescriptionText(application=app, text="backend python") for app in applications]
+        )
+        # bulk_create skips the aggregate signals, which these tests do not need
+        JobDescription.objects.bulk_create(
+            [JobDescription(job_text=text, role="backend") for text in self.texts[::2]]
+        )
+        Application.objects.create(company="No text", job_title="Engineer")
+
+    def test_pipeline_resolves_texts_in_one_query(self):
+        """Test that the texts of 1000 applications are found with one query."""
+        with self.assertNumQueries(1):
+            ids = PipelineService.job_text_ids()
+        self.assertEqual(ids, sorted(text.id for text in self.texts))
+
+    def test_extracted_and_pending_texts_are_split_in_two_queries(self):
+        """Test that existing and missing JobDescriptions of 1000 texts are resolved with two queries."""
+        with self.assertNumQueries(2):
+            existing, pending = split_extracted(JobDescriptionText.objects.all())
+
+        self.assertEqual({jd.job_text_id for jd in existing}, {text.id for text in self.texts[::2]})
+        self.assertEqual({text.id for text in pending}, {text.id for text in self.texts[1::2]})
+
+    def test_extracted_texts_do_not_query_per_row(self):
+        """Test that process_extract over 1000 extracted texts runs no per-row query or LLM call."""
+        JobDescription.objects.bulk_create(
+            [JobDescription(job_text=text, role="backend") for text in self.texts[1::2]]
+        )
+        ids = [text.id for text in self.texts]
+        with self.assertNumQueries(2):
+            jds = process_extract(job_ids=ids)
+        self.assertEqual(len(jds), 1000)
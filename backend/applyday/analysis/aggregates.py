@@ -0,0 +1,471 @@
+# backend/applyday/analysis/aggregates.py
+# Incrementally maintained skill/field aggregates over JobDescription.
+# Each JobDescription contributes +1 to the document frequency of its skills,
+# +1 to the co-frequency of every skill pair it contains, +1 per field value and
+# its skill term counts to its role's TF-IDF document.
+# The field values, skills and numeric values are also bucketed by the local day the
+# JD was created, so date-range frequencies are a sum over a few day buckets.
+# Signals (analysis/signals.py) apply the difference whenever a row changes,
+# so frequency, PMI and TF-IDF results are answered in O(vocabulary) time.
+from collections import Counter
+from datetime import date, datetime, time
+from itertools import combinations
+from typing import Dict, List, Optional, Set, Tuple
+
+import scipy.sparse as sp
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min, Sum
+from django.utils import timezone
+
+from application.models import JobDescription
+from analysis.lookups import filter_lookups
+from analysis.models import (
+    SkillDocumentFrequency, SkillPairFrequency, FieldValueCount, RoleTermCount, TermRoleFrequency,
+    DailyJobCount, DailyFieldValueCount, DailySkillFrequency, DailyNumberCount,
+)
+from analysis.tools.analyst import SKILL_FIELDS, structured_skill_tokens
+from analysis.tools.cooccurrence import pmi_from_counts
+from analysis.tools.tfidf import sparse_top_k, tfidf_from_counts, token_terms
+
+# Fields whose value counts are tracked, mirroring the non-text `freq.*` results
+FREQUENCY_FIELDS = [
+    "level",
+    "location",
+    "programming_languages",
+    "frameworks_tools",
+    "cloud_platforms",
+    "databases",
+    "employment_type",
+]
+# Numeric fields whose value counts are bucketed by day, like `Analyst.get_number_frequencies`
+NUMBER_FIELDS = [
+    "salary_eur_min",
+    "salary_eur_max",
+    "bonus_percent",
+    "years_experience_min",
+    "years_experience_max",
+]
+# Length of the CharField keys; longer skills, terms and values are truncated to it
+MAX_KEY_LENGTH = 255
+# Columns needed to compute a contribution
+CONTRIBUTION_COLUMNS = sorted(
+    set(FREQUENCY_FIELDS) | set(SKILL_FIELDS) | set(NUMBER_FIELDS) | {"role", "created_at"}
+)
+
+
+def serving_enabled() -> bool:
+    """
+    Whether reports may be answered from the tables: they are maintained with
+    ANALYSIS_AGGREGATE_TABLES and hold skills split by the structured tokenizer,
+    so with another ANALYSIS_SKILL_TOKENIZER they would disagree with the Analyst.
+    """
+    return settings.ANALYSIS_AGGREGATE_TABLES and settings.ANALYSIS_SKILL_TOKENIZER == "structured"
+
+
+def local_day(created_at) -> Optional[date]:
+    """Returns the day bucket of a creation time, in the current time zone."""
+    if created_at is None:
+        return None
+    if timezone.is_aware(created_at):
+        created_at = timezone.localtime(created_at)
+    return created_at.date()
+
+
+class Contribution:
+    """The aggregate keys a single JobDescription contributes to."""
+    def __init__(self, skills: Set[str], field_values: Counter, role_terms: Counter = None,
+                 day: date = None, numbers: Counter = None):
+        self.skills = skills
+        self.field_values = field_values
+        self.role_terms = role_terms or Counter()
+        self.day = day
+        self.numbers = numbers or Counter()
+
+    @property
+    def pairs(self) -> Set[Tuple[str, str]]:
+        return set(combinations(sorted(self.skills), 2))
+
+    @property
+    def daily_jobs(self) -> Counter:
+        return Counter() if self.day is None else Counter({(self.day,): 1})
+
+    @property
+    def daily_field_values(self) -> Counter:
+        if self.day is None:
+            return Counter()
+        return Counter({(self.day, field, value): n for (field, value), n in self.field_values.items()})
+
+    @property
+    def daily_skills(self) -> Counter:
+        if self.day is None:
+            return Counter()
+        return Counter({(self.day, skill): 1 for skill in self.skills})
+
+    @property
+    def daily_numbers(self) -> Counter:
+        if self.day is None:
+            return Counter()
+        return Counter({(self.day, field, value): n for (field, value), n in self.numbers.items()})
+
+    @classmethod
+    def empty(cls) -> "Contribution":
+        return cls(set(), Counter())
+
+    @classmethod
+    def from_values(cls, values: Dict) -> "Contribution":
+        """Builds a contribution from a dict of JobDescription column values."""
+        tokens = [
+            tok
+            for field in SKILL_FIELDS for skill in (values.get(field) or [])
+            for tok in structured_skill_tokens(str(skill))
+        ]
+        skills = {tok[:MAX_KEY_LENGTH] for tok in tokens}
+        field_values = Counter()
+        for field in FREQUENCY_FIELDS:
+            value = values.get(field)
+            items = value if isinstance(value, list) else [value]
+            for item in items:
+                if isinstance(item, str):
+                    field_values[(field, item.lower()[:MAX_KEY_LENGTH])] += 1
+        # Term counts of the JD's share of its role document (same terms as Analyst.get_tfidf_skills)
+        role_terms = Counter()
+        role = values.get("role")
+        if role is not None:
+            role_terms.update((role, term[:MAX_KEY_LENGTH]) for tok in tokens for term in token_terms(tok))
+        numbers = Counter(
+            (field, float(values[field])) for field in NUMBER_FIELDS if values.get(field) is not None
+        )
+        return cls(skills, field_values, role_terms, day=local_day(values.get("created_at")), numbers=numbers)
+
+    @classmethod
+    def from_instance(cls, jd) -> "Contribution":
+        return cls.from_values({col: getattr(jd, col, None) for col in CONTRIBUTION_COLUMNS})
+
+
+def _increment(model, lookups: List[Dict], delta: int) -> None:
+    """
+    Adds `delta` to the count of every row matching `lookups`, creating missing rows,
+    and deletes those rows whose count dropped to zero.
+    Missing rows are inserted with a zero count, ignoring rows a concurrent save just
+    created, before every row is incremented in place, so no increment is lost.
+    """
+    if not lookups or delta == 0:
+        return
+    model.objects.bulk_create([model(count=0, **lookup) for lookup in lookups], ignore_conflicts=True)
+    for rows in filter_lookups(model.objects.all(), lookups):
+        rows.update(count=F("count") + delta)
+    if delta < 0:
+        for rows in filter_lookups(model.objects.filter(count__lte=0), lookups):
+            rows.delete()
+
+
+def _increment_counts(model, fields: Tuple[str, ...], old: Counter, new: Counter) -> Set[Tuple]:
+    """Applies the per-key difference between two Counters; returns the changed keys."""
+    by_delta: Dict[int, List[Dict]] = {}
+    changed = set()
+    for key in set(old) | set(new):
+        delta = new[key] - old[key]
+        if delta:
+            by_delta.setdefault(delta, []).append(dict(zip(fields, key)))
+            changed.add(key)
+    for delta, lookups in by_delta.items():
+        _increment(model, lookups, delta)
+    return changed
+
+
+def _refresh_term_role_frequency(terms: Set[str]) -> None:
+    """Recounts the roles containing each of `terms`."""
+    if not terms:
+        return
+    TermRoleFrequency.objects.filter(term__in=terms).delete()
+    counts = (
+        RoleTermCount.objects.filter(term__in=terms, count__gt=0)
+        .values("term").annotate(roles=Count("role"))
+    )
+    TermRoleFrequency.objects.bulk_create(
+        [TermRoleFrequency(term=row["term"], count=row["roles"]) for row in counts]
+    )
+
+
+def apply_change(old: Contribution, new: Contribution) -> None:
+    """Moves the aggregate tables from `old` to `new` contribution of one JobDescription."""
+    old_pairs, new_pairs = old.pairs, new.pairs
+    with transaction.atomic():
+        for delta, skills, pairs in (
+            (-1, old.skills - new.skills, old_pairs - new_pairs),
+            (1, new.skills - old.skills, new_pairs - old_pairs),
+        ):
+            _increment(SkillDocumentFrequency, [{"skill": s} for s in skills], delta)
+            _increment(SkillPairFrequency, [{"source": a, "target": b} for a, b in pairs], delta)
+
+        # List fields may repeat a value within one row, so counts move by their difference
+        _increment_counts(FieldValueCount, ("field", "value"), old.field_values, new.field_values)
+        changed = _increment_counts(RoleTermCount, ("role", "term"), old.role_terms, new.role_terms)
+        for model, fields, attr in DAILY_TABLES:
+            _increment_counts(model, fields, getattr(old, attr), getattr(new, attr))
+        _refresh_term_role_frequency({term for _, term in changed})
+
+
+def add_rows(rows) -> None:
+    """
+    Adds the contributions of new JobDescriptions in one pass, e.g. of rows written
+    with bulk_create, which sends no signals.
+    Args:
+        rows (Iterable[Dict]): JobDescription values with `CONTRIBUTION_COLUMNS`.
+    """
+    skill_freq, pair_freq, field_counts, role_terms, _, *daily = compute_from_rows(rows)
+    with transaction.atomic():
+        _increment_counts(SkillDocumentFrequency, ("skill",), Counter(),
+                          Counter({(skill,): count for skill, count in skill_freq.items()}))
+        _increment_counts(SkillPairFrequency, ("source", "target"), Counter(), pair_freq)
+        _increment_counts(FieldValueCount, ("field", "value"), Counter(), field_counts)
+        changed = _increment_counts(RoleTermCount, ("role", "term"), Counter(), role_terms)
+        for counts, (model, fields, _) in zip(daily, DAILY_TABLES):
+            _increment_counts(model, fields, Counter(), counts)
+        _refresh_term_role_frequency({term for _, term in changed})
+
+
+# (model, key fields, Contribution property) of every day-bucket table
+DAILY_TABLES = (
+    (DailyJobCount, ("day",), "daily_jobs"),
+    (DailyFieldValueCount, ("day", "field", "value"), "daily_field_values"),
+    (DailySkillFrequency, ("day", "skill"), "daily_skills"),
+    (DailyNumberCount, ("day", "field", "value"), "daily_numbers"),
+)
+AGGREGATE_NAMES = (
+    "skills", "pairs", "field values", "role terms", "term roles",
+    "daily jobs", "daily field values", "daily skills", "daily numbers",
+)
+
+
+def compute_from_rows(rows) -> Tuple[Counter, ...]:
+    """
+    Recomputes the aggregates from scratch.
+    Args:
+        rows (Iterable[Dict]): JobDescription values with `CONTRIBUTION_COLUMNS`.
+    Returns:
+        tuple of Counters named by `AGGREGATE_NAMES` (skill document frequency, pair
+        frequency, field value counts, role term counts, term role frequency, then
+        the day buckets of `DAILY_TABLES`).
+    """
+    skill_freq, pair_freq, field_counts, role_terms = Counter(), Counter(), Counter(), Counter()
+    daily = [Counter() for _ in DAILY_TABLES]
+    for values in rows:
+        contribution = Contribution.from_values(values)
+        skill_freq.update(contribution.skills)
+        pair_freq.update(contribution.pairs)
+        field_counts.update(contribution.field_values)
+        role_terms.update(contribution.role_terms)
+        for counts, (_, _, attr) in zip(daily, DAILY_TABLES):
+            counts.update(getattr(contribution, attr))
+    term_roles = Counter(term for (_, term), count in role_terms.items() if count > 0)
+    return (skill_freq, pair_freq, field_counts, role_terms, term_roles, *daily)
+
+
+def stored_counts() -> Tuple[Counter, ...]:
+    """Returns the aggregate tables as Counters shaped like `compute_from_rows`."""
+    skill_freq = Counter(dict(SkillDocumentFrequency.objects.values_list("skill", "count")))
+    pair_freq = Counter({
+        (source, target): count
+        for source, target, count in SkillPairFrequency.objects.values_list("source", "target", "count")
+    })
+    field_counts = Counter({
+        (field, value): count
+        for field, value, count in FieldValueCount.objects.values_list("field", "value", "count")
+    })
+    role_terms = Counter({
+        (role, term): count
+        for role, term, count in RoleTermCount.objects.values_list("role", "term", "count")
+    })
+    term_roles = Counter(dict(TermRoleFrequency.objects.values_list("term", "count")))
+    daily = [
+        Counter({tuple(row[:-1]): row[-1] for row in model.objects.values_list(*fields, "count")})
+        for model, fields, _ in DAILY_TABLES
+    ]
+    return (skill_freq, pair_freq, field_counts, role_terms, term_roles, *daily)
+
+
+def rebuild(rows) -> None:
+    """Replaces the aggregate tables with a full recompute over `rows`."""
+    skill_freq, pair_freq, field_counts, role_terms, term_roles, *daily = compute_from_rows(rows)
+    with transaction.atomic():
+        SkillDocumentFrequency.objects.all().delete()
+        SkillPairFrequency.objects.all().delete()
+        FieldValueCount.objects.all().delete()
+        RoleTermCount.objects.all().delete()
+        TermRoleFrequency.objects.all().delete()
+        SkillDocumentFrequency.objects.bulk_create(
+            [SkillDocumentFrequency(skill=s, count=c) for s, c in skill_freq.items()], batch_size=1000
+        )
+        SkillPairFrequency.objects.bulk_create(
+            [SkillPairFrequency(source=a, target=b, count=c) for (a, b), c in pair_freq.items()], batch_size=1000
+        )
+        FieldValueCount.objects.bulk_create(
+            [FieldValueCount(field=f, value=v, count=c) for (f, v), c in field_counts.items()], batch_size=1000
+        )
+        RoleTermCount.objects.bulk_create(
+            [RoleTermCount(role=r, term=t, count=c) for (r, t), c in role_terms.items()], batch_size=1000
+        )
+        TermRoleFrequency.objects.bulk_create(
+            [TermRoleFrequency(term=t, count=c) for t, c in term_roles.items()], batch_size=1000
+        )
+        for counts, (model, fields, _) in zip(daily, DAILY_TABLES):
+            model.objects.all().delete()
+            model.objects.bulk_create(
+                [model(count=c, **dict(zip(fields, key))) for key, c in counts.items()], batch_size=1000
+            )
+
+
+def get_frequencies(field: str) -> Counter:
+    """Returns value counts of a tracked field, like `Analyst.get_frequencies(field)`."""
+    if field not in FREQUENCY_FIELDS:
+        raise ValueError(f"Field is not aggregated: {field}")
+    return Counter(dict(FieldValueCount.objects.filter(field=field).values_list("value", "count")))
+
+
+def get_PMI_networks(min_cofreq: int = 2, measure: str = "pmi") -> List[Dict]:
+    """
+    Returns the skill PMI network from the aggregate tables.
+    Args:
+        min_cofreq (int): Minimum co-occurrence frequency to include a skill pair.
+        measure (str): One of "pmi", "npmi".
+    Returns:
+        List[Dict]: Same format as `Analyst.get_PMI_networks`.
+    """
+    total_docs = JobDescription.objects.count()
+    doc_freq = dict(SkillDocumentFrequency.objects.values_list("skill", "count"))
+    vocab = sorted(doc_freq)
+    index = {skill: i for i, skill in enumerate(vocab)}
+    pairs = SkillPairFrequency.objects.filter(count__gte=min_cofreq).values_list("source", "target", "count")
+
+    rows, cols, co_freq = [], [], []
+    for source, target, count in pairs:
+        rows.append(index[source])
+        cols.append(index[target])
+        co_freq.append(count)
+    return pmi_from_counts(
+        total_docs, [doc_freq[s] for s in vocab], rows, cols, co_freq, vocab, measure=measure
+    )
+
+
+def get_tfidf_skills(top_k: int = 10) -> Dict[str, List[Dict[str, float]]]:
+    """
+    Returns top-k TF-IDF skills per role from the stored role term counts.
+    Explanation:
+    - Each role is one document; its term counts and the term document frequencies
+      are read from the tables, so no JobDescription is re-tokenized.
+    - Scores use the TfidfVectorizer weighting (smooth idf, l2 norm) over every
+      role, including roles without skills.
+    Args:
+        top_k (int): Number of top skills to return per role.
+    Returns:
+        Dict[str, List[Dict[str, float]]]: Same format as `Analyst.get_tfidf_skills`
+        with the structured tokenizer, roles in order of their first JobDescription.
+    """
+    roles = list(
+        JobDescription.objects.exclude(role=None)
+        .values("role").annotate(first=Min("id")).order_by("first")
+        .values_list("role", flat=True)
+    )
+    doc_freq = dict(TermRoleFrequency.objects.values_list("term", "count"))
+    if not roles or not doc_freq:
+        return {}
+    terms = sorted(doc_freq)
+    term_index = {term: i for i, term in enumerate(terms)}
+    role_index = {role: i for i, role in enumerate(roles)}
+
+    rows, cols, counts = [], [], []
+    for role, term, count in RoleTermCount.objects.values_list("role", "term", "count"):
+        if role in role_index:
+            rows.append(role_index[role])
+            cols.append(term_index[term])
+            counts.append(count)
+    C = sp.csr_matrix((counts, (rows, cols)), shape=(len(roles), len(terms)))
+    X = tfidf_from_counts(C, [doc_freq[t] for t in terms], len(roles))
+
+    return {
+        role: [{"skill": terms[j], "score": float(score)} for j, score in top]
+        for role, top in zip(roles, sparse_top_k(X, top_k))
+    }
+
+
+def range_end(end: datetime) -> datetime:
+    """
+    Widens an inclusive range end in the last second of a local day (23:59:59 or later)
+    to the day's last instant, so `created_at__range` selects every JD of that day,
+    the same rows as its day bucket (i.e. `created_at` before the next local midnight).
+    """
+    local_end = timezone.localtime(end)
+    if local_end.time() < time(23, 59, 59):
+        return end
+    return local_end.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+
+def whole_day_range(start: datetime, end: datetime) -> Optional[Tuple[date, date]]:
+    """
+    Returns the (first, last) local days of a `created_at__range` that covers whole
+    days, i.e. starts at local midnight and ends at the last instant of a day (see
+    `range_end`); otherwise None, since the day buckets cannot answer a partial day.
+    """
+    start, end = timezone.localtime(start), timezone.localtime(end)
+    if start.time() != time.min or end.time() != time.max or start.date() > end.date():
+        return None
+    return start.date(), end.date()
+
+
+def get_range_frequencies(field: str, start: date, end: date) -> Counter:
+    """Returns value counts of a tracked field over JDs created from `start` to `end` (inclusive days)."""
+    if field not in FREQUENCY_FIELDS:
+        raise ValueError(f"Field is not aggregated: {field}")
+    return Counter(dict(
+        DailyFieldValueCount.objects.filter(field=field, day__range=(start, end))
+        .values("value").annotate(total=Sum("count")).values_list("value", "total")
+    ))
+
+
+def get_daily_aggregates(start: date, end: date) -> Dict:
+    """
+    Merges the day buckets from `start` to `end` (inclusive).
+    Args:
+        start (date): First local day.
+        end (date): Last local day.
+    Returns:
+        dict with the number of JDs, field value counts, skill document frequencies
+        and numeric value histograms of the JDs created in the range:
+        {"jobs": n, "frequencies": {field: {value: count}}, "skills": {skill: count},
+         "numbers": {field: {value: count}}}
+    """
+    days = {"day__range": (start, end)}
+    jobs = DailyJobCount.objects.filter(**days).aggregate(total=Sum("count"))["total"] or 0
+
+    frequencies = {field: {} for field in FREQUENCY_FIELDS}
+    for field, value, total in (
+        DailyFieldValueCount.objects.filter(**days)
+        .values("field", "value").annotate(total=Sum("count")).order_by("-total", "value")
+        .values_list("field", "value", "total")
+    ):
+        frequencies.setdefault(field, {})[value] = total
+
+    skills = dict(
+        DailySkillFrequency.objects.filter(**days)
+        .values("skill").annotate(total=Sum("count")).order_by("-total", "skill")
+        .values_list("skill", "total")
+    )
+
+    numbers = {field: {} for field in NUMBER_FIELDS}
+    for field, value, total in (
+        DailyNumberCount.objects.filter(**days)
+        .values("field", "value").annotate(total=Sum("count")).order_by("field", "value")
+        .values_list("field", "value", "total")
+    ):
+        numbers.setdefault(field, {})[value] = total
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "jobs": jobs,
+        "frequencies": frequencies,
+        "skills": skills,
+        "numbers": numbers,
+    }
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class AnalysisConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "analysis"
-    verbose_name = "Analysis Toolkit"
\ No newline at end of file
+    verbose_name = "Analysis Toolkit"
+
+    def ready(self):
+        from analysis import signals  # noqa: F401
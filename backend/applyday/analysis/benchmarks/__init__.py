@@ -0,0 +1,2 @@
+# backend/applyday/analysis/benchmarks/__init__.py
+# Benchmarks for the analysis toolkit. Run modules with `python -m analysis.benchmarks.<name>`.
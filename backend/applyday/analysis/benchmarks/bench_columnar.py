@@ -0,0 +1,87 @@
+# backend/applyday/analysis/benchmarks/bench_columnar.py
+# Compares the former DataFrame.iterrows skill aggregation with the columnar Analyst path.
+# Both sides use the structured skill tokenizer so the numbers show pandas/PMI overhead only.
+# Usage: python -m analysis.benchmarks.bench_columnar --rows 1000 10000 50000
+import argparse
+import math
+import time
+from collections import Counter, defaultdict
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from analysis.tools.analyst import Analyst, SKILL_FIELDS, structured_skill_tokens
+from analysis.benchmarks.corpus import generate_jds
+
+
+def _row_skills(row):
+    return sum((row[field] for field in SKILL_FIELDS), [])
+
+
+def _row_tokens(row):
+    return [tok for skill in _row_skills(row) for tok in structured_skill_tokens(skill)]
+
+
+def legacy_tfidf(df, top_k=10):
+    role_tokens = defaultdict(list)
+    for _, row in df.iterrows():
+        if pd.isna(row["role"]):
+            continue
+        role_tokens[row["role"]].extend(_row_tokens(row))
+    vectorizer = TfidfVectorizer()
+    X = vectorizer.fit_transform([" ".join(t) for t in role_tokens.values()])
+    names = vectorizer.get_feature_names_out()
+    out = {}
+    for i, role in enumerate(role_tokens):
+        row = X[i].toarray()[0]
+        out[role] = [(names[j], float(row[j])) for j in np.argsort(row)[::-1][:top_k] if row[j] > 0]
+    return out
+
+
+def legacy_pmi(df, min_cofreq=2):
+    skill_freq, pair_freq = Counter(), Counter()
+    for _, row in df.iterrows():
+        skills = set(_row_tokens(row))
+        skill_freq.update(skills)
+        pair_freq.update(combinations(sorted(skills), 2))
+    n = len(df)
+    return [
+        (s1, s2, math.log2(c * n / (skill_freq[s1] * skill_freq[s2])))
+        for (s1, s2), c in pair_freq.items()
+        if c >= min_cofreq and c * n > skill_freq[s1] * skill_freq[s2]
+    ]
+
+
+def legacy_skill_counts(df):
+    return [len(set(_row_skills(row))) for _, row in df.iterrows()]
+
+
+def run(sizes):
+    print(f"{'rows':>7} {'legacy s':>9} {'columnar s':>11} {'speedup':>8}")
+    for rows in sizes:
+        data = generate_jds(rows)
+
+        df = pd.DataFrame(data)
+        start = time.perf_counter()
+        legacy_tfidf(df)
+        legacy_pmi(df)
+        legacy_skill_counts(df)
+        legacy = time.perf_counter() - start
+
+        analyst = Analyst(data, skill_tokenizer="structured")
+        start = time.perf_counter()
+        analyst.get_tfidf_skills()
+        analyst.get_PMI_networks()
+        analyst._skill_frame().groupby("row")["skill"].nunique()
+        columnar = time.perf_counter() - start
+
+        print(f"{rows:>7} {legacy:>9.2f} {columnar:>11.2f} {legacy / columnar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="iterrows vs columnar skill aggregation")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+    run(args.rows)
@@ -0,0 +1,46 @@
+# backend/applyday/analysis/benchmarks/bench_components.py
+# Per-method timing of the Analyst with the whole spaCy pipeline vs. the components each method declares.
+# Every run uses a fresh Analyst, so each method parses its own texts (no shared token cache).
+# Usage: python -m analysis.benchmarks.bench_components --rows 2000
+import argparse
+import time
+
+from analysis.tools.analyst import Analyst
+from analysis.benchmarks.corpus import generate_jds
+
+METHODS = {
+    "get_pos_tags_tokens": lambda a: a.get_pos_tags_tokens("responsibilities"),
+    "get_frequencies": lambda a: a.get_frequencies("role", text_mode=True),
+    "get_tfidf_skills": lambda a: a.get_tfidf_skills(),
+    "assess_swiss_knife_job": lambda a: a.assess_swiss_knife_job(),
+}
+
+
+def _time(data, method: str, minimal: bool, batch_size: int) -> float:
+    analyst = Analyst(data, batch_size=batch_size)
+    if not minimal:
+        analyst.components = dict.fromkeys(Analyst.COMPONENTS)
+    start = time.perf_counter()
+    METHODS[method](analyst)
+    return time.perf_counter() - start
+
+
+def run(rows: int, batch_size: int):
+    data = generate_jds(rows)
+    # Load the pipeline outside the timings
+    Analyst(data[:1]).nlp("warm up")
+    print(f"{rows} JDs, batch_size={batch_size}")
+    print(f"{'method':<24} {'full (s)':>9} {'minimal (s)':>11} {'speedup':>8}  components")
+    for method in METHODS:
+        full = _time(data, method, minimal=False, batch_size=batch_size)
+        minimal = _time(data, method, minimal=True, batch_size=batch_size)
+        components = ",".join(sorted(Analyst.COMPONENTS[method]))
+        print(f"{method:<24} {full:>9.2f} {minimal:>11.2f} {full / minimal:>7.2f}x  {components}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyst per-method spaCy component timings")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+    run(args.rows, args.batch_size)
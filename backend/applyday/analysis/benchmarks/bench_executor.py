@@ -0,0 +1,64 @@
+# backend/applyday/analysis/benchmarks/bench_executor.py
+# Report analysis latency of AnalysisService.analyze for each executor mode.
+# Each run uses a fresh Analyst, so spaCy parsing is included in every timing.
+# spaCy and the pandas/numpy steps mostly hold the GIL, so "thread" is expected to stay
+# close to "serial"; "process" is the mode expected to speed reports up, and only on
+# a machine with at least 2 cores (on 1 core it only adds the fork overhead).
+# Usage: python -m analysis.benchmarks.bench_executor --rows 5000 --workers 4 --output executor.json
+import argparse
+import json
+import os
+import platform
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "applyday.settings")
+django.setup()
+
+from django.test.utils import override_settings  # noqa: E402
+
+from analysis.tools.analyst import Analyst  # noqa: E402
+from analysis.benchmarks.corpus import generate_jds  # noqa: E402
+from report.services.executor import EXECUTORS  # noqa: E402
+from report.services.generate_report import AnalysisService  # noqa: E402
+
+
+def run(rows: int, workers: int, batch_size: int, output: str = None):
+    data = generate_jds(rows)
+    # Load the pipeline outside the timings
+    Analyst(data[:1]).nlp("warm up")
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"{rows} JDs, workers={workers}, cores available={cores}")
+    if cores < 2:
+        print("Only one core is available: parallel modes cannot beat serial here.")
+    print(f"{'executor':>9} {'seconds':>9} {'speedup':>8}")
+    results = []
+    baseline = None
+    with override_settings(ANALYSIS_EXECUTOR_WORKERS=workers):
+        for mode in EXECUTORS:
+            analyst = Analyst(data, batch_size=batch_size)
+            start = time.perf_counter()
+            AnalysisService.analyze(analyst, executor=mode)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{mode:>9} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x")
+            results.append({"executor": mode, "seconds": elapsed, "speedup": baseline / elapsed})
+    if output:
+        # A machine-readable run to attach when changing the executor defaults
+        with open(output, "w") as f:
+            json.dump({
+                "rows": rows, "workers": workers, "batch_size": batch_size, "cores": cores,
+                "machine": platform.platform(), "python": platform.python_version(), "results": results,
+            }, f, indent=2)
+        print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AnalysisService.analyze executor latency")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--output", help="Also write the timings to this JSON file")
+    args = parser.parse_args()
+    run(args.rows, args.workers, args.batch_size, args.output)
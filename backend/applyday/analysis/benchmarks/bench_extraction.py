@@ -0,0 +1,53 @@
+# backend/applyday/analysis/benchmarks/bench_extraction.py
+# Wall-clock time of LLM extraction, one call at a time versus up to N concurrent calls.
+# A local fake chat model answers every JD after a fixed latency, so the timings show how
+# much of the per-call network latency the concurrent path hides; the cache is disabled.
+# Usage: python -m analysis.benchmarks.bench_extraction --texts 40 --latency 0.2 --concurrency 1 4 8 16
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "applyday.settings")
+django.setup()
+
+from asgiref.sync import async_to_sync  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from ai.chain.chain_extraction import aextract_job_descriptions, build_chain  # noqa: E402
+from ai.services.extract_jd import _extract_sequentially  # noqa: E402
+from ai.tests.test_extract_jd import FakeExtractionLLM  # noqa: E402
+from analysis.benchmarks.corpus import generate_jds  # noqa: E402
+
+
+def run(texts: int, latency: float, levels):
+    jd_texts = [
+        " ".join([row["role"], *row["programming_languages"], str(i)])
+        for i, row in enumerate(generate_jds(texts))
+    ]
+    print(f"{texts} JD texts, fake LLM latency {latency:.2f}s")
+    print(f"{'concurrency':>11} {'seconds':>9} {'speedup':>8} {'max in flight':>14}")
+    baseline = None
+    with override_settings(AI_EXTRACTION_CACHE_PATH=""):
+        for concurrency in levels:
+            llm = FakeExtractionLLM(latency=latency)
+            chain = build_chain(llm)
+            start = time.perf_counter()
+            if concurrency > 1:
+                results = async_to_sync(aextract_job_descriptions)(chain, jd_texts, max_concurrency=concurrency)
+            else:
+                results = _extract_sequentially(chain, jd_texts)
+            elapsed = time.perf_counter() - start
+            assert not any(isinstance(result, Exception) for result in results)
+            baseline = baseline or elapsed
+            print(f"{concurrency:>11} {elapsed:>9.2f} {baseline / elapsed:>7.1f}x {llm.max_in_flight:>14}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sequential vs concurrent LLM extraction wall-clock time")
+    parser.add_argument("--texts", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+    run(args.texts, args.latency, args.concurrency)
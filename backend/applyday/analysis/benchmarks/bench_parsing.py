@@ -0,0 +1,34 @@
+# backend/applyday/analysis/benchmarks/bench_parsing.py
+# Measures spaCy parsing throughput of the Analyst for different `n_process` values.
+# Usage: python -m analysis.benchmarks.bench_parsing --rows 5000 --processes 1 2 4
+import argparse
+import os
+import time
+
+from analysis.tools.analyst import Analyst
+from analysis.benchmarks.corpus import generate_jds
+
+
+def run(rows: int, processes, batch_size: int):
+    data = generate_jds(rows)
+    print(f"{rows} JDs, batch_size={batch_size}, cores available={os.cpu_count()}")
+    print(f"{'n_process':>9} {'seconds':>9} {'JDs/s':>9} {'speedup':>8}")
+    baseline = None
+    for n_process in processes:
+        analyst = Analyst(data, batch_size=batch_size, n_process=n_process)
+        start = time.perf_counter()
+        analyst.get_pos_tags_tokens("responsibilities")
+        analyst.get_PMI_networks()
+        analyst.assess_swiss_knife_job()
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{n_process:>9} {elapsed:>9.2f} {rows / elapsed:>9.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyst spaCy parsing throughput")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    run(args.rows, args.processes, args.batch_size)
@@ -0,0 +1,53 @@
+# backend/applyday/analysis/benchmarks/bench_skill_sets.py
+# Memory and time of per-JD skill lists of strings vs. interned CSR skill sets.
+# Usage: python -m analysis.benchmarks.bench_skill_sets --rows 20000
+import argparse
+import sys
+import time
+from collections import Counter
+from itertools import combinations
+
+from analysis.benchmarks.corpus import generate_jds, SKILLS
+from analysis.tools.vocabulary import SkillSets, SkillVocabulary
+
+
+def _list_bytes(doc_skills) -> int:
+    # Outer list, inner lists and their string references; the strings themselves
+    # are shared with the corpus in both layouts
+    return sys.getsizeof(doc_skills) + sum(sys.getsizeof(skills) for skills in doc_skills)
+
+
+def _lists(doc_skills):
+    freq, pairs = Counter(), Counter()
+    for skills in doc_skills:
+        skills = set(skills)
+        freq.update(skills)
+        pairs.update(combinations(sorted(skills), 2))
+    return freq, pairs
+
+
+def run(rows: int):
+    doc_skills = [
+        [skill.lower() for field in SKILLS for skill in row[field]] for row in generate_jds(rows)
+    ]
+    start = time.perf_counter()
+    _lists(doc_skills)
+    lists_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sets = SkillSets.from_lists(doc_skills, vocabulary=SkillVocabulary())
+    sets.cooccurrence()
+    sets_time = time.perf_counter() - start
+
+    list_bytes = _list_bytes(doc_skills)
+    print(f"{rows} JDs, {len(sets.indices)} skill occurrences, {len(sets.vocabulary)} distinct skills")
+    print(f"{'layout':<12} {'bytes/JD':>9} {'count+pairs (s)':>16}")
+    print(f"{'lists':<12} {list_bytes / rows:>9.1f} {lists_time:>16.3f}")
+    print(f"{'skill sets':<12} {sets.nbytes / rows:>9.1f} {sets_time:>16.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Skill list vs. interned skill set footprint")
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.rows)
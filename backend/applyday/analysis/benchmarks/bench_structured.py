@@ -0,0 +1,30 @@
+# backend/applyday/analysis/benchmarks/bench_structured.py
+# Compares the spaCy and structured skill tokenizers on TF-IDF + PMI.
+# Usage: python -m analysis.benchmarks.bench_structured --rows 10000 20000
+import argparse
+import time
+
+from analysis.tools.analyst import Analyst
+from analysis.benchmarks.corpus import generate_jds
+
+
+def run(sizes):
+    print(f"{'rows':>7} {'spacy s':>9} {'structured s':>13} {'speedup':>8} {'same':>5}")
+    for rows in sizes:
+        data = generate_jds(rows)
+        timings, outputs = {}, {}
+        for mode in ("spacy", "structured"):
+            analyst = Analyst(data, skill_tokenizer=mode)
+            start = time.perf_counter()
+            outputs[mode] = (analyst.get_tfidf_skills(), analyst.get_PMI_networks())
+            timings[mode] = time.perf_counter() - start
+        same = outputs["spacy"] == outputs["structured"]
+        print(f"{rows:>7} {timings['spacy']:>9.2f} {timings['structured']:>13.2f} "
+              f"{timings['spacy'] / timings['structured']:>7.1f}x {str(same):>5}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Skill tokenizer comparison")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 20000])
+    args = parser.parse_args()
+    run(args.rows)
@@ -0,0 +1,138 @@
+# backend/applyday/analysis/benchmarks/bench_suite.py
+# Wall time, CPU time and peak memory of every Analyst method and of AnalysisService.analyze
+# over realistic synthetic corpora, written as JSON so runs can be compared across commits.
+# Each benchmark gets a fresh Analyst, so spaCy parsing is included wherever a method needs it;
+# the persistent token cache is not used. Peak memory is measured with tracemalloc in a
+# separate run, so its overhead does not distort the timings.
+# Usage: python -m analysis.benchmarks.bench_suite --sizes 100 1000 10000 50000 --output bench.json
+#        python -m analysis.benchmarks.bench_suite --sizes 1000 --compare baseline.json
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "applyday.settings")
+django.setup()
+
+import numpy as np  # noqa: E402
+import spacy  # noqa: E402
+
+from analysis.tools.analyst import Analyst  # noqa: E402
+from analysis.benchmarks.corpus import generate_realistic_jds  # noqa: E402
+from report.services.generate_report import AnalysisService  # noqa: E402
+
+SIZES = (100, 1000, 10000, 50000)
+BENCHMARKS = {
+    "Analyst.get_frequencies[role,text]": lambda a: a.get_frequencies("role", text_mode=True),
+    "Analyst.get_frequencies[programming_languages]": lambda a: a.get_frequencies("programming_languages"),
+    "Analyst.get_number_frequencies": lambda a: a.get_number_frequencies(["salary_eur_min", "years_experience_min"]),
+    "Analyst.get_pos_tags_tokens": lambda a: a.get_pos_tags_tokens("responsibilities"),
+    "Analyst.get_tfidf_skills": lambda a: a.get_tfidf_skills(),
+    "Analyst.get_PMI_networks": lambda a: a.get_PMI_networks(),
+    "Analyst.assess_swiss_knife_job": lambda a: a.assess_swiss_knife_job(),
+    "AnalysisService.analyze": lambda a: AnalysisService.analyze(a, executor="serial"),
+}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _measure(data, benchmark: str, batch_size: int, memory: bool) -> dict:
+    analyst = Analyst(data, batch_size=batch_size)
+    wall, cpu = time.perf_counter(), time.process_time()
+    BENCHMARKS[benchmark](analyst)
+    result = {
+        "wall_s": round(time.perf_counter() - wall, 4),
+        "cpu_s": round(time.process_time() - cpu, 4),
+        "peak_mb": None,
+    }
+    if memory:
+        analyst = Analyst(data, batch_size=batch_size)
+        tracemalloc.start()
+        try:
+            BENCHMARKS[benchmark](analyst)
+            result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run(sizes, benchmarks, batch_size: int, memory: bool, seed: int) -> dict:
+    # Load the pipeline outside the timings
+    Analyst([{"role": "warm up"}]).nlp("warm up")
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "spacy": spacy.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "batch_size": batch_size,
+            "seed": seed,
+        },
+        "results": [],
+    }
+    for rows in sizes:
+        data = generate_realistic_jds(rows, seed=seed)
+        for benchmark in benchmarks:
+            result = {"rows": rows, "benchmark": benchmark, **_measure(data, benchmark, batch_size, memory)}
+            report["results"].append(result)
+            peak = "-" if result["peak_mb"] is None else f"{result['peak_mb']:.1f}"
+            print(f"{rows:>7} {benchmark:<48} {result['wall_s']:>9.3f} {result['cpu_s']:>9.3f} {peak:>9}",
+                  file=sys.stderr)
+    return report
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Prints wall time and peak memory ratios of `report` against `baseline`."""
+    before = {(r["rows"], r["benchmark"]): r for r in baseline["results"]}
+    print(f"baseline {baseline['meta'].get('commit')} -> {report['meta'].get('commit')}")
+    print(f"{'rows':>7} {'benchmark':<48} {'wall':>8} {'peak mem':>9}")
+    for result in report["results"]:
+        old = before.get((result["rows"], result["benchmark"]))
+        if old is None:
+            continue
+        wall = result["wall_s"] / old["wall_s"] if old["wall_s"] else float("nan")
+        peak = "-"
+        if result["peak_mb"] is not None and old.get("peak_mb"):
+            peak = f"{result['peak_mb'] / old['peak_mb']:.2f}x"
+        print(f"{result['rows']:>7} {result['benchmark']:<48} {wall:>7.2f}x {peak:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyst and AnalysisService benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory runs.")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+    parser.add_argument("--compare", help="JSON report of an earlier run to compare against.")
+    args = parser.parse_args()
+
+    print(f"{'rows':>7} {'benchmark':<48} {'wall (s)':>9} {'cpu (s)':>9} {'peak MB':>9}", file=sys.stderr)
+    result = run(args.sizes, args.benchmarks, args.batch_size, not args.no_memory, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
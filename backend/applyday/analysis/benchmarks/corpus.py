@@ -0,0 +1,150 @@
+# backend/applyday/analysis/benchmarks/corpus.py
+# Synthetic job description rows shaped like `model_to_dict(JobDescription)`.
+import random
+from typing import List, Dict
+
+ROLES = ["backend", "frontend", "fullstack", "data_scientist", "devops", "qa_engineer", "software_engineer"]
+SKILLS = {
+    "programming_languages": ["python", "java", "javascript", "typescript", "go", "rust", "sql", "kotlin"],
+    "frameworks_tools": ["django", "react", "spring", "docker", "kubernetes", "terraform", "git", "pandas"],
+    "cloud_platforms": ["aws", "azure", "gcp"],
+    "databases": ["postgresql", "mysql", "mongodb", "redis", "elasticsearch"],
+    "api_protocols": ["rest", "graphql", "grpc", "websocket"],
+    "methodologies": ["agile", "scrum", "ci_cd", "tdd", "microservices"],
+}
+RESPONSIBILITIES = [
+    "design and build scalable backend services",
+    "write clean maintainable code and review pull requests",
+    "collaborate with product managers to deliver features",
+    "deploy and monitor applications in production",
+    "mentor junior engineers",
+    "improve test coverage and automate release pipelines",
+    "own the data pipeline and reporting dashboards",
+]
+
+
+def generate_jds(n: int, seed: int = 42) -> List[Dict]:
+    """Returns `n` deterministic synthetic job description dicts."""
+    rng = random.Random(seed)
+    # Separate stream, so adding numeric fields left the other columns unchanged
+    numbers = random.Random(seed + 1)
+    rows = []
+    for i in range(n):
+        row = {
+            "id": i + 1,
+            "role": rng.choice(ROLES),
+            "level": rng.choice(["junior", "mid", "senior", "lead"]),
+            "location": rng.choice(["Dublin, Ireland", "Cork, Ireland", "Berlin, Germany"]),
+            "employment_type": rng.choice(["full_time", "contract"]),
+            "company": f"company_{rng.randint(1, n // 5 + 1)}",
+            "responsibilities": rng.sample(RESPONSIBILITIES, rng.randint(2, 4)),
+        }
+        for field, pool in SKILLS.items():
+            row[field] = rng.sample(pool, rng.randint(0, min(3, len(pool))))
+        salary = numbers.choice([None, 45000.0, 55000.0, 65000.0, 80000.0])
+        row["salary_eur_min"] = salary
+        row["salary_eur_max"] = salary and salary + 15000.0
+        row["years_experience_min"] = numbers.choice([None, 1, 2, 3, 5])
+        rows.append(row)
+    return rows
+
+
+# Skills each role draws most of its skill fields from, most characteristic first
+ROLE_PROFILES = {
+    "backend": ["python", "java", "go", "django", "spring", "postgresql", "redis", "docker", "rest", "grpc", "microservices"],
+    "frontend": ["javascript", "typescript", "react", "graphql", "rest", "git", "agile", "tdd"],
+    "fullstack": ["javascript", "typescript", "python", "react", "django", "postgresql", "mongodb", "rest", "docker"],
+    "data_scientist": ["python", "sql", "pandas", "postgresql", "elasticsearch", "aws", "gcp", "agile"],
+    "devops": ["go", "python", "docker", "kubernetes", "terraform", "aws", "azure", "gcp", "ci_cd", "git"],
+    "qa_engineer": ["java", "javascript", "python", "tdd", "ci_cd", "git", "scrum", "rest"],
+    "software_engineer": ["java", "kotlin", "rust", "go", "git", "docker", "sql", "scrum", "microservices"],
+}
+# Relative share of each role, as in a typical tech job board
+ROLE_WEIGHTS = [30, 18, 14, 10, 12, 6, 10]
+LEVEL_SALARY = {"junior": 40000, "mid": 55000, "senior": 75000, "lead": 90000}
+RESPONSIBILITY_VERBS = [
+    "design", "build", "maintain", "own", "improve", "automate", "monitor", "review", "document", "migrate",
+    "deploy", "optimize", "test", "lead", "support",
+]
+RESPONSIBILITY_OBJECTS = [
+    "scalable backend services", "customer facing web applications", "data pipelines", "release pipelines",
+    "the platform infrastructure", "internal developer tooling", "reporting dashboards", "public REST APIs",
+    "machine learning models", "the observability stack", "mobile applications", "payment integrations",
+    "legacy systems", "the test automation framework", "cloud cost and capacity",
+]
+RESPONSIBILITY_QUALIFIERS = [
+    "", "with product managers", "in an agile team", "across several squads", "for millions of users",
+    "in production", "with high availability", "following security best practices",
+]
+
+
+def _weighted_sample(rng: random.Random, pool: List[str], weights: List[float], k: int) -> List[str]:
+    """Draws up to `k` distinct items, favouring heavy weights."""
+    picked = dict.fromkeys(rng.choices(pool, weights=weights, k=2 * k))
+    return list(picked)[:k]
+
+
+def generate_realistic_jds(n: int, seed: int = 42, long_tail: int = 2000) -> List[Dict]:
+    """
+    Returns `n` deterministic synthetic job descriptions with realistic distributions.
+    Roles follow `ROLE_WEIGHTS`; each role mostly draws the skills of its
+    `ROLE_PROFILES` entry, the rest Zipf-distributed from every known skill and a
+    long tail of `long_tail` rare skills (so the vocabulary keeps growing with `n`);
+    companies are Zipf-sized; salaries and experience depend on the level;
+    responsibilities combine verbs, objects and qualifiers.
+    Rows have every column of `model_to_dict(JobDescription)` that the analyses read.
+    """
+    rng = random.Random(seed)
+    field_of = {skill: field for field, pool in SKILLS.items() for skill in pool}
+    every_skill = list(field_of)
+    # Zipf popularity: the i-th skill is 1/(i+1) as common as the first
+    popularity = [1 / (i + 1) for i in range(len(every_skill))]
+    tail = [f"skill_{i}" for i in range(long_tail)]
+    tail_weights = [1 / (i + 1) for i in range(long_tail)]
+    n_companies = max(1, n // 8)
+    company_weights = [1 / (i + 1) ** 1.1 for i in range(n_companies)]
+    responsibilities = [
+        f"{verb} {obj} {qualifier}".strip()
+        for verb in RESPONSIBILITY_VERBS for obj in RESPONSIBILITY_OBJECTS for qualifier in RESPONSIBILITY_QUALIFIERS
+    ]
+
+    rows = []
+    for i in range(n):
+        role = rng.choices(ROLES, weights=ROLE_WEIGHTS)[0]
+        level = rng.choices(list(LEVEL_SALARY), weights=[2, 4, 4, 1])[0]
+        profile = ROLE_PROFILES[role]
+        skills = _weighted_sample(rng, profile, [1 / (j + 1) ** 0.5 for j in range(len(profile))], rng.randint(3, 7))
+        skills += [s for s in _weighted_sample(rng, every_skill, popularity, rng.randint(0, 3)) if s not in skills]
+
+        row = {field: [] for field in SKILLS}
+        for skill in skills:
+            row[field_of[skill]].append(skill)
+        salary = None
+        if rng.random() < 0.6:
+            salary = float(LEVEL_SALARY[level] + 5000 * rng.randint(-2, 4))
+        years_min = {"junior": 0, "mid": 2, "senior": 5, "lead": 7}[level] + rng.randint(0, 2)
+        required = skills[:rng.randint(1, min(4, len(skills)))]
+        row.update({
+            "id": i + 1,
+            "role": role,
+            "level": level,
+            "location": rng.choices(
+                ["Dublin, Ireland", "Cork, Ireland", "Galway, Ireland", "Berlin, Germany", "Remote"],
+                weights=[10, 3, 1, 4, 3],
+            )[0],
+            "employment_type": rng.choices(["full_time", "contract", "part_time", "internship"], weights=[85, 10, 3, 2])[0],
+            "company": f"company_{rng.choices(range(n_companies), weights=company_weights)[0]}",
+            "responsibilities": rng.sample(responsibilities, rng.randint(3, 8)),
+            "required_core_skills": required,
+            "desirable_skills": _weighted_sample(rng, tail, tail_weights, rng.randint(0, 3)),
+            "domain_keywords": rng.sample(["fintech", "healthcare", "e-commerce", "saas", "gaming", "logistics"], rng.randint(0, 2)),
+            "mobile_technologies": [],
+            "salary_eur_min": salary,
+            "salary_eur_max": salary and salary + 15000.0,
+            "bonus_percent": rng.choice([None, None, 5.0, 10.0, 15.0]),
+            "years_experience_min": years_min,
+            "years_experience_max": years_min + rng.randint(2, 5),
+            "remote_work": rng.choices(["on-site", "hybrid", "remote"], weights=[3, 5, 2])[0],
+        })
+        rows.append(row)
+    return rows
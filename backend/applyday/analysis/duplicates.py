@@ -0,0 +1,189 @@
+# backend/applyday/analysis/duplicates.py
+# MinHash/LSH index of JobDescriptionText for near-duplicate detection.
+# Every text stores its MinHash signature and one bucket key per LSH band.
+# Signals (analysis/signals.py) re-index a text whenever it is saved, so finding the
+# near-duplicates of a text only compares it against the texts sharing a bucket.
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from application.models import JobDescription, JobDescriptionText
+from analysis.lookups import filter_lookups
+from analysis.models import LSHBucket, TextSignature
+from analysis.tools.minhash import MinHasher, similarity
+
+# 16 bands of 8 rows: texts above ~0.7 estimated Jaccard similarity very likely share a bucket.
+# Changing these requires `rebuild_minhash_index`.
+NUM_PERM = 128
+BANDS = 16
+HASHER = MinHasher(num_perm=NUM_PERM, shingle_size=3, seed=1)
+
+
+def _decode(signature: bytes) -> np.ndarray:
+    return np.frombuffer(bytes(signature), dtype=np.uint32)
+
+
+def index_texts(job_texts: Iterable[JobDescriptionText]) -> int:
+    """
+    Stores (or replaces) the signatures and bucket keys of the given texts; texts
+    without words are left out of the index. Returns the number of indexed texts.
+    """
+    job_texts = list(job_texts)
+    if not job_texts:
+        return 0
+    signatures, buckets = [], []
+    for job_text in job_texts:
+        signature = HASHER.signature(job_text.text)
+        if signature is None:
+            continue
+        signatures.append(TextSignature(job_text_id=job_text.id, signature=signature.tobytes()))
+        buckets.extend(
+            LSHBucket(job_text_id=job_text.id, band=band, key=key)
+            for band, key in enumerate(HASHER.band_keys(signature, BANDS))
+        )
+    ids = [job_text.id for job_text in job_texts]
+    with transaction.atomic():
+        TextSignature.objects.filter(job_text_id__in=ids).delete()
+        LSHBucket.objects.filter(job_text_id__in=ids).delete()
+        TextSignature.objects.bulk_create(signatures, batch_size=1000)
+        LSHBucket.objects.bulk_create(buckets, batch_size=1000)
+    return len(signatures)
+
+
+def rebuild(job_texts: Iterable[JobDescriptionText], batch_size: int = 1000) -> int:
+    """Replaces the whole index with the given texts; returns the number of indexed texts."""
+    count = 0
+    with transaction.atomic():
+        TextSignature.objects.all().delete()
+        LSHBucket.objects.all().delete()
+        batch = []
+        for job_text in job_texts:
+            batch.append(job_text)
+            if len(batch) == batch_size:
+                count += index_texts(batch)
+                batch = []
+        count += index_texts(batch)
+    return count
+
+
+def _candidates(keys_by_text: Dict[int, List[int]]) -> Dict[int, set]:
+    """Returns, per text, the other indexed texts sharing at least one bucket with it."""
+    owners: Dict[Tuple[int, int], List[int]] = {}
+    for text_id, keys in keys_by_text.items():
+        for band, key in enumerate(keys):
+            owners.setdefault((band, key), []).append(text_id)
+    lookups = [{"band": band, "key": key} for band, key in owners]
+    candidates = {text_id: set() for text_id in keys_by_text}
+    for buckets in filter_lookups(LSHBucket.objects.all(), lookups):
+        for band, key, other in buckets.values_list("band", "key", "job_text_id"):
+            for text_id in owners[(band, key)]:
+                if other != text_id:
+                    candidates[text_id].add(other)
+    return candidates
+
+
+def find_near_duplicates(text: str, threshold: float = None, exclude_ids: Iterable[int] = ()) -> List[Tuple[int, float]]:
+    """
+    Returns the indexed texts whose estimated Jaccard similarity to `text` is at least
+    `threshold` (default ANALYSIS_DUPLICATE_THRESHOLD), as (job_text_id, similarity),
+    most similar first.
+    """
+    threshold = settings.ANALYSIS_DUPLICATE_THRESHOLD if threshold is None else threshold
+    signature = HASHER.signature(text)
+    if signature is None:
+        return []
+    candidates = _candidates({0: HASHER.band_keys(signature, BANDS)})[0] - set(exclude_ids)
+    stored = TextSignature.objects.filter(job_text_id__in=candidates).values_list("job_text_id", "signature")
+    matches = [(text_id, similarity(signature, _decode(sig))) for text_id, sig in stored]
+    return sorted((m for m in matches if m[1] >= threshold), key=lambda m: (-m[1], m[0]))
+
+
+def extracted_duplicates(job_texts: Iterable[JobDescriptionText], threshold: float = None) -> Dict[int, JobDescription]:
+    """
+    Maps each of `job_texts` to the JobDescription of its most similar already
+    extracted near-duplicate, if any reaches `threshold` (default ANALYSIS_DUPLICATE_THRESHOLD).
+    Runs a constant number of queries per 200 LSH buckets, whatever the number of indexed texts.
+    """
+    threshold = settings.ANALYSIS_DUPLICATE_THRESHOLD if threshold is None else threshold
+    signatures = {job_text.id: HASHER.signature(job_text.text) for job_text in job_texts}
+    # Texts without words have no signature and never reuse another text's extraction
+    signatures = {text_id: sig for text_id, sig in signatures.items() if sig is not None}
+    if not signatures:
+        return {}
+    candidates = _candidates({text_id: HASHER.band_keys(sig, BANDS) for text_id, sig in signatures.items()})
+    stored = dict(
+        TextSignature.objects.filter(
+            job_text_id__in=set().union(*candidates.values()), job_text__text_description__isnull=False,
+        ).values_list("job_text_id", "signature")
+    )
+    best = {}
+    for text_id, others in candidates.items():
+        scored = [(similarity(signatures[text_id], _decode(stored[o])), -o) for o in others if o in stored]
+        if scored and max(scored)[0] >= threshold:
+            best[text_id] = -max(scored)[1]
+    jds = JobDescription.objects.in_bulk(set(best.values()), field_name="job_text_id")
+    return {text_id: jds[other] for text_id, other in best.items()}
+
+
+def clusters(threshold: float = None) -> List[List[int]]:
+    """
+    Groups the indexed texts into near-duplicate clusters: texts sharing an LSH bucket
+    with an estimated similarity of at least `threshold` (default ANALYSIS_DUPLICATE_THRESHOLD)
+    are linked (with union-find), and linked texts form a cluster.
+    Returns:
+        List of sorted job_text_id lists with at least two texts, ordered by their first id.
+    """
+    threshold = settings.ANALYSIS_DUPLICATE_THRESHOLD if threshold is None else threshold
+    shared = LSHBucket.objects.filter(band=OuterRef("band"), key=OuterRef("key")).exclude(pk=OuterRef("pk"))
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    for band, key, text_id in LSHBucket.objects.filter(Exists(shared)).values_list("band", "key", "job_text_id"):
+        buckets.setdefault((band, key), []).append(text_id)
+    ids = set().union(*buckets.values()) if buckets else set()
+    signatures = {
+        text_id: _decode(sig)
+        for text_id, sig in TextSignature.objects.filter(job_text_id__in=ids).values_list("job_text_id", "signature")
+    }
+
+    parent = {text_id: text_id for text_id in ids}
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    # Each text is compared with one member of every cluster already met in its bucket,
+    # and not at all once linked to it, so a bucket of n copies costs n - 1 comparisons.
+    checked = set()
+    for members in buckets.values():
+        representatives: Dict[int, int] = {}
+        for b in sorted(set(members)):
+            for root in list(representatives):
+                a = representatives[root]
+                if find(a) == find(b) or (a, b) in checked:
+                    continue
+                checked.add((a, b))
+                if similarity(signatures[a], signatures[b]) >= threshold:
+                    parent[find(b)] = find(a)
+            representatives = {find(text_id): text_id for text_id in (*representatives.values(), b)}
+
+    groups: Dict[int, List[int]] = {}
+    for text_id in ids:
+        groups.setdefault(find(text_id), []).append(text_id)
+    return sorted((sorted(group) for group in groups.values() if len(group) > 1), key=lambda g: g[0])
+
+
+def parse_threshold(value: Optional[str]) -> float:
+    """Validates an optional similarity threshold parameter; raises ValueError on bad input."""
+    if value in (None, ""):
+        return settings.ANALYSIS_DUPLICATE_THRESHOLD
+    try:
+        threshold = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("threshold must be a number between 0 and 1")
+    if not 0 < threshold <= 1:
+        raise ValueError("threshold must be a number between 0 and 1")
+    return threshold
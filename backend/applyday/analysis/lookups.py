@@ -0,0 +1,17 @@
+# backend/applyday/analysis/lookups.py
+# Batched lookups of many exact (field=value, ...) rows, shared by the aggregates and the MinHash index.
+from typing import Dict, Iterator, List
+
+from django.db.models import Q, QuerySet
+
+# Lookups OR-ed into one query; SQLite limits the expression depth to 1000
+_LOOKUP_CHUNK = 200
+
+
+def filter_lookups(queryset: QuerySet, lookups: List[Dict]) -> Iterator[QuerySet]:
+    """Yields `queryset` filtered to each chunk of `lookups` (field -> value dicts), OR-ed together."""
+    for i in range(0, len(lookups), _LOOKUP_CHUNK):
+        condition = Q()
+        for lookup in lookups[i:i + _LOOKUP_CHUNK]:
+            condition |= Q(**lookup)
+        yield queryset.filter(condition)
@@ -0,0 +1,31 @@
+# backend/applyday/analysis/management/commands/build_skill_lemmas.py
+import json
+
+from django.core.management.base import BaseCommand
+
+from application.models import JobDescription
+from analysis.benchmarks.corpus import ROLE_PROFILES, SKILLS
+from analysis.tools.analyst import SKILL_FIELDS, SKILL_LEMMAS_PATH, spacy_skill_lemmas, structured_skill_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenerate the structured tokenizer's lemma table from the spaCy pipeline, for the skills "
+        "of the benchmark corpus and of every stored JobDescription."
+    )
+
+    def handle(self, *args, **options):
+        skills = {skill for pool in SKILLS.values() for skill in pool}
+        skills.update(skill for profile in ROLE_PROFILES.values() for skill in profile)
+        for values in JobDescription.objects.values_list(*SKILL_FIELDS).iterator(chunk_size=2000):
+            skills.update(str(skill) for field in values for skill in (field or []))
+
+        # Words, not lemmas: bypass the current table
+        words = {word for skill in skills for word in str(skill).lower().split()}
+        words = {word for word in words if structured_skill_tokens(word)}
+        lemmas = spacy_skill_lemmas(words)
+        SKILL_LEMMAS_PATH.write_text(json.dumps(lemmas, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(lemmas)} of {len(words)} skill words have a different spaCy lemma; wrote {SKILL_LEMMAS_PATH}. "
+            "Run rebuild_skill_aggregates if the aggregate tables are enabled."
+        ))
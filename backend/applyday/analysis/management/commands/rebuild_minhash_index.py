@@ -0,0 +1,19 @@
+# backend/applyday/analysis/management/commands/rebuild_minhash_index.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from application.models import JobDescriptionText
+from analysis import duplicates
+
+
+class Command(BaseCommand):
+    help = "Rebuild the MinHash/LSH near-duplicate index of JobDescriptionText."
+
+    def handle(self, *args, **options):
+        texts = JobDescriptionText.objects.only("id", "text").order_by("id").iterator(chunk_size=2000)
+        count = duplicates.rebuild(texts)
+        clusters = duplicates.clusters()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count} texts; {len(clusters)} near-duplicate clusters at threshold "
+            f"{settings.ANALYSIS_DUPLICATE_THRESHOLD}."
+        ))
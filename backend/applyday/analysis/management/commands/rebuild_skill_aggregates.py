@@ -0,0 +1,47 @@
+# backend/applyday/analysis/management/commands/rebuild_skill_aggregates.py
+from django.core.management.base import BaseCommand, CommandError
+
+from application.models import JobDescription
+from analysis import aggregates
+from analysis.models import DailyJobCount
+
+
+class Command(BaseCommand):
+    help = "Rebuild the skill/field aggregate tables from JobDescription, or check them with --check."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare the stored tables against a full recompute; exit with an error on mismatch.",
+        )
+        parser.add_argument(
+            "--if-empty",
+            action="store_true",
+            help="Only rebuild when the tables hold no JobDescription yet, e.g. on first start.",
+        )
+
+    def handle(self, *args, **options):
+        def rows():
+            return JobDescription.objects.values(*aggregates.CONTRIBUTION_COLUMNS).iterator(chunk_size=2000)
+
+        if options["if_empty"] and DailyJobCount.objects.exists():
+            self.stdout.write("Aggregate tables are populated, skipping the rebuild.")
+            return
+        if not options["check"]:
+            aggregates.rebuild(rows())
+            self.stdout.write(self.style.SUCCESS("Aggregate tables rebuilt."))
+            if options["if_empty"]:
+                return
+
+        expected = aggregates.compute_from_rows(rows())
+        stored = aggregates.stored_counts()
+        mismatches = 0
+        for name, want, have in zip(aggregates.AGGREGATE_NAMES, expected, stored):
+            diff = {key for key in set(want) | set(have) if want[key] != have[key]}
+            mismatches += len(diff)
+            if diff:
+                self.stdout.write(self.style.WARNING(f"{name}: {len(diff)} mismatched entries"))
+        if mismatches:
+            raise CommandError(f"Aggregate tables differ from a full recompute ({mismatches} entries).")
+        self.stdout.write(self.style.SUCCESS("Aggregate tables match a full recompute."))
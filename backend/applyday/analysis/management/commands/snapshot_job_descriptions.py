@@ -0,0 +1,32 @@
+# backend/applyday/analysis/management/commands/snapshot_job_descriptions.py
+from django.core.management.base import BaseCommand, CommandError
+
+from application.models import JobDescription
+from analysis import snapshot
+
+
+class Command(BaseCommand):
+    help = "Rewrite the Arrow snapshot of JobDescription as one compacted part, or check it with --check."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare the snapshot against the database; exit with an error on mismatch.",
+        )
+
+    def handle(self, *args, **options):
+        def rows():
+            return JobDescription.objects.order_by("id").values(*snapshot.SNAPSHOT_COLUMNS).iterator(chunk_size=2000)
+
+        if not options["check"]:
+            path = snapshot.compact(rows())
+            self.stdout.write(self.style.SUCCESS(f"Snapshot written to {path}."))
+
+        table = snapshot.load()
+        stored = table.select(snapshot.SNAPSHOT_COLUMNS).to_pylist() if table is not None else []
+        expected = [snapshot.normalize(row) for row in rows()]
+        if stored != expected:
+            mismatches = sum(a != b for a, b in zip(stored, expected)) + abs(len(stored) - len(expected))
+            raise CommandError(f"Snapshot differs from the database ({mismatches} rows).")
+        self.stdout.write(self.style.SUCCESS(f"Snapshot matches the database ({len(stored)} rows)."))
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0002_role_term_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyJobCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyFieldValueCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('field', models.CharField(max_length=100)),
+                ('value', models.CharField(max_length=255)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('day', 'field', 'value')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyNumberCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('field', models.CharField(max_length=100)),
+                ('value', models.FloatField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('day', 'field', 'value')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailySkillFrequency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('skill', models.CharField(max_length=255)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('day', 'skill')},
+            },
+        ),
+    ]
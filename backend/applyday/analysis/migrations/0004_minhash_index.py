@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0003_daily_buckets'),
+        ('application', '0006_jobdescription_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.BinaryField()),
+                ('job_text', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='minhash', to='application.jobdescriptiontext')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('key', models.BigIntegerField()),
+                ('job_text', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='application.jobdescriptiontext')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'key'], name='analysis_ls_band_06c94d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,137 @@
+# backend/applyday/analysis/models.py
+# Aggregate tables kept in sync with JobDescription (see analysis/aggregates.py)
+# and the near-duplicate index of JobDescriptionText (see analysis/duplicates.py)
+from django.db import models
+
+
+class SkillDocumentFrequency(models.Model):
+    """Number of JobDescriptions mentioning a skill."""
+    skill = models.CharField(max_length=255, unique=True)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.skill}: {self.count}"
+
+
+class SkillPairFrequency(models.Model):
+    """Number of JobDescriptions mentioning both skills of a pair (source < target)."""
+    source = models.CharField(max_length=255)
+    target = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("source", "target")
+
+    def __str__(self):
+        return f"{self.source} - {self.target}: {self.count}"
+
+
+class FieldValueCount(models.Model):
+    """Occurrences of a lowercased value in a JobDescription field."""
+    field = models.CharField(max_length=100)
+    value = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("field", "value")
+
+    def __str__(self):
+        return f"{self.field}={self.value}: {self.count}"
+
+
+class RoleTermCount(models.Model):
+    """Occurrences of a TF-IDF term in the skills of all JobDescriptions of a role."""
+    role = models.CharField(max_length=255)
+    term = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("role", "term")
+
+    def __str__(self):
+        return f"{self.role}/{self.term}: {self.count}"
+
+
+class TermRoleFrequency(models.Model):
+    """Number of roles whose skills contain a TF-IDF term (its document frequency)."""
+    term = models.CharField(max_length=255, unique=True)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.term}: {self.count}"
+
+
+class DailyJobCount(models.Model):
+    """Number of JobDescriptions created on a day (local time)."""
+    day = models.DateField(unique=True)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day}: {self.count}"
+
+
+class DailyFieldValueCount(models.Model):
+    """Occurrences of a lowercased field value in the JobDescriptions created on a day."""
+    day = models.DateField()
+    field = models.CharField(max_length=100)
+    value = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("day", "field", "value")
+
+    def __str__(self):
+        return f"{self.day} {self.field}={self.value}: {self.count}"
+
+
+class DailySkillFrequency(models.Model):
+    """Number of JobDescriptions created on a day mentioning a skill."""
+    day = models.DateField()
+    skill = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("day", "skill")
+
+    def __str__(self):
+        return f"{self.day} {self.skill}: {self.count}"
+
+
+class DailyNumberCount(models.Model):
+    """Histogram bucket: JobDescriptions created on a day with a numeric field equal to `value`."""
+    day = models.DateField()
+    field = models.CharField(max_length=100)
+    value = models.FloatField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("day", "field", "value")
+
+    def __str__(self):
+        return f"{self.day} {self.field}={self.value}: {self.count}"
+
+
+class TextSignature(models.Model):
+    """MinHash signature of a JobDescriptionText (see analysis/duplicates.py)."""
+    job_text = models.OneToOneField(
+        "application.JobDescriptionText", on_delete=models.CASCADE, related_name="minhash"
+    )
+    signature = models.BinaryField()
+
+    def __str__(self):
+        return f"signature of text {self.job_text_id}"
+
+
+class LSHBucket(models.Model):
+    """One LSH band key of a text signature; texts sharing a bucket are near-duplicate candidates."""
+    job_text = models.ForeignKey(
+        "application.JobDescriptionText", on_delete=models.CASCADE, related_name="lsh_buckets"
+    )
+    band = models.PositiveSmallIntegerField()
+    key = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=["band", "key"])]
+
+    def __str__(self):
+        return f"text {self.job_text_id} band {self.band}: {self.key}"
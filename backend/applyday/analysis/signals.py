@@ -0,0 +1,97 @@
+# backend/applyday/analysis/signals.py
+# Keeps the aggregate tables (when ANALYSIS_AGGREGATE_TABLES is set) and the Arrow snapshot
+# in sync with JobDescription writes,
+# and the near-duplicate index with JobDescriptionText writes.
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from application.models import JobDescription, JobDescriptionText
+from analysis import aggregates, duplicates, snapshot
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(pre_save, sender=JobDescription)
+def remember_previous_contribution(sender, instance, raw=False, **kwargs):
+    """Stores what the row contributed before this save."""
+    if raw or not settings.ANALYSIS_AGGREGATE_TABLES:
+        return
+    previous = None
+    if instance.pk:
+        previous = sender.objects.filter(pk=instance.pk).first()
+    instance._aggregate_contribution = (
+        aggregates.Contribution.from_instance(previous) if previous else aggregates.Contribution.empty()
+    )
+
+
+@receiver(post_save, sender=JobDescription)
+def update_aggregates_on_save(sender, instance, raw=False, **kwargs):
+    if raw or not settings.ANALYSIS_AGGREGATE_TABLES:
+        return
+    old = getattr(instance, "_aggregate_contribution", aggregates.Contribution.empty())
+    aggregates.apply_change(old, aggregates.Contribution.from_instance(instance))
+
+
+@receiver(post_delete, sender=JobDescription)
+def update_aggregates_on_delete(sender, instance, **kwargs):
+    if not settings.ANALYSIS_AGGREGATE_TABLES:
+        return
+    aggregates.apply_change(aggregates.Contribution.from_instance(instance), aggregates.Contribution.empty())
+
+
+def _append_to_snapshot(rows=(), deleted_ids=()):
+    try:
+        snapshot.append(rows, deleted_ids)
+        if len(snapshot.parts()) > settings.ANALYSIS_SNAPSHOT_MAX_PARTS:
+            snapshot.compact(
+                JobDescription.objects.order_by("id").values(*snapshot.SNAPSHOT_COLUMNS).iterator(chunk_size=2000)
+            )
+    except OSError:
+        # The snapshot is a derived copy; `snapshot_job_descriptions` rebuilds it
+        logger.exception("Could not update the JobDescription snapshot")
+
+
+@receiver(post_save, sender=JobDescription)
+def append_saved_row_to_snapshot(sender, instance, raw=False, **kwargs):
+    if raw or not settings.ANALYSIS_SNAPSHOT_ENABLED:
+        return
+    values = snapshot.instance_values(instance)
+    transaction.on_commit(lambda: _append_to_snapshot(rows=[values]))
+
+
+@receiver(post_delete, sender=JobDescription)
+def append_deleted_row_to_snapshot(sender, instance, **kwargs):
+    if not settings.ANALYSIS_SNAPSHOT_ENABLED:
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: _append_to_snapshot(deleted_ids=[pk]))
+
+
+@receiver(post_save, sender=JobDescriptionText)
+def index_saved_text(sender, instance, raw=False, **kwargs):
+    """Re-indexes the MinHash signature of a saved text; deletes cascade to the index."""
+    if raw:
+        return
+    duplicates.index_texts([instance])
+
+
+def sync_bulk_created(instances) -> None:
+    """
+    Applies the post_save updates to JobDescriptions written with bulk_create,
+    which sends no signals: their contributions are added to the aggregate tables
+    in one pass and their rows appended to the snapshot as one part.
+    """
+    instances = list(instances)
+    if not instances:
+        return
+    if settings.ANALYSIS_AGGREGATE_TABLES:
+        aggregates.add_rows(
+            [{col: getattr(jd, col, None) for col in aggregates.CONTRIBUTION_COLUMNS} for jd in instances]
+        )
+    if settings.ANALYSIS_SNAPSHOT_ENABLED:
+        rows = [snapshot.instance_values(jd) for jd in instances]
+        transaction.on_commit(lambda: _append_to_snapshot(rows=rows))
@@ -0,0 +1,220 @@
+# backend/applyday/analysis/snapshot.py
+# Append-only Arrow IPC snapshot of JobDescription for analytics.
+# Every write appends a part file holding row versions; readers memory-map the parts
+# and keep the latest version of each id, so reports read columns straight from the
+# page cache instead of instantiating ORM rows. Parts are named by a nanosecond
+# timestamp, so later parts win; compaction replaces the parts it has seen with one
+# part written from the database. Reports only read a snapshot whose row count,
+# latest id and latest `updated_at` match the table (see `load_current`).
+import logging
+import os
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from django.conf import settings
+from django.db.models import Count, Max
+
+from application.models import JobDescription
+from analysis.tools.analyst import SKILL_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Low-cardinality text columns, stored dictionary-encoded
+DICTIONARY_COLUMNS = ["role", "level", "location", "employment_type", "company"]
+LIST_COLUMNS = ["responsibilities", *SKILL_FIELDS]
+# JobDescription columns kept in the snapshot
+SNAPSHOT_COLUMNS = ["id", "created_at", "updated_at", *DICTIONARY_COLUMNS, *LIST_COLUMNS]
+
+SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.int64(), nullable=False),
+        pa.field("deleted", pa.bool_(), nullable=False),
+        pa.field("created_at", pa.timestamp("us", tz="UTC")),
+        pa.field("updated_at", pa.timestamp("us", tz="UTC")),
+    ]
+    + [pa.field(col, pa.dictionary(pa.int32(), pa.string())) for col in DICTIONARY_COLUMNS]
+    + [pa.field(col, pa.list_(pa.string())) for col in LIST_COLUMNS]
+)
+PART_SUFFIX = ".arrow"
+
+
+def snapshot_dir() -> str:
+    return str(settings.ANALYSIS_SNAPSHOT_DIR)
+
+
+def parts() -> List[str]:
+    """Returns the part files, oldest first."""
+    directory = snapshot_dir()
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(PART_SUFFIX)
+    )
+
+
+def _part_name() -> str:
+    return f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}{PART_SUFFIX}"
+
+
+def _list_value(value) -> Optional[List[str]]:
+    if value is None:
+        return None
+    return [str(item) for item in value] if isinstance(value, list) else [str(value)]
+
+
+def _to_batch(rows: Iterable[Dict], deleted_ids: Iterable[int] = ()) -> pa.RecordBatch:
+    """Builds a record batch of row versions followed by tombstones for `deleted_ids`."""
+    rows = list(rows)
+    deleted_ids = list(deleted_ids)
+    columns = {
+        "id": pa.array([row["id"] for row in rows] + deleted_ids, type=pa.int64()),
+        "deleted": pa.array([False] * len(rows) + [True] * len(deleted_ids), type=pa.bool_()),
+    }
+    for col in ("created_at", "updated_at"):
+        columns[col] = pa.array(
+            [row.get(col) for row in rows] + [None] * len(deleted_ids), type=pa.timestamp("us", tz="UTC")
+        )
+    for col in DICTIONARY_COLUMNS:
+        values = [row.get(col) for row in rows] + [None] * len(deleted_ids)
+        columns[col] = pa.array(
+            [v if v is None else str(v) for v in values], type=pa.string()
+        ).dictionary_encode()
+    for col in LIST_COLUMNS:
+        values = [_list_value(row.get(col)) for row in rows] + [None] * len(deleted_ids)
+        columns[col] = pa.array(values, type=pa.list_(pa.string()))
+    return pa.RecordBatch.from_arrays([columns[f.name] for f in SCHEMA], schema=SCHEMA)
+
+
+def _write_part(batches: Iterable[pa.RecordBatch], name: str) -> str:
+    """Writes an IPC file atomically and returns its path."""
+    directory = snapshot_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    tmp = f"{path}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, SCHEMA) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    os.replace(tmp, path)
+    return path
+
+
+def append(rows: Iterable[Dict], deleted_ids: Iterable[int] = ()) -> str:
+    """
+    Appends new versions of `rows` (JobDescription values with `SNAPSHOT_COLUMNS`)
+    and tombstones for `deleted_ids` as one part.
+    """
+    return _write_part([_to_batch(rows, deleted_ids)], _part_name())
+
+
+def compact(rows: Iterable[Dict], batch_size: int = 10_000) -> str:
+    """
+    Replaces every existing part with one part holding `rows`, e.g. a full
+    `JobDescription.objects.order_by("id").values(*SNAPSHOT_COLUMNS)` scan.
+    Parts appended while compacting sort after the new part and are kept.
+    """
+    # Name the part before listing, so every part it replaces sorts before it
+    name = _part_name()
+    replaced = parts()
+
+    def batches():
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= batch_size:
+                yield _to_batch(chunk)
+                chunk = []
+        yield _to_batch(chunk)
+
+    path = _write_part(batches(), name)
+    for old in replaced:
+        os.remove(old)
+    logger.info("Compacted %d snapshot parts into %s", len(replaced), path)
+    return path
+
+
+def load() -> Optional[pa.Table]:
+    """
+    Returns the current JobDescription rows, ordered by id, or None without a snapshot.
+    Parts are memory-mapped; when no id has several versions and the parts are in id
+    order, the columns are the mapped buffers themselves (zero-copy).
+    """
+    paths = parts()
+    if not paths:
+        return None
+    tables = [pa.ipc.open_file(pa.memory_map(path, "r")).read_all() for path in paths]
+    if any(not table.schema.equals(SCHEMA) for table in tables):
+        logger.warning("The JobDescription snapshot has an old schema; run `snapshot_job_descriptions`")
+        return None
+    table = pa.concat_tables(tables)
+
+    ids = table.column("id").to_numpy()
+    deleted = table.column("deleted").to_numpy(zero_copy_only=False)
+    if not deleted.any() and np.all(np.diff(ids) > 0):
+        return table.drop_columns(["deleted"])
+
+    # Keep the last version of every id, drop tombstones, order by id
+    _, first_from_end = np.unique(ids[::-1], return_index=True)
+    latest = len(ids) - 1 - first_from_end
+    latest = latest[~deleted[latest]]
+    latest = latest[np.argsort(ids[latest], kind="stable")]
+    return table.take(pa.array(latest)).drop_columns(["deleted"])
+
+
+def matches_database(table: pa.Table) -> bool:
+    """
+    Returns whether `table` (see `load`) has the row count, latest id and latest
+    `updated_at` of JobDescription, i.e. no save or delete bypassed the signals
+    since it was last compacted. Edits through `QuerySet.update()` keep `updated_at`
+    and are not detected.
+    """
+    stored = JobDescription.objects.aggregate(rows=Count("id"), last_id=Max("id"), updated=Max("updated_at"))
+    if table.num_rows != stored["rows"]:
+        return False
+    if not table.num_rows:
+        return True
+    return (
+        pc.max(table.column("id")).as_py() == stored["last_id"]
+        and pc.max(table.column("updated_at")).as_py() == stored["updated"]
+    )
+
+
+def load_current() -> Optional[pa.Table]:
+    """Returns `load()` when it matches the database (see `matches_database`), else None."""
+    table = load()
+    if table is not None and not matches_database(table):
+        logger.warning("The JobDescription snapshot is out of date; reading the database instead")
+        return None
+    return table
+
+
+def filter_table(table: pa.Table, ids: Iterable[int] = None, start=None, end=None) -> pa.Table:
+    """Filters snapshot rows like the report queryset (`id__in`, or `created_at__range`)."""
+    if ids:
+        return table.filter(pc.is_in(table.column("id"), value_set=pa.array(list(ids), type=pa.int64())))
+    if start is not None and end is not None:
+        created = table.column("created_at")
+        mask = pc.and_(
+            pc.greater_equal(created, pa.scalar(start, type=created.type)),
+            pc.less_equal(created, pa.scalar(end, type=created.type)),
+        )
+        return table.filter(mask)
+    return table
+
+
+def normalize(row: Dict) -> Dict:
+    """Returns `row` as it reads back from the snapshot."""
+    out = {"id": row["id"], "created_at": row.get("created_at"), "updated_at": row.get("updated_at")}
+    for col in DICTIONARY_COLUMNS:
+        out[col] = None if row.get(col) is None else str(row[col])
+    for col in LIST_COLUMNS:
+        out[col] = _list_value(row.get(col))
+    return out
+
+
+def instance_values(instance) -> Dict:
+    """Returns the snapshot columns of a JobDescription instance."""
+    return {col: getattr(instance, col, None) for col in SNAPSHOT_COLUMNS}
@@ -0,0 +1,227 @@
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.forms.models import model_to_dict
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from application.models import JobDescription, JobDescriptionText
+from analysis import aggregates
+from analysis.models import SkillDocumentFrequency, SkillPairFrequency
+from analysis.aggregates import CONTRIBUTION_COLUMNS
+from analysis.tools.analyst import Analyst, SKILL_FIELDS, structured_skill_tokens
+from analysis.benchmarks.corpus import generate_jds
+
+
+def create_jd(**fields):
+    """Create a JobDescription with its JobDescriptionText."""
+    fields.pop("id", None)
+    job_text = JobDescriptionText.objects.create(text="JD text")
+    return JobDescription.objects.create(job_text=job_text, **fields)
+
+
+@override_settings(ANALYSIS_AGGREGATE_TABLES=True)
+class AggregateTablesTest(TestCase):
+    """Test cases for the incrementally maintained aggregate tables."""
+
+    def setUp(self):
+        """Create a small corpus."""
+        self.jds = [create_jd(**row) for row in generate_jds(40)]
+
+    def rows(self):
+        return JobDescription.objects.values(*aggregates.CONTRIBUTION_COLUMNS)
+
+    def assertTablesMatchRecompute(self):
+        self.assertEqual(aggregates.stored_counts(), aggregates.compute_from_rows(self.rows()))
+
+    def test_tables_follow_creates_updates_and_deletes(self):
+        """Test that signals keep the tables equal to a full recompute."""
+        self.assertTablesMatchRecompute()
+
+        jd = self.jds[0]
+        jd.programming_languages = ["python", "rust"]
+        jd.location = "Galway, Ireland"
+        jd.save()
+        self.assertTablesMatchRecompute()
+
+        self.jds[1].delete()
+        self.assertTablesMatchRecompute()
+
+    def test_deleting_every_row_empties_the_tables(self):
+        """Test that zero counts are removed."""
+        JobDescription.objects.all().delete()
+
+        self.assertEqual(SkillDocumentFrequency.objects.count(), 0)
+        self.assertEqual(SkillPairFrequency.objects.count(), 0)
+
+    def test_increment_adds_to_rows_created_concurrently(self):
+        """Test that a row another save created first is incremented, not replaced."""
+        SkillDocumentFrequency.objects.create(skill="zig", count=2)
+
+        aggregates._increment(SkillDocumentFrequency, [{"skill": "zig"}, {"skill": "odin"}], 1)
+
+        counts = dict(SkillDocumentFrequency.objects.filter(skill__in=["zig", "odin"]).values_list("skill", "count"))
+        self.assertEqual(counts, {"zig": 3, "odin": 1})
+
+    def test_saves_only_delete_their_own_zero_counts(self):
+        """Test that a save leaves the rows of keys it did not touch alone."""
+        SkillDocumentFrequency.objects.create(skill="zig", count=0)
+
+        jd = self.jds[0]
+        jd.programming_languages = ["cobol"]
+        jd.save()
+
+        self.assertTrue(SkillDocumentFrequency.objects.filter(skill="zig").exists())
+        self.assertFalse(SkillDocumentFrequency.objects.filter(count__lte=0).exclude(skill="zig").exists())
+
+    def test_answers_match_analyst(self):
+        """Test that frequencies and PMI from the tables equal the Analyst output."""
+        analyst = Analyst([model_to_dict(jd) for jd in JobDescription.objects.all()], skill_tokenizer="structured")
+
+        self.assertEqual(aggregates.get_frequencies("databases"), analyst.get_frequencies("databases"))
+        self.assertEqual(aggregates.get_frequencies("level"), analyst.get_frequencies("level"))
+        self.assertEqual(aggregates.get_PMI_networks(min_cofreq=2), analyst.get_PMI_networks(min_cofreq=2))
+
+    def test_rebuild_command_checks_tables(self):
+        """Test that --check detects drift and a rebuild repairs it."""
+        SkillDocumentFrequency.objects.filter(skill="python").update(count=0)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_skill_aggregates", "--check", stdout=StringIO())
+
+        call_command("rebuild_skill_aggregates", stdout=StringIO())
+        self.assertTablesMatchRecompute()
+
+    def test_rebuild_if_empty_keeps_populated_tables(self):
+        """Test that --if-empty fills empty tables and leaves populated ones alone."""
+        SkillDocumentFrequency.objects.filter(skill="python").update(count=0)
+        call_command("rebuild_skill_aggregates", "--if-empty", stdout=StringIO())
+        self.assertEqual(SkillDocumentFrequency.objects.get(skill="python").count, 0)
+
+        aggregates.rebuild([])
+        call_command("rebuild_skill_aggregates", "--if-empty", stdout=StringIO())
+        self.assertTablesMatchRecompute()
+
+    def test_tables_are_not_maintained_when_disabled(self):
+        """Test that writes leave the tables untouched without ANALYSIS_AGGREGATE_TABLES."""
+        stored = aggregates.stored_counts()
+        with self.settings(ANALYSIS_AGGREGATE_TABLES=False):
+            jd = create_jd(role="backend", databases=["neo4j"], programming_languages=["zig"])
+            jd.databases = ["neo4j", "mysql"]
+            jd.save()
+            self.jds[0].delete()
+
+        self.assertEqual(aggregates.stored_counts(), stored)
+
+    def test_long_skills_and_terms_are_truncated_to_the_key_length(self):
+        """Test that skills and terms longer than the CharField keys are stored truncated."""
+        long_skill = "x" * 300
+        create_jd(role="backend", programming_languages=[long_skill, "python"])
+
+        self.assertTrue(SkillDocumentFrequency.objects.filter(skill="x" * 255).exists())
+        self.assertTrue(SkillPairFrequency.objects.filter(source="python", target="x" * 255).exists())
+        self.assertTablesMatchRecompute()
+
+    def test_duplicate_list_values_are_counted(self):
+        """Test that a value repeated within one list field is added and removed in full."""
+        jd = create_jd(role="backend", databases=["mysql", "mysql"])
+        self.assertTablesMatchRecompute()
+
+        jd.databases = ["mysql"]
+        jd.save()
+        self.assertTablesMatchRecompute()
+
+        jd.delete()
+        self.assertTablesMatchRecompute()
+
+    def test_tfidf_from_stored_counts_matches_batch_vectorizer(self):
+        """Test that incremental TF-IDF agrees with TfidfVectorizer refit on role documents."""
+        for row in generate_jds(20, seed=7):
+            create_jd(**row)
+        jd = JobDescription.objects.first()
+        jd.role = "Data Engineer"
+        jd.frameworks_tools = ["apache spark", "airflow"]
+        jd.save()
+        JobDescription.objects.last().delete()
+        self.assertTablesMatchRecompute()
+
+        role_docs = {}
+        for row in JobDescription.objects.order_by("id").values(*CONTRIBUTION_COLUMNS):
+            if row["role"] is None:
+                continue
+            role_docs.setdefault(row["role"], []).extend(
+                tok for f in SKILL_FIELDS for skill in (row[f] or []) for tok in structured_skill_tokens(skill)
+            )
+        vectorizer = TfidfVectorizer()
+        X = vectorizer.fit_transform([" ".join(doc) for doc in role_docs.values()])
+        names = vectorizer.get_feature_names_out()
+
+        result = aggregates.get_tfidf_skills(top_k=len(names))
+
+        self.assertEqual(list(result), list(role_docs))
+        for i, role in enumerate(role_docs):
+            row = X[i].toarray()[0]
+            expected = {names[j]: row[j] for j in row.nonzero()[0]}
+            actual = {s["skill"]: s["score"] for s in result[role]}
+            self.assertEqual(set(actual), set(expected))
+            for skill, score in expected.items():
+                self.assertAlmostEqual(actual[skill], score, places=9)
+
+
+@override_settings(ANALYSIS_AGGREGATE_TABLES=True)
+class DailyBucketsTest(TestCase):
+    """Test cases for the day-bucket aggregates."""
+
+    def setUp(self):
+        """Spread a small corpus over five local days."""
+        self.days = [date(2025, 3, day) for day in range(1, 6)]
+        for i, row in enumerate(generate_jds(30)):
+            jd = create_jd(**row)
+            jd.created_at = timezone.make_aware(datetime.combine(self.days[i % 5], time(23, 30)))
+            jd.save()
+
+    def test_buckets_follow_writes(self):
+        """Test that moving, updating and deleting rows keep the buckets equal to a recompute."""
+        rows = lambda: JobDescription.objects.values(*CONTRIBUTION_COLUMNS)
+        self.assertEqual(aggregates.stored_counts(), aggregates.compute_from_rows(rows()))
+
+        jd = JobDescription.objects.first()
+        jd.salary_eur_min = 99000.0
+        jd.level = "principal"
+        jd.save()
+        JobDescription.objects.last().delete()
+        self.assertEqual(aggregates.stored_counts(), aggregates.compute_from_rows(rows()))
+
+    def test_range_merge_matches_analyst(self):
+        """Test that merged buckets equal the Analyst over the JDs created in the range."""
+        start, end = self.days[1], self.days[3]
+        jds = JobDescription.objects.filter(created_at__date__range=(start, end))
+        analyst = Analyst([model_to_dict(jd) for jd in jds], skill_tokenizer="structured")
+
+        result = aggregates.get_daily_aggregates(start, end)
+
+        self.assertEqual(result["jobs"], jds.count())
+        for field in ("level", "location", "databases"):
+            self.assertEqual(result["frequencies"][field], dict(analyst.get_frequencies(field)))
+            self.assertEqual(aggregates.get_range_frequencies(field, start, end), analyst.get_frequencies(field))
+        numbers = analyst.get_number_frequencies(["salary_eur_min", "years_experience_min"])
+        self.assertEqual(result["numbers"]["salary_eur_min"], numbers["salary_eur_min"])
+        self.assertEqual(result["numbers"]["years_experience_min"], numbers["years_experience_min"])
+        doc_freq = Counter(
+            skill for jd in jds
+            for skill in {tok for f in SKILL_FIELDS for v in (getattr(jd, f) or []) for tok in structured_skill_tokens(v)}
+        )
+        self.assertEqual(result["skills"], dict(doc_freq))
+
+    def test_whole_day_range(self):
+        """Test that only ranges from local midnight to the end of a day map to buckets."""
+        start = timezone.make_aware(datetime(2025, 3, 2))
+        end = aggregates.range_end(timezone.make_aware(datetime(2025, 3, 4, 23, 59, 59)))
+        self.assertEqual(end, timezone.make_aware(datetime(2025, 3, 4, 23, 59, 59, 999999)))
+        self.assertEqual(aggregates.whole_day_range(start, end), (date(2025, 3, 2), date(2025, 3, 4)))
+        self.assertIsNone(aggregates.whole_day_range(start, timezone.make_aware(datetime(2025, 3, 4, 23, 59, 59))))
+        self.assertIsNone(aggregates.whole_day_range(start, timezone.make_aware(datetime(2025, 3, 4, 12))))
+        self.assertIsNone(aggregates.whole_day_range(start + timedelta(hours=1), end))
@@ -0,0 +1,245 @@
+from unittest import mock
+
+import numpy as np
+import scipy.sparse as sp
+from django.test import SimpleTestCase
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from analysis.benchmarks.corpus import generate_jds
+from analysis.tools.analyst import (
+    Analyst, SKILL_FIELDS, SKILL_LEMMAS, spacy_skill_lemmas, structured_skill_tokens,
+)
+from analysis.tools.tfidf import HashedFeatureNames, named_top_k, sparse_top_k, tfidf_from_documents
+
+
+class AnalystTest(SimpleTestCase):
+    """Test cases for the Analyst."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.data = [
+            {
+                "role": "backend",
+                "company": "Tech Corp",
+                "responsibilities": ["build scalable apis", "review code"],
+                "programming_languages": ["python", "go"],
+                "frameworks_tools": ["django", "docker"],
+                "cloud_platforms": ["aws"],
+                "databases": ["postgresql"],
+                "api_protocols": ["rest"],
+                "methodologies": ["agile"],
+            },
+            {
+                "role": "backend",
+                "company": "Startup Inc",
+                "responsibilities": ["design services", "deploy to production"],
+                "programming_languages": ["python"],
+                "frameworks_tools": ["django"],
+                "cloud_platforms": ["aws"],
+                "databases": ["mysql"],
+                "api_protocols": ["rest"],
+                "methodologies": [],
+            },
+            {
+                "role": "frontend",
+                "company": "Big Company",
+                "responsibilities": ["build user interfaces"],
+                "programming_languages": ["typescript"],
+                "frameworks_tools": ["react"],
+                "cloud_platforms": [],
+                "databases": [],
+                "api_protocols": ["graphql"],
+                "methodologies": ["agile"],
+            },
+        ]
+
+    def test_batched_parsing_matches_single_batch(self):
+        """Test that small pipe batches give the same results as one batch."""
+        single = Analyst(self.data, batch_size=1000)
+        batched = Analyst(self.data, batch_size=1)
+
+        self.assertEqual(single.get_pos_tags_tokens("responsibilities"),
+                         batched.get_pos_tags_tokens("responsibilities"))
+        self.assertEqual(single.get_tfidf_skills(), batched.get_tfidf_skills())
+        self.assertEqual(single.get_PMI_networks(), batched.get_PMI_networks())
+        self.assertEqual(single.assess_swiss_knife_job(), batched.assess_swiss_knife_job())
+
+    def test_swiss_knife_reports_every_row(self):
+        """Test that every JD gets an ODI entry in input order."""
+        results = Analyst(self.data).assess_swiss_knife_job()
+
+        self.assertEqual([r["index"] for r in results], [0, 1, 2])
+        self.assertEqual(results[0]["company"], "Tech Corp")
+
+    def test_skill_vocabulary_is_scoped_to_the_analyst(self):
+        """Test that Analysts intern skills in their own vocabulary, and only cleaned skill tokens."""
+        first, second = Analyst(self.data), Analyst(self.data)
+        first.assess_swiss_knife_job()
+        self.assertEqual(len(first.vocabulary), 0)
+
+        first.skill_cooccurrence()
+        self.assertGreater(len(first.vocabulary), 0)
+        self.assertIsNot(first.vocabulary, second.vocabulary)
+        self.assertEqual(len(second.vocabulary), 0)
+
+    def test_skill_text_is_tokenized_once(self):
+        """Test that TF-IDF, PMI and POS analyses reuse cached tokens."""
+        analyst = Analyst(self.data)
+
+        analyst.get_tfidf_skills()
+        self.assertEqual(analyst.cache_stats["misses"], 3)
+
+        analyst.get_PMI_networks()
+        self.assertEqual(analyst.cache_stats["hits"] + analyst.cache_stats["misses"], 3)
+
+        analyst.get_pos_tags_tokens("responsibilities")
+        analyst.assess_swiss_knife_job()
+        stats = analyst.cache_stats
+        self.assertEqual(stats["misses"], 6)
+        self.assertEqual(stats["hits"], 3)
+        self.assertEqual(stats["entries"], 6)
+
+    def test_structured_skill_tokenizer_matches_spacy(self):
+        """Test that the spaCy-free skill tokenizer gives the same skill analyses on the benchmark corpus."""
+        data = generate_jds(200)
+        spacy_mode = Analyst(data, skill_tokenizer="spacy")
+        structured = Analyst(data, skill_tokenizer="structured")
+
+        self.assertEqual(spacy_mode.get_tfidf_skills(), structured.get_tfidf_skills())
+        self.assertEqual(spacy_mode.get_PMI_networks(min_cofreq=1), structured.get_PMI_networks(min_cofreq=1))
+        self.assertEqual(structured.cache_stats["misses"], 0)
+
+    def test_skill_lemmas_match_spacy(self):
+        """Test that the lemma table holds spaCy's lemma of every benchmark skill that changes."""
+        words = {word for row in generate_jds(200) for f in SKILL_FIELDS for skill in row[f] for word in skill.split()}
+        lemmas = spacy_skill_lemmas(words)
+
+        self.assertIn("kubernetes", lemmas)
+        self.assertEqual({word: SKILL_LEMMAS[word] for word in lemmas if word in SKILL_LEMMAS}, lemmas)
+
+    def test_unknown_skill_tokenizer_is_rejected(self):
+        """Test that an unsupported skill tokenizer raises ValueError."""
+        with self.assertRaises(ValueError):
+            Analyst(self.data, skill_tokenizer="regex")
+
+    def test_tfidf_matches_vectorizer_on_role_documents(self):
+        """Test that columnar TF-IDF equals TfidfVectorizer over joined role documents."""
+        data = generate_jds(200)
+        role_docs = {}
+        for row in data:
+            role_docs.setdefault(row["role"], []).extend(
+                tok for f in SKILL_FIELDS for skill in row[f] for tok in structured_skill_tokens(skill)
+            )
+        vectorizer = TfidfVectorizer()
+        X = vectorizer.fit_transform([" ".join(doc) for doc in role_docs.values()])
+        names = vectorizer.get_feature_names_out()
+
+        analyst = Analyst(data, skill_tokenizer="structured")
+        result = analyst.get_tfidf_skills(top_k=len(names))
+        top5 = analyst.get_tfidf_skills(top_k=5)
+
+        self.assertEqual(list(result), list(role_docs))
+        for i, role in enumerate(role_docs):
+            row = X[i].toarray()[0]
+            expected = {names[j]: row[j] for j in np.flatnonzero(row)}
+            actual = {s["skill"]: s["score"] for s in result[role]}
+            self.assertEqual(set(actual), set(expected))
+            for skill, score in expected.items():
+                self.assertAlmostEqual(actual[skill], score)
+            np.testing.assert_allclose([s["score"] for s in top5[role]], np.sort(row)[::-1][:5])
+
+    def test_tfidf_ngram_and_hashing_modes(self):
+        """Test bigram TF-IDF and that the hashing mode matches the vocabulary mode."""
+        data = generate_jds(100)
+        analyst = Analyst(data, skill_tokenizer="structured")
+
+        bigrams = analyst.get_tfidf_skills(top_k=50, ngram_range=(1, 2))
+        self.assertTrue(any(" " in s["skill"] for skills in bigrams.values() for s in skills))
+
+        exact = analyst.get_tfidf_skills(top_k=1000, ngram_range=(1, 2))
+        hashed = analyst.get_tfidf_skills(top_k=1000, ngram_range=(1, 2), vectorizer="hashing")
+        self.assertEqual(list(exact), list(hashed))
+        for role in exact:
+            expected = {s["skill"]: s["score"] for s in exact[role]}
+            actual = {s["skill"]: s["score"] for s in hashed[role]}
+            self.assertEqual(set(expected), set(actual))
+            for skill, score in expected.items():
+                self.assertAlmostEqual(actual[skill], score)
+
+        with self.assertRaises(ValueError):
+            analyst.get_tfidf_skills(vectorizer="bm25")
+
+    def test_hashed_names_are_resolved_for_selected_columns_only(self):
+        """Test that hashing mode names only the top-k columns, with the vocabulary mode's names."""
+        docs = ["python python django aws", "react react typescript aws", "go go kubernetes docker"]
+        X, names = tfidf_from_documents(docs, vectorizer="hashing")
+        self.assertIsInstance(names, HashedFeatureNames)
+
+        with mock.patch.object(HashedFeatureNames, "resolve", autospec=True,
+                               side_effect=HashedFeatureNames.resolve) as resolve:
+            top = named_top_k(X, names, 1)
+        (_, columns), _ = resolve.call_args
+        self.assertEqual(len(columns), 3)
+
+        exact_X, exact_names = tfidf_from_documents(docs)
+        exact = named_top_k(exact_X, exact_names, 1)
+        self.assertEqual([[name for name, _ in row] for row in top], [[name for name, _ in row] for row in exact])
+        self.assertEqual([name for row in top for name, _ in row], ["python", "react", "go"])
+
+    def test_sparse_top_k_selects_within_rows(self):
+        """Test that sparse_top_k matches a dense sort and skips non-positive scores."""
+        X = sp.csr_matrix(np.array([
+            [0.0, 0.5, 0.2, 0.9, 0.5],
+            [0.0, 0.0, 0.0, 0.0, 0.0],
+            [0.3, 0.0, 0.0, 0.0, 0.0],
+        ]))
+        self.assertEqual(
+            list(sparse_top_k(X, 3)),
+            [[(3, 0.9), (1, 0.5), (4, 0.5)], [], [(0, 0.3)]],
+        )
+        self.assertEqual(list(sparse_top_k(X, 0)), [[], [], []])
+
+    def test_missing_skill_lists_are_treated_as_empty(self):
+        """Test that None JSON lists do not crash the skill analyses."""
+        data = [dict(row) for row in self.data]
+        data[0]["databases"] = None
+        data[1]["responsibilities"] = None
+        del data[2]["methodologies"]
+        analyst = Analyst(data)
+
+        self.assertIn("backend", analyst.get_tfidf_skills())
+        analyst.get_PMI_networks(min_cofreq=1)
+        results = analyst.assess_swiss_knife_job()
+        self.assertIsNone(results[1]["odi_tools"])
+
+    def test_analysts_share_the_spacy_pipeline(self):
+        """Test that the model is loaded once per process."""
+        self.assertIs(Analyst(self.data).nlp, Analyst(self.data).nlp)
+
+    def test_methods_run_only_their_components(self):
+        """Test that the parser is skipped and results match the full pipeline."""
+        minimal = Analyst(self.data)
+        full = Analyst(self.data)
+        full.components = dict.fromkeys(Analyst.COMPONENTS)
+
+        with mock.patch.object(minimal.nlp, "pipe", wraps=minimal.nlp.pipe) as pipe:
+            results = minimal.assess_swiss_knife_job()
+        disabled = pipe.call_args.kwargs["disable"]
+        self.assertIn("parser", disabled)
+        self.assertIn("lemmatizer", disabled)
+        self.assertNotIn("tagger", disabled)
+
+        self.assertEqual(results, full.assess_swiss_knife_job())
+        self.assertEqual(minimal.get_pos_tags_tokens("responsibilities"),
+                         full.get_pos_tags_tokens("responsibilities"))
+        self.assertEqual(minimal.get_tfidf_skills(), full.get_tfidf_skills())
+
+    def test_pos_only_tokens_are_reparsed_for_lemmas(self):
+        """Test that tokens parsed without the lemmatizer are not reused for lemma analyses."""
+        analyst = Analyst(self.data)
+        analyst.assess_swiss_knife_job()
+        analyst.get_pos_tags_tokens("responsibilities")
+        self.assertEqual(analyst.cache_stats["misses"], 6)
+
+        analyst.assess_swiss_knife_job()
+        self.assertEqual(analyst.cache_stats["misses"], 6)
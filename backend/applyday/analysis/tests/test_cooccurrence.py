@@ -0,0 +1,65 @@
+import math
+from collections import Counter
+from itertools import combinations
+
+from django.test import SimpleTestCase
+
+from analysis.benchmarks.corpus import generate_jds, SKILLS
+from analysis.tools.cooccurrence import doc_skill_matrix, pmi_edges
+
+
+def reference_pmi(doc_skills, min_cofreq):
+    """PMI computed with the original pairwise Counter loop."""
+    skill_freq, pair_freq = Counter(), Counter()
+    for skills in doc_skills:
+        skills = set(skills)
+        skill_freq.update(skills)
+        pair_freq.update(combinations(sorted(skills), 2))
+    n = len(doc_skills)
+    edges = {}
+    for (s1, s2), co_freq in pair_freq.items():
+        pmi = math.log2((co_freq / n) / ((skill_freq[s1] / n) * (skill_freq[s2] / n)))
+        if co_freq >= min_cofreq and pmi > 0:
+            edges[(s1, s2)] = pmi
+    return edges
+
+
+class PMIEdgesTest(SimpleTestCase):
+    """Test cases for the sparse PMI engine."""
+
+    def setUp(self):
+        """Build skill lists from the synthetic corpus."""
+        self.doc_skills = [
+            sum((row[field] for field in SKILLS), []) for row in generate_jds(300)
+        ]
+
+    def test_matches_pairwise_reference(self):
+        """Test that sparse PMI equals the pairwise Counter implementation."""
+        X, vocab = doc_skill_matrix(self.doc_skills)
+        edges = pmi_edges(X, vocab, min_cofreq=3)
+        expected = reference_pmi(self.doc_skills, min_cofreq=3)
+
+        self.assertEqual({(e["source"], e["target"]) for e in edges}, set(expected))
+        for e in edges:
+            self.assertAlmostEqual(e["weight"], expected[(e["source"], e["target"])])
+            self.assertLess(e["source"], e["target"])
+
+    def test_npmi_is_bounded(self):
+        """Test that NPMI weights stay within (0, 1]."""
+        X, vocab = doc_skill_matrix(self.doc_skills)
+        weights = [e["weight"] for e in pmi_edges(X, vocab, min_cofreq=1, measure="npmi")]
+
+        self.assertTrue(weights)
+        self.assertTrue(all(0 < w <= 1 for w in weights))
+
+    def test_empty_input(self):
+        """Test that no documents give no edges."""
+        X, vocab = doc_skill_matrix([])
+        self.assertEqual(pmi_edges(X, vocab), [])
+
+    def test_unknown_measure_is_rejected(self):
+        """Test that an unsupported measure raises ValueError, including the redundant "ppmi"."""
+        X, vocab = doc_skill_matrix(self.doc_skills)
+        for measure in ("dice", "ppmi"):
+            with self.assertRaises(ValueError):
+                pmi_edges(X, vocab, measure=measure)
@@ -0,0 +1,31 @@
+from collections import Counter
+
+from django.test import SimpleTestCase
+
+from analysis.benchmarks.corpus import ROLE_PROFILES, SKILLS, generate_realistic_jds
+from analysis.tools.analyst import Analyst
+
+
+class RealisticCorpusTest(SimpleTestCase):
+    """Test cases for the benchmark corpus generator."""
+
+    def test_generator_is_deterministic(self):
+        """Test that a seed always yields the same rows."""
+        self.assertEqual(generate_realistic_jds(50, seed=3), generate_realistic_jds(50, seed=3))
+        self.assertNotEqual(generate_realistic_jds(50, seed=3), generate_realistic_jds(50, seed=4))
+
+    def test_skills_follow_role_profiles(self):
+        """Test that each role's most common skills come from its profile."""
+        rows = generate_realistic_jds(2000)
+        for role, profile in ROLE_PROFILES.items():
+            counts = Counter(
+                skill for row in rows if row["role"] == role for field in SKILLS for skill in row[field]
+            )
+            top = [skill for skill, _ in counts.most_common(3)]
+            self.assertTrue(set(top) <= set(profile), (role, top))
+
+    def test_rows_are_analyzable(self):
+        """Test that the rows run through the Analyst."""
+        analyst = Analyst(generate_realistic_jds(30), skill_tokenizer="structured")
+        self.assertTrue(analyst.get_tfidf_skills())
+        self.assertTrue(analyst.get_number_frequencies("salary_eur_min"))
@@ -0,0 +1,118 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from application.models import JobDescription, JobDescriptionText
+from analysis import duplicates
+from analysis.models import LSHBucket, TextSignature
+from analysis.tools.minhash import MinHasher, shingles, similarity
+
+POSTING = (
+    "Posted on {date}. We are hiring a senior backend engineer to design and build scalable APIs "
+    "in Python and Django. You will own services running on AWS, work with PostgreSQL and Redis, "
+    "mentor junior engineers, review code and improve our CI/CD pipelines. We offer a hybrid setup "
+    "in Dublin, a pension plan, health insurance and a yearly learning budget."
+)
+OTHER = (
+    "Frontend developer wanted to build React and TypeScript interfaces for our design system. "
+    "Experience with accessibility, testing with Jest and close collaboration with designers is a plus."
+)
+
+
+class MinHasherTest(SimpleTestCase):
+    """Test cases for MinHash signatures."""
+
+    def test_similarity_estimates_jaccard(self):
+        """Test that the signature agreement is close to the exact shingle Jaccard similarity."""
+        hasher = MinHasher(num_perm=256)
+        a, b = POSTING.format(date="1 May"), POSTING.format(date="3 June") + " Apply by email."
+        exact = len(shingles(a) & shingles(b)) / len(shingles(a) | shingles(b))
+
+        self.assertAlmostEqual(similarity(hasher.signature(a), hasher.signature(b)), exact, delta=0.1)
+        self.assertLess(similarity(hasher.signature(a), hasher.signature(OTHER)), 0.2)
+
+    def test_signatures_are_stable(self):
+        """Test that equal seeds give equal signatures and band keys."""
+        first, second = MinHasher(seed=3).signature(POSTING), MinHasher(seed=3).signature(POSTING)
+        self.assertTrue((first == second).all())
+        self.assertEqual(MinHasher.band_keys(first, 16), MinHasher.band_keys(second, 16))
+
+
+class DuplicateIndexTest(TestCase):
+    """Test cases for the MinHash/LSH index of JobDescriptionText."""
+
+    def setUp(self):
+        """Create two reposts of one job and an unrelated job."""
+        self.texts = [
+            JobDescriptionText.objects.create(text=POSTING.format(date="1 May 2025")),
+            JobDescriptionText.objects.create(text=POSTING.format(date="14 May 2025")),
+            JobDescriptionText.objects.create(text=OTHER),
+        ]
+
+    def test_saved_texts_are_indexed(self):
+        """Test that saving a text stores its signature and one bucket per band."""
+        self.assertEqual(TextSignature.objects.count(), 3)
+        self.assertEqual(LSHBucket.objects.filter(job_text=self.texts[0]).count(), duplicates.BANDS)
+
+    def test_near_duplicates_are_found(self):
+        """Test that a repost with another date is found and the unrelated text is not."""
+        matches = duplicates.find_near_duplicates(POSTING.format(date="2 June 2025"))
+
+        self.assertEqual({text_id for text_id, _ in matches}, {self.texts[0].id, self.texts[1].id})
+        self.assertTrue(all(score >= 0.8 for _, score in matches))
+
+    def test_edits_and_deletes_update_the_index(self):
+        """Test that an edited text leaves its old cluster and a deleted one leaves the index."""
+        self.assertEqual(duplicates.clusters(), [[self.texts[0].id, self.texts[1].id]])
+
+        self.texts[1].text = OTHER + " Remote friendly."
+        self.texts[1].save()
+        self.assertEqual(duplicates.clusters(), [[self.texts[1].id, self.texts[2].id]])
+
+        self.texts[2].delete()
+        self.assertEqual(duplicates.clusters(), [])
+        self.assertEqual(TextSignature.objects.count(), 2)
+
+    def test_extracted_duplicates_map_to_job_descriptions(self):
+        """Test that only texts with an extracted near-duplicate are mapped, to its JobDescription."""
+        jd = JobDescription.objects.create(job_text=self.texts[0], role="backend")
+        repost = JobDescriptionText.objects.create(text=POSTING.format(date="20 May 2025"))
+
+        mapped = duplicates.extracted_duplicates([repost, self.texts[2]])
+        self.assertEqual(mapped, {repost.id: jd})
+
+    def test_texts_without_words_are_never_duplicates(self):
+        """Test that empty texts are not indexed, clustered or mapped to each other's extraction."""
+        empty = [JobDescriptionText.objects.create(text=text) for text in ("", "  \n", "---")]
+        jd = JobDescription.objects.create(job_text=empty[0], role="backend")
+        self.texts[0].text = ""
+        self.texts[0].save()
+
+        self.assertFalse(TextSignature.objects.filter(job_text__in=[*empty, self.texts[0]]).exists())
+        self.assertFalse(LSHBucket.objects.filter(job_text__in=[*empty, self.texts[0]]).exists())
+        self.assertEqual(duplicates.clusters(), [])
+        self.assertEqual(duplicates.find_near_duplicates(""), [])
+        self.assertEqual(duplicates.extracted_duplicates(empty[1:]), {})
+        self.assertNotIn(jd, duplicates.extracted_duplicates([self.texts[1]]).values())
+
+    def test_large_buckets_are_clustered_without_comparing_every_pair(self):
+        """Test that n reposts sharing buckets take n - 1 similarity estimates and form one cluster."""
+        copies = [JobDescriptionText.objects.create(text=POSTING.format(date="2 May 2025")) for _ in range(20)]
+        with mock.patch("analysis.duplicates.similarity", wraps=similarity) as estimate:
+            found = duplicates.clusters()
+
+        self.assertEqual(found, [sorted([self.texts[0].id, self.texts[1].id, *(c.id for c in copies)])])
+        # 22 reposts in one cluster: comparing every pair would take 231 estimates
+        self.assertEqual(estimate.call_count, 21)
+
+    def test_rebuild_command(self):
+        """Test that the command rebuilds a cleared index."""
+        TextSignature.objects.all().delete()
+        LSHBucket.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_minhash_index", stdout=out)
+
+        self.assertIn("Indexed 3 texts; 1 near-duplicate clusters", out.getvalue())
+        self.assertEqual(duplicates.clusters(), [[self.texts[0].id, self.texts[1].id]])
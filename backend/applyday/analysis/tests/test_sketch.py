@@ -0,0 +1,85 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from analysis.benchmarks.corpus import generate_jds
+from analysis.tools.sketch import ApproximatePairCounts, CountMinSketch, SpaceSaving
+from analysis.tools.streaming import StreamingAnalyst, STREAM_COLUMNS
+
+
+class CountMinSketchTest(SimpleTestCase):
+    """Test cases for the count-min sketch."""
+
+    def test_estimates_are_within_bounds(self):
+        """Test that estimates never undercount and overcount by at most epsilon * total."""
+        rng = np.random.default_rng(1)
+        keys = np.arange(5000, dtype=np.int64) << np.int64(32)
+        counts = rng.zipf(1.5, len(keys)).clip(max=1000)
+        sketch = CountMinSketch(epsilon=0.001, delta=0.01)
+        sketch.add(keys, counts)
+
+        error = sketch.estimate(keys) - counts
+        self.assertTrue((error >= 0).all())
+        self.assertTrue((error <= sketch.epsilon * sketch.total).all())
+        self.assertEqual(sketch.total, int(counts.sum()))
+
+    def test_dimensions_follow_error_bounds(self):
+        """Test that width and depth come from epsilon and delta."""
+        sketch = CountMinSketch(epsilon=0.01, delta=0.001)
+        self.assertEqual(sketch.width, 512)
+        self.assertEqual(sketch.depth, 7)
+        with self.assertRaises(ValueError):
+            CountMinSketch(epsilon=0)
+
+
+class SpaceSavingTest(SimpleTestCase):
+    """Test cases for the Space-Saving summary."""
+
+    def test_heavy_hitters_are_tracked(self):
+        """Test that every key above total / capacity is kept with an overestimated count."""
+        rng = np.random.default_rng(2)
+        summary = SpaceSaving(capacity=50)
+        totals = np.zeros(2000, dtype=np.int64)
+        for _ in range(40):
+            keys = np.unique(rng.zipf(1.3, 300) % 2000).astype(np.int64)
+            counts = rng.integers(1, 5, len(keys))
+            summary.update(keys, counts)
+            totals[keys] += counts
+
+        self.assertEqual(len(summary.keys), 50)
+        heavy = np.flatnonzero(totals > totals.sum() / 50)
+        self.assertTrue(np.isin(heavy, summary.keys).all())
+        self.assertTrue((summary.counts >= totals[summary.keys]).all())
+
+
+class ApproximatePMITest(SimpleTestCase):
+    """Test cases for approximate PMI in the StreamingAnalyst."""
+
+    def setUp(self):
+        """Project a generated corpus onto the streamed columns."""
+        self.data = [{col: row.get(col) for col in STREAM_COLUMNS} for row in generate_jds(200)]
+
+    def test_loose_bounds_match_exact_network(self):
+        """Test that a sketch wide enough for every pair gives the exact network."""
+        exact = StreamingAnalyst(iter(self.data), chunk_size=50, skill_tokenizer="structured")
+        approximate = StreamingAnalyst(
+            iter(self.data), chunk_size=50, skill_tokenizer="structured",
+            pair_sketch=ApproximatePairCounts(epsilon=1e-6, heavy_hitters=100_000),
+        )
+        self.assertEqual(approximate.get_PMI_networks(), exact.get_PMI_networks())
+        self.assertIsNone(exact.pmi_approximation())
+        params = approximate.pmi_approximation()
+        self.assertEqual(params["heavy_hitters"], 100_000)
+        self.assertGreater(params["total_pairs"], 0)
+
+    def test_memory_is_bounded(self):
+        """Test that the sketch footprint does not grow with the number of JDs."""
+        sizes = []
+        for rows in (50, 200):
+            streaming = StreamingAnalyst(
+                iter(self.data[:rows]), chunk_size=25, skill_tokenizer="structured",
+                pair_sketch=ApproximatePairCounts(epsilon=0.01, heavy_hitters=20),
+            )
+            edges = streaming.get_PMI_networks(min_cofreq=1)
+            self.assertLessEqual(len(edges), 20)
+            sizes.append(streaming.pmi_approximation()["memory_bytes"])
+        self.assertEqual(sizes[0], sizes[1])
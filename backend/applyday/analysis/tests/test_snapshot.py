@@ -0,0 +1,105 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from application.models import JobDescription, JobDescriptionText
+from analysis import snapshot
+from analysis.benchmarks.corpus import generate_jds
+from analysis.tests.test_aggregates import create_jd
+from analysis.tools.analyst import Analyst
+from analysis.tools.streaming import StreamingAnalyst, STREAM_COLUMNS
+
+
+class SnapshotTest(TestCase):
+    """Test cases for the Arrow snapshot of JobDescription."""
+
+    def setUp(self):
+        """Point the snapshot at a temporary directory and create a small corpus."""
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings = override_settings(
+            ANALYSIS_SNAPSHOT_ENABLED=True, ANALYSIS_SNAPSHOT_DIR=self.directory, ANALYSIS_SNAPSHOT_MAX_PARTS=1000
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.jds = [create_jd(**row) for row in generate_jds(30)]
+
+    def expected_rows(self):
+        return [
+            snapshot.normalize(row)
+            for row in JobDescription.objects.order_by("id").values(*snapshot.SNAPSHOT_COLUMNS)
+        ]
+
+    def assertSnapshotMatchesDatabase(self):
+        table = snapshot.load()
+        self.assertEqual(table.select(snapshot.SNAPSHOT_COLUMNS).to_pylist(), self.expected_rows())
+
+    def test_hooks_append_saves_and_deletes(self):
+        """Test that appended parts replay creates, updates and deletes."""
+        self.assertSnapshotMatchesDatabase()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            jd = self.jds[0]
+            jd.role = "Platform Engineer"
+            jd.databases = None
+            jd.save()
+            self.jds[1].delete()
+        self.assertSnapshotMatchesDatabase()
+        self.assertGreater(len(snapshot.parts()), 1)
+
+        call_command("snapshot_job_descriptions", stdout=StringIO())
+        self.assertEqual(len(snapshot.parts()), 1)
+        self.assertSnapshotMatchesDatabase()
+
+    def test_columns_are_dictionary_and_list_encoded(self):
+        """Test the column types of a compacted part."""
+        call_command("snapshot_job_descriptions", stdout=StringIO())
+        table = snapshot.load()
+
+        self.assertTrue(str(table.schema.field("role").type).startswith("dictionary"))
+        self.assertEqual(str(table.schema.field("programming_languages").type), "list<item: string>")
+        self.assertEqual(table.num_rows, len(self.jds))
+
+    def test_check_detects_stale_snapshot(self):
+        """Test that --check fails when writes bypassed the hooks."""
+        call_command("snapshot_job_descriptions", "--check", stdout=StringIO())
+
+        JobDescription.objects.filter(pk=self.jds[0].pk).update(role="Changed")
+        with self.assertRaises(CommandError):
+            call_command("snapshot_job_descriptions", "--check", stdout=StringIO())
+
+    def test_filters_and_streaming_analyst(self):
+        """Test that analyses over the snapshot equal analyses over the database rows."""
+        ids = [jd.pk for jd in self.jds[:10]]
+        table = snapshot.filter_table(snapshot.load(), ids=ids)
+        rows = JobDescription.objects.filter(id__in=ids).order_by("id").values(*STREAM_COLUMNS)
+
+        streaming = StreamingAnalyst.from_arrow(table, chunk_size=4)
+        analyst = Analyst(list(rows))
+
+        self.assertEqual(streaming.get_PMI_networks(min_cofreq=1), analyst.get_PMI_networks(min_cofreq=1))
+        self.assertEqual(streaming.assess_swiss_knife_job(), analyst.assess_swiss_knife_job())
+        self.assertEqual(streaming.get_frequencies("level"), analyst.get_frequencies("level"))
+
+        first = JobDescription.objects.order_by("created_at").first().created_at
+        dated = snapshot.filter_table(snapshot.load(), start=first, end=first)
+        self.assertEqual(dated.column("id").to_pylist(), [self.jds[0].pk])
+
+    def test_stale_snapshot_is_not_served(self):
+        """Test that rows written past the signals make reports read the database instead."""
+        self.assertIsNotNone(snapshot.load_current())
+
+        # bulk_create sends no signals, so the snapshot misses the new row
+        job_text = JobDescriptionText.objects.create(text="JD text")
+        JobDescription.objects.bulk_create([JobDescription(job_text=job_text, role="Bypass")])
+        self.assertFalse(snapshot.matches_database(snapshot.load()))
+        with self.assertLogs("analysis.snapshot", level="WARNING"):
+            self.assertIsNone(snapshot.load_current())
+
+        call_command("snapshot_job_descriptions", stdout=StringIO())
+        self.assertIsNotNone(snapshot.load_current())
@@ -0,0 +1,93 @@
+from django.test import SimpleTestCase
+
+from analysis.benchmarks.corpus import generate_jds
+from analysis.tools.analyst import Analyst, SKILL_FIELDS
+from analysis.tools.streaming import StreamingAnalyst, STREAM_COLUMNS, stream_columns
+from analysis.tools.tfidf import document_ngrams
+
+
+class StreamingAnalystTest(SimpleTestCase):
+    """Test cases for the chunked StreamingAnalyst."""
+
+    def setUp(self):
+        """Project a generated corpus onto the streamed columns."""
+        self.data = [{col: row.get(col) for col in STREAM_COLUMNS} for row in generate_jds(60)]
+        self.data[3]["role"] = None
+        self.data[4]["responsibilities"] = None
+        self.data[5]["databases"] = None
+
+    def assertSameAnalyses(self, streaming, analyst, **tfidf_params):
+        for column in ("role", "level", "location", "programming_languages", "databases"):
+            self.assertEqual(streaming.get_frequencies(column), analyst.get_frequencies(column))
+        self.assertEqual(streaming.get_frequencies("role", text_mode=True),
+                         analyst.get_frequencies("role", text_mode=True))
+        self.assertEqual(streaming.get_pos_tags_tokens("responsibilities"),
+                         analyst.get_pos_tags_tokens("responsibilities"))
+        self.assertEqual(streaming.get_PMI_networks(min_cofreq=1), analyst.get_PMI_networks(min_cofreq=1))
+        self.assertEqual(streaming.get_PMI_networks(measure="npmi"), analyst.get_PMI_networks(measure="npmi"))
+        self.assertEqual(streaming.assess_swiss_knife_job(), analyst.assess_swiss_knife_job())
+
+        expected = analyst.get_tfidf_skills(top_k=1000, **tfidf_params)
+        actual = streaming.get_tfidf_skills(top_k=1000, **tfidf_params)
+        self.assertEqual(list(actual), list(expected))
+        for role in expected:
+            self.assertEqual(
+                {s["skill"]: round(s["score"], 9) for s in actual[role]},
+                {s["skill"]: round(s["score"], 9) for s in expected[role]},
+            )
+
+    def test_chunked_results_match_analyst(self):
+        """Test that merged chunk aggregates equal the single-DataFrame Analyst."""
+        analyst = Analyst(self.data)
+        streaming = StreamingAnalyst(iter(self.data), chunk_size=7)
+
+        self.assertSameAnalyses(streaming, analyst)
+        self.assertEqual(streaming.n_rows, len(self.data))
+
+    def test_ngrams_across_chunks_match_analyst(self):
+        """Test that n-grams spanning two chunks of one role are counted."""
+        analyst = Analyst(self.data, skill_tokenizer="structured")
+        for vectorizer in ("tfidf", "hashing"):
+            streaming = StreamingAnalyst(
+                iter(self.data), chunk_size=5, ngram_range=(1, 3), skill_tokenizer="structured"
+            )
+            self.assertSameAnalyses(streaming, analyst, ngram_range=(1, 3), vectorizer=vectorizer)
+
+    def test_other_ngram_range_is_rejected(self):
+        """Test that TF-IDF is only answered for the collected n-gram range."""
+        streaming = StreamingAnalyst(iter(self.data), chunk_size=10)
+        with self.assertRaises(ValueError):
+            streaming.get_tfidf_skills(ngram_range=(1, 2))
+
+    def test_empty_input(self):
+        """Test that no rows give the empty results of Analyst."""
+        streaming = StreamingAnalyst(iter([]))
+
+        self.assertEqual(streaming.get_tfidf_skills(), {})
+        self.assertEqual(streaming.get_PMI_networks(), [])
+        self.assertEqual(streaming.assess_swiss_knife_job(), [])
+        self.assertEqual(streaming.get_pos_tags_tokens("responsibilities")["all"], [])
+
+    def test_document_ngrams_skip_counted_words(self):
+        """Test that skipped leading words only contribute n-grams reaching past them."""
+        self.assertEqual(
+            list(document_ngrams(["a", "b", "c"], (1, 2), skip=2)),
+            ["c", "b c"],
+        )
+
+    def test_only_selected_analyses_are_collected(self):
+        """Test that selected methods match Analyst and the others are not answered."""
+        # Only the columns the selected methods read are streamed
+        columns = stream_columns(["get_PMI_networks"])
+        self.assertEqual(columns, SKILL_FIELDS)
+        rows = [{col: row[col] for col in columns} for row in self.data]
+        streaming = StreamingAnalyst(iter(rows), chunk_size=10, analyses=["get_PMI_networks"])
+        analyst = Analyst(self.data)
+
+        self.assertEqual(streaming.get_PMI_networks(min_cofreq=1), analyst.get_PMI_networks(min_cofreq=1))
+        with self.assertRaises(ValueError):
+            streaming.get_frequencies("role")
+        with self.assertRaises(ValueError):
+            streaming.assess_swiss_knife_job()
+        with self.assertRaises(ValueError):
+            StreamingAnalyst(iter(self.data), analyses=["get_everything"])
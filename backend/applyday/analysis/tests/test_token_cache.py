@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from analysis.tools.analyst import Analyst
+from analysis.tools.token_cache import TokenCache
+
+
+class TokenCacheTest(SimpleTestCase):
+    """Test cases for the persistent TokenCache."""
+
+    def setUp(self):
+        """Set up a cache in a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = TokenCache(os.path.join(self.tmpdir.name, "tokens.sqlite3"), max_entries=2)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_entries_are_scoped_by_model_version(self):
+        """Test that a different model version does not see cached tokens."""
+        self.cache.put_many({"h1": [["python", "python", "NOUN", False, False]]}, "en_core_web_sm", "3.8.0")
+
+        self.assertIn("h1", self.cache.get_many(["h1"], "en_core_web_sm", "3.8.0"))
+        self.assertEqual(self.cache.get_many(["h1"], "en_core_web_sm", "3.9.0"), {})
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the store never grows past max_entries."""
+        self.cache.put_many({"h1": []}, "m", "1")
+        self.cache.put_many({"h2": []}, "m", "1")
+        self.cache.get_many(["h1"], "m", "1")
+        self.cache.put_many({"h3": []}, "m", "1")
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(set(self.cache.get_many(["h1", "h2", "h3"], "m", "1")), {"h1", "h3"})
+
+    def test_analyst_reads_tokens_from_store(self):
+        """Test that a new Analyst over the same corpus skips spaCy."""
+        self.cache.max_entries = 100
+        data = [{"role": "backend", "responsibilities": ["build apis", "review code"]}]
+
+        first = Analyst(data, token_cache=self.cache)
+        expected = first.get_pos_tags_tokens("responsibilities")
+
+        second = Analyst(data, token_cache=self.cache)
+        self.assertEqual(second.get_pos_tags_tokens("responsibilities"), expected)
+        self.assertEqual(second.cache_stats["store_hits"], 1)
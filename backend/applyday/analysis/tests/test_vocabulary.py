@@ -0,0 +1,79 @@
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from analysis.benchmarks.corpus import generate_jds, SKILLS
+from analysis.tools.vocabulary import SkillSets, SkillVocabulary, merge_counts, split_pair_keys
+
+
+class SkillVocabularyTest(SimpleTestCase):
+    """Test cases for interned skill ids."""
+
+    def test_ids_are_stable(self):
+        """Test that a skill keeps its id and ids resolve back to skills."""
+        vocabulary = SkillVocabulary()
+        first = vocabulary.intern_many(["python", "sql", "python"])
+        second = vocabulary.intern_many(["docker", "sql"])
+        self.assertEqual(first.tolist(), [0, 1, 0])
+        self.assertEqual(second.tolist(), [2, 1])
+        self.assertEqual(vocabulary.skills([2, 0]), ["docker", "python"])
+        self.assertEqual(len(vocabulary), 3)
+
+
+class SkillSetsTest(SimpleTestCase):
+    """Test cases for array-backed JD skill sets."""
+
+    def setUp(self):
+        """Build skill lists from the synthetic corpus."""
+        self.vocabulary = SkillVocabulary()
+        self.doc_skills = [
+            sum((row[field] for field in SKILLS), []) for row in generate_jds(200)
+        ]
+
+    def test_frequencies_match_counter(self):
+        """Test that multiset frequencies equal a Counter over the flattened lists."""
+        sets = SkillSets.from_lists(self.doc_skills, unique=False, vocabulary=self.vocabulary)
+        expected = Counter(skill for skills in self.doc_skills for skill in skills)
+        self.assertEqual(sets.frequencies(), expected)
+        self.assertEqual(list(sets.frequencies()), list(expected))
+
+    def test_sets_are_deduplicated(self):
+        """Test that set rows hold each skill once."""
+        sets = SkillSets.from_lists([["a", "b", "a"], [], ["c"]], vocabulary=self.vocabulary)
+        self.assertEqual(sets.sizes().tolist(), [2, 0, 1])
+        self.assertEqual(self.vocabulary.skills(sets.row(0)), ["a", "b"])
+
+    def test_overlap(self):
+        """Test that overlap counts the wanted skills each JD contains."""
+        sets = SkillSets.from_lists([["a", "b"], ["b", "c"], []], vocabulary=self.vocabulary)
+        self.assertEqual(sets.overlap(["b", "c", "z"]).tolist(), [1, 2, 0])
+        self.assertEqual(len(self.vocabulary), 3)
+
+    def test_cooccurrence_matches_pairwise_reference(self):
+        """Test that document and pair frequencies equal the pairwise Counter loop."""
+        sets = SkillSets.from_lists(self.doc_skills, vocabulary=self.vocabulary)
+        ids, doc_freq, keys, counts = sets.cooccurrence()
+        a, b = split_pair_keys(keys)
+        skill = self.vocabulary.skills
+        pairs = {tuple(sorted(pair)): n for pair, n in zip(zip(skill(a), skill(b)), counts.tolist())}
+
+        expected_freq, expected_pairs = Counter(), Counter()
+        for skills in self.doc_skills:
+            expected_freq.update(set(skills))
+            expected_pairs.update(combinations(sorted(set(skills)), 2))
+        self.assertEqual(dict(zip(skill(ids), doc_freq.tolist())), dict(expected_freq))
+        self.assertEqual(pairs, dict(expected_pairs))
+
+    def test_merged_chunks_match_whole(self):
+        """Test that merging per-chunk pair counts equals counting all JDs at once."""
+        whole = SkillSets.from_lists(self.doc_skills, vocabulary=self.vocabulary).cooccurrence()
+        keys, counts = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        for start in range(0, len(self.doc_skills), 64):
+            chunk = SkillSets.from_lists(self.doc_skills[start:start + 64], vocabulary=self.vocabulary)
+            _, _, new_keys, new_counts = chunk.cooccurrence()
+            keys, counts = merge_counts(keys, counts, new_keys, new_counts)
+        order = np.argsort(whole[2])
+        self.assertEqual(keys.tolist(), whole[2][order].tolist())
+        self.assertEqual(counts.tolist(), whole[3][order].tolist())
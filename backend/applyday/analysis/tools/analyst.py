@@ -1,50 +1,375 @@
 # backend/applyday/analysis/tools/analyst.py
 # Author: Zhuang Xiaojian 
-import math
+import hashlib
+import json
 import string
-import spacy
+import threading
 import pandas as pd
 import numpy as np
-from collections import Counter, defaultdict
-from sklearn.feature_extraction.text import TfidfVectorizer
-from itertools import combinations
-from typing import List, Dict
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfTransformer
+from spacy.lang.en.stop_words import STOP_WORDS
+from typing import List, Dict, Iterable, NamedTuple, Tuple
+
+from analysis.tools.cooccurrence import codes_matrix, pmi_edges
+from analysis.tools.nlp import get_nlp
+from analysis.tools.tfidf import VECTORIZERS, named_top_k, tfidf_from_documents, token_terms
+from analysis.tools.vocabulary import SkillSets, SkillVocabulary
+
+SKILL_FIELDS = [
+    "programming_languages",
+    "frameworks_tools",
+    "cloud_platforms",
+    "databases",
+    "api_protocols",
+    "methodologies",
+]
+
+
+PUNCT_SET = frozenset(string.punctuation) | {"’", "”", "“", "‘", "–", "—", "…"}
+EXTRA_STOPWORDS = frozenset({
+    "or", "in", "a", "with", "from", "an", "other", "such", "as", "to", "for", "on", "of", "and", "and/or",
+    "s", "/", "-",
+    "recent", "recently", "currently", "first", "high", "preferred", "similar", "relevant",
+    "equivalent", "related",
+    "degree", "field", "fields", "discipline", "subjects", "courses", "majors", "work", "experience"
+})
+# Precompiled for the structured skill tokenizer, equal to Analyst.stopwords
+STRUCTURED_STOPWORDS = frozenset(STOP_WORDS) | EXTRA_STOPWORDS | PUNCT_SET
+
+# Lemmas spaCy gives the words of the known skill vocabulary where they differ from the word
+# (e.g. "kubernetes" -> "kubernete"), so structured tokens match the spaCy tokenizer.
+# Regenerate with `python manage.py build_skill_lemmas` after changing the spaCy model.
+SKILL_LEMMAS_PATH = Path(__file__).with_name("skill_lemmas.json")
+SKILL_LEMMAS: Dict[str, str] = json.loads(SKILL_LEMMAS_PATH.read_text(encoding="utf-8"))
+
+
+# spaCy components an analysis needs; the rest of the pipeline (e.g. the parser) is skipped.
+# The rule-based lemmatizer reads POS, so lemmas also need the tagger and attribute_ruler.
+LEMMA_COMPONENTS = frozenset({"tok2vec", "tagger", "attribute_ruler", "lemmatizer"})
+POS_COMPONENTS = frozenset({"tok2vec", "tagger", "attribute_ruler"})
+
+
+class Token(NamedTuple):
+    """The parts of a spaCy token the analyses rely on."""
+    text: str
+    lemma: str
+    pos: str
+    is_stop: bool
+    is_punct: bool
+
+
+def text_key(text: str) -> str:
+    """Returns the hash used to memoize the tokens of a text."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=65536)
+def structured_skill_tokens(skill: str) -> Tuple[str, ...]:
+    """
+    Tokenizes one skill value without spaCy.
+    Skill fields are already deduped lower_snake_case tokens (see
+    `JobSchema._normalize_array`), so splitting on whitespace, dropping
+    stopwords/punctuation and mapping through `SKILL_LEMMAS` matches the spaCy
+    tokenizer for the known skill vocabulary. It can still differ from spaCy for
+    words missing from `SKILL_LEMMAS`, for words spaCy lemmatizes differently
+    depending on the neighbouring skills, and for skills spaCy splits on inner
+    punctuation (e.g. "node.js").
+    Args:
+        skill (str): A normalized skill value.
+    Returns:
+        tuple of cleaned skill lemmas.
+    """
+    return tuple(
+        SKILL_LEMMAS.get(tok, tok) for tok in str(skill).lower().split()
+        if tok not in STRUCTURED_STOPWORDS and not all(ch in PUNCT_SET for ch in tok)
+    )
+
+
+def spacy_skill_lemmas(words: Iterable[str], nlp=None) -> Dict[str, str]:
+    """
+    Lemmatizes skill words one at a time with spaCy.
+    Returns:
+        dict mapping every word spaCy keeps as one token to its lemma, where they differ.
+    """
+    nlp = nlp or get_nlp()
+    words = sorted(set(words))
+    disable = [p for p in nlp.pipe_names if p not in LEMMA_COMPONENTS]
+    lemmas = {}
+    for word, doc in zip(words, nlp.pipe(words, disable=disable)):
+        if len(doc) == 1 and doc[0].lemma_ and doc[0].lemma_ != word:
+            lemmas[word] = doc[0].lemma_
+    return lemmas
+
 
 class Analyst:
     """
     A class for analyzing job description data.
     Args:
         data (List[Dict]): List of job description data dicts.
+        batch_size (int): Number of texts buffered per spaCy `nlp.pipe` batch.
+        n_process (int): Number of processes used by `nlp.pipe` (-1 for all cores).
+        token_cache (TokenCache, optional): Persistent token store consulted before spaCy.
+        skill_tokenizer (str): "spacy" to lemmatize skill fields with spaCy, or
+            "structured" to use the spaCy-free `structured_skill_tokens`.
+        vocabulary (SkillVocabulary, optional): Vocabulary the skill ids are interned in;
+            defaults to a new one owned by this Analyst.
     Attributes:
         df (pd.DataFrame): DataFrame containing the job description data.
         nlp: spaCy NLP model for text processing.
         stopwords (set): Set of stopwords for text cleaning.
+        cache_stats (dict): Hit/miss counters of the tokenization cache.
+        components (dict): spaCy components each method runs, see `COMPONENTS`;
+            None runs the whole loaded pipeline.
     Methods:
         get_pos_tags_tokens(column): Returns POS-tagged tokens from a text column.
         get_frequencies(column, text_mode): Returns frequency counts for a column.
         get_number_frequencies(columns): Returns value counts for numeric columns.
-        get_tfidf_skills(top_k): Returns top-k TF-IDF skills per role.
-        get_PMI_networks(min_cofreq): Returns PMI-based skill co-occurrence networks.
+        get_tfidf_skills(top_k, ngram_range, vectorizer): Returns top-k TF-IDF skills per role.
+        get_PMI_networks(min_cofreq, measure): Returns PMI-based skill co-occurrence networks.
         assess_swiss_knife_job(): Assesses Swiss-Knife job descriptions.
     """
-    def __init__(self, data):
+    # spaCy components needed per method
+    COMPONENTS = {
+        "get_pos_tags_tokens": LEMMA_COMPONENTS,
+        "get_frequencies": LEMMA_COMPONENTS,
+        "get_tfidf_skills": LEMMA_COMPONENTS,
+        "get_PMI_networks": LEMMA_COMPONENTS,
+        "assess_swiss_knife_job": POS_COMPONENTS,
+    }
+
+    def __init__(self, data, batch_size: int = 256, n_process: int = 1, token_cache=None,
+                 skill_tokenizer: str = "spacy", vocabulary: SkillVocabulary = None):
+        if skill_tokenizer not in ("spacy", "structured"):
+            raise ValueError(f"Unsupported skill tokenizer: {skill_tokenizer}")
         self.df = pd.DataFrame(data)
+        self.skill_tokenizer = skill_tokenizer
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.token_cache = token_cache
 
-        # spaCy NLP model
-        self.nlp = spacy.load("en_core_web_sm", disable=["ner"]) 
+        # spaCy NLP model, shared by every Analyst in the process
+        self.nlp = get_nlp()
 
         # Stopwords
-        self.punct_set = set(string.punctuation) | {"’", "”", "“", "‘", "–", "—", "…"}
-        extra_stopwords = {
-            "or", "in", "a", "with", "from", "an", "other", "such", "as", "to", "for", "on", "of", "and", "and/or",
-            "s", "/", "-",
-            "recent", "recently", "currently", "first", "high", "preferred", "similar", "relevant",
-            "equivalent", "related",
-            "degree", "field", "fields", "discipline", "subjects", "courses", "majors", "work", "experience"
+        self.punct_set = set(PUNCT_SET)
+        self.stopwords = self.nlp.Defaults.stop_words | EXTRA_STOPWORDS | self.punct_set
+
+        self.components = dict(self.COMPONENTS)
+
+        # Tokens per text hash, shared by every analysis on this Analyst,
+        # with the set of components that produced them
+        self._token_cache: Dict[str, List[Token]] = {}
+        self._token_components: Dict[str, frozenset] = {}
+        self._token_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._store_hits = 0
+        self._model_key = (f"{self.nlp.meta['lang']}_{self.nlp.meta['name']}", self.nlp.meta["version"])
+
+        # Columnar skill representations, built on first use
+        self._skills = None
+        self._skill_tokens = None
+        self._skill_vocab: List[str] = []
+        self._skill_sets = None
+        self.vocabulary = vocabulary if vocabulary is not None else SkillVocabulary()
+
+    def _pipeline(self, method: str) -> frozenset:
+        """Returns the loaded components `method` runs."""
+        needed = self.components.get(method)
+        loaded = frozenset(self.nlp.pipe_names)
+        return loaded if needed is None else loaded & needed
+
+    def _parse(self, texts: Iterable[str], components: frozenset = None) -> list:
+        """
+        Parses texts in batches with spaCy `nlp.pipe`.
+        Args:
+            texts (Iterable[str]): Texts to parse.
+            components (frozenset, optional): Components to run; the others are
+                disabled for this call only. Defaults to the whole pipeline.
+        Returns:
+            list of spaCy Doc objects, in input order.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        disable = [] if components is None else [p for p in self.nlp.pipe_names if p not in components]
+        # Forking workers only pays off when there is enough work to split
+        n_process = self.n_process if len(texts) > self.batch_size else 1
+        return list(self.nlp.pipe(texts, batch_size=self.batch_size, n_process=n_process, disable=disable))
+
+    def _tokenize(self, texts: Iterable[str], method: str) -> List[List[Token]]:
+        """
+        Returns the tokens of each text, parsing only texts not seen before.
+        Texts are parsed with the components `method` declares in `components`;
+        tokens cached from a superset of those components are reused. Texts
+        missing from the in-memory cache are looked up in the persistent token
+        cache first; only the remainder goes through spaCy.
+        Args:
+            texts (Iterable[str]): Texts to tokenize.
+            method (str): Analyst method the tokens are for.
+        Returns:
+            list of token lists, in input order.
+        """
+        components = self._pipeline(method)
+        keys = []
+        missing = {}
+        for text in texts:
+            key = text_key(text)
+            keys.append(key)
+            if key in missing or (key in self._token_components and self._token_components[key] >= components):
+                self._cache_hits += 1
+            else:
+                self._cache_misses += 1
+                missing[key] = text
+
+        model_key = (f"{self._model_key[0]}+{','.join(sorted(components))}", self._model_key[1])
+        resolved = {}
+        if missing and self.token_cache is not None:
+            stored = self.token_cache.get_many(missing.keys(), *model_key)
+            for key, rows in stored.items():
+                resolved[key] = [Token(*row) for row in rows]
+                del missing[key]
+            self._store_hits += len(stored)
+
+        parsed = {}
+        for key, doc in zip(missing.keys(), self._parse(missing.values(), components)):
+            parsed[key] = [
+                Token(t.text, t.lemma_, t.pos_, t.is_stop, t.is_punct) for t in doc
+            ]
+        resolved.update(parsed)
+        with self._token_lock:
+            # Analyses may run concurrently; never replace tokens from a superset of components
+            for key, tokens in resolved.items():
+                current = self._token_components.get(key)
+                if current is None or not current >= components:
+                    self._token_cache[key] = tokens
+                    self._token_components[key] = components
+        if parsed and self.token_cache is not None:
+            self.token_cache.put_many(parsed, *model_key)
+        return [resolved[key] if key in resolved else self._token_cache[key] for key in keys]
+
+    def _clean_lemmas(self, tokens: List[Token]) -> List[str]:
+        """Drops stopwords and punctuation and returns the lemmas of the remaining tokens."""
+        return [
+            t.lemma for t in tokens
+            if not t.is_stop and not t.is_punct and t.text not in self.stopwords
+        ]
+
+    def _list_column(self, column: str) -> pd.Series:
+        """Returns a JSON list column with missing values (None, NaN, absent column) as empty lists."""
+        if column not in self.df.columns:
+            return pd.Series([[] for _ in range(len(self.df))], dtype=object)
+        return self.df[column].reset_index(drop=True).map(lambda v: v if isinstance(v, list) else [])
+
+    def _column_values(self, column: str) -> list:
+        """Returns the raw values of a column, or None for every row if it is absent."""
+        if column not in self.df.columns:
+            return [None] * len(self.df)
+        return self.df[column].tolist()
+
+    def _skill_frame(self) -> pd.DataFrame:
+        """
+        Returns the exploded skill columns as one (row, skill) line per skill.
+        `row` is the position of the JD in `df`; within a row, skills keep the
+        SKILL_FIELDS order.
+        """
+        if self._skills is None:
+            parts = []
+            for field in SKILL_FIELDS:
+                col = self._list_column(field).explode().dropna()
+                parts.append(pd.DataFrame({
+                    "row": col.index.to_numpy(dtype=np.int64),
+                    "skill": col.astype(str).to_numpy(dtype=object),
+                }))
+            frame = pd.concat(parts, ignore_index=True)
+            self._skills = frame.sort_values("row", kind="stable", ignore_index=True)
+        return self._skills
+
+    def _skill_texts(self) -> List[str]:
+        """Returns the concatenated, lowercased skill list of every row."""
+        skills = self._skill_frame()
+        texts = skills.groupby("row")["skill"].agg(" ".join).str.lower()
+        return texts.reindex(range(len(self.df)), fill_value="").tolist()
+
+    def _skill_token_frame(self) -> pd.DataFrame:
+        """
+        Returns the cleaned skill tokens as (row, code) lines, where `code`
+        indexes the sorted vocabulary in `self._skill_vocab`.
+        """
+        if self._skill_tokens is None:
+            if self.skill_tokenizer == "structured":
+                # Tokenize each distinct skill once and broadcast to the rows
+                skills = self._skill_frame()
+                table = {skill: list(structured_skill_tokens(skill)) for skill in skills["skill"].unique()}
+                tokens = pd.Series(skills["skill"].map(table).to_numpy(), index=skills["row"].to_numpy())
+            else:
+                tokens = pd.Series(self._skill_lemmas())
+            tokens = tokens.explode().dropna()
+            codes, vocab = pd.factorize(tokens.to_numpy(dtype=object), sort=True)
+            # Publish the vocabulary first so concurrent readers never see a stale one
+            self._skill_vocab = [str(v) for v in vocab]
+            self._skill_tokens = pd.DataFrame({
+                "row": tokens.index.to_numpy(dtype=np.int64),
+                "code": codes.astype(np.int32),
+            })
+        return self._skill_tokens
+
+    def _token_strings(self, frame: pd.DataFrame) -> np.ndarray:
+        """Returns the token of every line of the skill token frame."""
+        return np.asarray(self._skill_vocab, dtype=object)[frame["code"].to_numpy()]
+
+    def skill_sets(self) -> SkillSets:
+        """Returns the cleaned skill tokens of every row as interned skill id sets."""
+        if self._skill_sets is None:
+            frame = self._skill_token_frame()
+            vocab_ids = self.vocabulary.intern_many(self._skill_vocab)
+            self._skill_sets = SkillSets.from_pairs(
+                frame["row"].to_numpy(), vocab_ids[frame["code"].to_numpy()], len(self.df), self.vocabulary
+            )
+        return self._skill_sets
+
+    def _skill_lemmas(self) -> List[List[str]]:
+        """Returns the cleaned skill lemmas of every row."""
+        if self.skill_tokenizer == "structured":
+            frame = self._skill_token_frame()
+            lemmas = pd.Series(self._token_strings(frame), index=frame["row"].to_numpy()).groupby(level=0).agg(list)
+            return [lemmas.get(i, []) for i in range(len(self.df))]
+        # Shared by get_tfidf_skills and get_PMI_networks
+        return [self._clean_lemmas(tokens) for tokens in self._tokenize(self._skill_texts(), "get_tfidf_skills")]
+
+    def prepare_skills(self) -> None:
+        """
+        Builds the skill frames shared by get_tfidf_skills, get_PMI_networks and
+        assess_swiss_knife_job, so analyses run concurrently reuse them instead of
+        each building its own.
+        """
+        self._skill_frame()
+        self._skill_token_frame()
+        self.skill_sets()
+
+    @property
+    def n_rows(self) -> int:
+        """Number of analyzed rows, like `StreamingAnalyst.n_rows`."""
+        return len(self.df)
+
+    @property
+    def cache_stats(self) -> dict:
+        """
+        Returns hit/miss counters of the tokenization cache.
+        `misses` counts texts not in memory; `store_hits` counts how many of
+        those were served by the persistent token cache instead of spaCy.
+        """
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "store_hits": self._store_hits,
+            "entries": len(self._token_cache),
         }
-        self.stopwords = self.nlp.Defaults.stop_words | extra_stopwords | self.punct_set
 
-   
     def get_pos_tags_tokens(self, column: str) -> dict:
         """
         Extracts and counts tokens by POS tags from a text column.
@@ -59,19 +384,18 @@ class Analyst:
             return {"all": [], "verbs": [], "nouns": [], "adjectives": []}
 
         all_tokens, verbs, nouns, adjectives = [], [], [], []
-        for item in texts:
-            text = " ".join(item) if isinstance(item, list) else str(item)
-            doc = self.nlp(text.replace("_", " "))
-            for token in doc:
+        joined = (" ".join(item) if isinstance(item, list) else str(item) for item in texts)
+        for tokens in self._tokenize((text.replace("_", " ") for text in joined), "get_pos_tags_tokens"):
+            for token in tokens:
                 if token.is_stop or token.is_punct or token.text.lower() in self.stopwords:
                     continue
-                lemma = token.lemma_.lower()
+                lemma = token.lemma.lower()
                 all_tokens.append(lemma)
-                if token.pos_ == "VERB":
+                if token.pos == "VERB":
                     verbs.append(lemma)
-                elif token.pos_ == "NOUN":
+                elif token.pos == "NOUN":
                     nouns.append(lemma)
-                elif token.pos_ == "ADJ":
+                elif token.pos == "ADJ":
                     adjectives.append(lemma)
 
         return {"all": dict(Counter(all_tokens)), 
@@ -92,19 +416,15 @@ class Analyst:
         if not items:
             return Counter()
         
-        # If items are lists of lists, flatten them
+        # If items are lists of lists, count the interned values
         if isinstance(items[0], list):
-            return Counter([str(x).lower() for sublist in items for x in sublist])
+            return SkillSets.from_lists(items, unique=False, normalize=lambda x: str(x).lower()).frequencies()
         
         # Using spaCy for text tokenization
         if text_mode:  
             tokens = []
-            for text in items:
-                doc = self.nlp(str(text).lower())
-                tokens.extend([
-                    t.lemma_ for t in doc
-                    if not t.is_stop and not t.is_punct and t.text not in self.stopwords
-                ])
+            for text_tokens in self._tokenize((str(text).lower() for text in items), "get_frequencies"):
+                tokens.extend(self._clean_lemmas(text_tokens))
             return Counter(tokens)
 
         return Counter([str(x).lower() for x in items if isinstance(x, str)])
@@ -123,13 +443,15 @@ class Analyst:
         else:
             return {col: self.df[col].value_counts().to_dict() for col in columns if col in self.df.columns}
 
-    def get_tfidf_skills(self, top_k: int = 10) -> Dict[str, List[Dict[str, float]]]:
+    def get_tfidf_skills(self, top_k: int = 10, ngram_range=(1, 1),
+                         vectorizer: str = "tfidf") -> Dict[str, List[Dict[str, float]]]:
         """
         Returns top-k TF-IDF skills per role.
         Explanation:
-        - Groups skills by role.
-        - Cleans and tokenizes skills using spaCy.
-        - Computes TF-IDF scores and extracts top-k skills for each role.
+        - Cleans and tokenizes each JD's skills (spaCy or structured tokenizer).
+        - Counts terms per role with a groupby over the exploded skill codes
+          (unigram TfidfVectorizer mode), or fits the vectorizer on role documents.
+        - Computes TF-IDF scores and extracts top-k skills for each role from the sparse rows.
         Representation:
         {
             "role1": [{"skill": "skillA", "score": 0.75}, ...],
@@ -142,76 +464,102 @@ class Analyst:
         
         Args:
             top_k (int): Number of top skills to return per role.
+            ngram_range (tuple): (min_n, max_n) n-gram range over the cleaned skill tokens.
+            vectorizer (str): "tfidf" or "hashing" (HashingVectorizer + TfidfTransformer,
+                for very large vocabularies).
         Returns:
             Dict[str, List[Dict[str, float]]]: A dictionary with roles as keys and a list of top skills with their TF-IDF scores as values.
         """
+        if vectorizer not in VECTORIZERS:
+            raise ValueError(f"Unsupported TF-IDF vectorizer: {vectorizer}")
+        ngram_range = tuple(ngram_range)
 
-        match_data = defaultdict(lambda: {
-            "programming_languages": [],
-            "frameworks_tools": [],
-            "cloud_platforms": [],
-            "databases": [],
-            "api_protocols": [],
-            "methodologies": []
-        })
-
-        # Collect skills by role
-        for _, row in self.df.iterrows():
-            r = row["role"]
-            if pd.isna(r):
-                continue
-            match_data[r]["programming_languages"].extend(row["programming_languages"])
-            match_data[r]["frameworks_tools"].extend(row["frameworks_tools"])
-            match_data[r]["cloud_platforms"].extend(row["cloud_platforms"])
-            match_data[r]["databases"].extend(row["databases"])
-            match_data[r]["api_protocols"].extend(row["api_protocols"])
-            match_data[r]["methodologies"].extend(row["methodologies"])
-
-        role_docs = {}
-        for role, fields in match_data.items():
-            all_skills = []
-            for skill_list in fields.values():
-                all_skills.extend(skill_list)
-
-            # Clean and tokenize skills using spaCy
-            doc = self.nlp(" ".join(all_skills).lower())
-            clean_tokens = [
-                t.lemma_ for t in doc
-                if not t.is_stop and not t.is_punct and t.text not in self.stopwords
-            ]
-            role_docs[role] = " ".join(clean_tokens)
-
-        roles = list(role_docs.keys())
-        docs = list(role_docs.values())
-        
-        # Handle empty docs
-        if not any(d.strip() for d in docs):
+        frame = self._skill_token_frame()
+        roles = pd.Series(self._column_values("role"), dtype=object)
+        role_order = roles.dropna().unique()
+        if frame.empty or len(role_order) == 0:
             return {}
+        role_codes = pd.Categorical(roles.to_numpy()[frame["row"].to_numpy()], categories=role_order).codes
 
-        # Compute TF-IDF using sklearn
-        vectorizer = TfidfVectorizer()
-        X = vectorizer.fit_transform(docs)
-        feature_names = vectorizer.get_feature_names_out()
+        if vectorizer == "tfidf" and ngram_range == (1, 1):
+            C, feature_names = self._role_term_counts(frame, role_codes, len(role_order))
+            if C is None:
+                return {}
+            # Compute TF-IDF using sklearn (same weighting as TfidfVectorizer)
+            X = TfidfTransformer().fit_transform(C)
+        else:
+            docs = (
+                pd.DataFrame({"role": role_codes, "token": self._token_strings(frame)})
+                .query("role >= 0")
+                .groupby("role")["token"].agg(" ".join)
+                .reindex(range(len(role_order)), fill_value="")
+                .tolist()
+            )
+            if not any(d.strip() for d in docs):
+                return {}
+            X, feature_names = tfidf_from_documents(docs, ngram_range=ngram_range, vectorizer=vectorizer)
 
         # Extract top-k skills per role
-        role_top_skills = {}
-        for i, role in enumerate(roles):
-            row = X[i].toarray()[0]
-            top_indices = np.argsort(row)[::-1][:top_k]
-            role_top_skills[role] = [
-                {"skill": feature_names[j], "score": float(row[j])}
-                for j in top_indices if row[j] > 0
-            ]
-        return role_top_skills
+        return {
+            role: [{"skill": name, "score": float(score)} for name, score in top]
+            for role, top in zip(role_order, named_top_k(X, feature_names, top_k))
+        }
+
+    def _role_term_counts(self, frame: pd.DataFrame, role_codes, n_roles: int):
+        """
+        Returns the sparse role x term count matrix and its sorted feature names.
+        Every vocabulary token is mapped to the terms TfidfVectorizer would extract
+        from it, so counts come from one groupby instead of re-tokenizing joined docs.
+        """
+        vocab_terms = [token_terms(token) for token in self._skill_vocab]
+        feature_names = np.array(sorted({term for terms in vocab_terms for term in terms}), dtype=object)
+        if len(feature_names) == 0:
+            return None, feature_names
+        term_index = {term: i for i, term in enumerate(feature_names)}
+        code_terms = pd.DataFrame(
+            [(code, term_index[term]) for code, terms in enumerate(vocab_terms) for term in terms],
+            columns=["code", "term"],
+        )
+
+        counts = (
+            pd.DataFrame({"role": role_codes, "code": frame["code"].to_numpy()})
+            .query("role >= 0")
+            .merge(code_terms, on="code")
+            .groupby(["role", "term"]).size()
+        )
+        role_idx = counts.index.get_level_values("role").to_numpy()
+        term_idx = counts.index.get_level_values("term").to_numpy()
+        C = sp.csr_matrix((counts.to_numpy(), (role_idx, term_idx)), shape=(n_roles, len(feature_names)))
+        return C, feature_names
+
+    def role_skill_tokens(self) -> Dict[str, List[str]]:
+        """
+        Returns the cleaned skill tokens of every role, in row order.
+        Roles are listed in order of first appearance, including roles without skills.
+        """
+        frame = self._skill_token_frame()
+        roles = pd.Series(self._column_values("role"), dtype=object)
+        grouped = (
+            pd.DataFrame({"role": roles.to_numpy()[frame["row"].to_numpy()], "token": self._token_strings(frame)})
+            .dropna(subset=["role"])
+            .groupby("role", sort=False)["token"].agg(list)
+        )
+        return {role: grouped.get(role, []) for role in roles.dropna().unique()}
 
+    def skill_cooccurrence(self):
+        """
+        Returns the counts behind get_PMI_networks on interned skill ids, so they
+        can be merged across Analysts (see `SkillSets.cooccurrence`).
+        """
+        return self.skill_sets().cooccurrence()
 
-    def get_PMI_networks(self, min_cofreq: int = 2) -> List[Dict]:
+    def get_PMI_networks(self, min_cofreq: int = 2, measure: str = "pmi") -> List[Dict]:
         """
         Returns PMI-based skill co-occurrence networks.
         Explanation:
         - Extracts and cleans skills from job descriptions.
-        - Counts individual skill frequencies and co-occurrence frequencies.
-        - Computes Pointwise Mutual Information (PMI) for skill pairs.
+        - Builds a binary JD x skill sparse matrix; co-occurrence counts come from one sparse product.
+        - Computes Pointwise Mutual Information (PMI) for skill pairs with NumPy.
         - Filters pairs by minimum co-occurrence frequency and positive PMI.
         Representation:
         [{"source": "skillA", "target": "skillB", "weight": PMI_value}, ...]
@@ -220,62 +568,13 @@ class Analyst:
         - Higher PMI weight indicates stronger association between the skills.  
         Args:
             min_cofreq (int): Minimum co-occurrence frequency to include a skill pair.
+            measure (str): Edge weight, "pmi" or "npmi" (normalized to (0, 1]).
         Returns:
             List[Dict]: A list of dictionaries representing skill pairs with their PMI weights.
         """
-        # Extract and clean skills
-        job_skills_list = []
-        for _, row in self.df.iterrows():
-            skills = (
-                row["programming_languages"]
-                + row["frameworks_tools"]
-                + row["cloud_platforms"]
-                + row["databases"]
-                + row["api_protocols"]
-                + row["methodologies"]
-            )
-            # spaCy text processing
-            doc = self.nlp(" ".join(skills).lower())
-            clean_skills = [
-                t.lemma_ for t in doc
-                if not t.is_stop and not t.is_punct and t.text not in self.stopwords
-            ]
-            job_skills_list.append(clean_skills)
-        
-        # Count frequencies
-        skill_freq = Counter()
-        pair_freq = Counter()
-        total_docs = len(job_skills_list)
-
-        # Compute co-occurrence and individual frequencies
-        pmi_scores = {}
-        for skill_list in job_skills_list:
-            skills = set(skill_list)  # Unique skills in the job description
-            for s in skills:
-                skill_freq[s] += 1
-            for s1, s2 in combinations(sorted(skills), 2):
-                pair_freq[(s1, s2)] += 1
-
-        # Calculate PMI for skill pairs
-        for (s1, s2), co_freq in pair_freq.items():
-            p_x = skill_freq[s1] / total_docs
-            p_y = skill_freq[s2] / total_docs
-            p_xy = co_freq / total_docs
-            if p_xy > 0 and p_x > 0 and p_y > 0:
-                pmi = math.log2(p_xy / (p_x * p_y))
-                pmi_scores[(s1, s2)] = pmi
-                
-        # Filter pairs by min_cofreq and positive PMI
-        pmi_filtered = {
-            (s1, s2): pmi
-            for (s1, s2), pmi in pmi_scores.items()
-            if pair_freq[(s1, s2)] >= min_cofreq and pmi > 0
-        }
-
-        return [
-            {"source": s1, "target": s2, "weight": pmi}
-            for (s1, s2), pmi in pmi_filtered.items()
-        ]
+        frame = self._skill_token_frame()
+        X = codes_matrix(frame["row"], frame["code"], len(self.df), len(self._skill_vocab))
+        return pmi_edges(X, self._skill_vocab, min_cofreq=min_cofreq, measure=measure)
 
     def assess_swiss_knife_job(self):
         """
@@ -293,29 +592,30 @@ class Analyst:
         Returns:
             List[Dict]: A list of dictionaries with job description indices, roles, companies, ODI values, and Swiss-Knife status.
         """
-        def count_action_verbs(responsibilities: List[str]) -> int:
-            text = " ".join(r.replace("_", " ") for r in responsibilities)
-            doc = self.nlp(text)
-            return sum(1 for token in doc if token.pos_ == "VERB")
+        def count_action_verbs(tokens: List[Token]) -> int:
+            return sum(1 for token in tokens if token.pos == "VERB")
+
+        responsibility_tokens = self._tokenize(
+            (" ".join(str(r).replace("_", " ") for r in responsibilities)
+             for responsibilities in self._list_column("responsibilities")),
+            "assess_swiss_knife_job",
+        )
+        # Distinct raw skills per row; counted directly, they are not interned
+        skills = self._skill_frame().drop_duplicates()
+        num_skills = np.bincount(skills["row"].to_numpy(), minlength=len(self.df)).tolist()
 
         results = []
-        for idx, row in self.df.iterrows():
-            skills = (
-                row["programming_languages"]
-                + row["frameworks_tools"]
-                + row["cloud_platforms"]
-                + row["databases"]
-                + row["api_protocols"]
-                + row["methodologies"]
-            )
-            num_skills = len(set(skills))
-            num_verbs = count_action_verbs(row["responsibilities"])
-            odi = round(num_skills / num_verbs, 2) if num_verbs > 0 else None
+        for idx, role, company, n_skills, tokens in zip(
+            self.df.index, self._column_values("role"), self._column_values("company"),
+            num_skills, responsibility_tokens,
+        ):
+            num_verbs = count_action_verbs(tokens)
+            odi = round(n_skills / num_verbs, 2) if num_verbs > 0 else None
 
             results.append({
                 "index": int(idx),
-                "role": row.get("role"),
-                "company": row.get("company"),
+                "role": role,
+                "company": company,
                 "odi_tools": odi,
                 "is_swiss_jd": bool(odi and odi > 1.0)
             })
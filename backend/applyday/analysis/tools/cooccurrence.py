@@ -0,0 +1,134 @@
+# backend/applyday/analysis/tools/cooccurrence.py
+# Vectorized skill co-occurrence and PMI on a sparse doc x skill matrix.
+import numpy as np
+import scipy.sparse as sp
+from typing import List, Dict, Iterable
+
+# Edges always have PMI > 0, so a separate positive PMI ("ppmi") measure would equal "pmi"
+MEASURES = ("pmi", "npmi")
+
+
+def doc_skill_matrix(doc_skills: Iterable[Iterable[str]]):
+    """
+    Builds a binary CSR matrix with one row per document and one column per skill.
+    Args:
+        doc_skills (Iterable[Iterable[str]]): Skills of each document; duplicates are ignored.
+    Returns:
+        tuple (X, vocab) where `vocab` is the sorted list of skills indexing the columns.
+    """
+    doc_sets = [set(skills) for skills in doc_skills]
+    vocab = sorted(set().union(*doc_sets))
+    index = {skill: i for i, skill in enumerate(vocab)}
+
+    indptr = np.zeros(len(doc_sets) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(skills) for skills in doc_sets])
+    indices = np.fromiter(
+        (index[skill] for skills in doc_sets for skill in sorted(skills)),
+        dtype=np.int32, count=int(indptr[-1]),
+    )
+    data = np.ones(len(indices), dtype=np.int32)
+    X = sp.csr_matrix((data, indices, indptr), shape=(len(doc_sets), len(vocab)))
+    return X, vocab
+
+
+def codes_matrix(rows, codes, n_docs: int, n_skills: int):
+    """
+    Builds a binary CSR matrix from (document, skill code) pairs.
+    Args:
+        rows (array-like): Document index of each pair.
+        codes (array-like): Skill code of each pair; repeated pairs count once.
+        n_docs (int): Number of documents (matrix rows).
+        n_skills (int): Vocabulary size (matrix columns).
+    Returns:
+        Binary CSR matrix of shape (n_docs, n_skills).
+    """
+    X = sp.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (np.asarray(rows), np.asarray(codes))),
+        shape=(n_docs, n_skills),
+    )
+    X.sum_duplicates()
+    X.data[:] = 1
+    return X
+
+
+def pmi_edges(X, vocab: List[str], min_cofreq: int = 2, measure: str = "pmi") -> List[Dict]:
+    """
+    Computes positive-PMI skill pairs from a binary doc x skill matrix.
+    Explanation:
+    - Co-occurrence counts come from one sparse product X.T @ X (upper triangle only).
+    - Pairs below `min_cofreq` are dropped before any per-pair object is built.
+    - PMI = log2(p(x, y) / (p(x) * p(y))); only pairs with PMI > 0 are kept.
+    - `measure` selects the reported weight: PMI or NPMI (PMI / -log2 p(x, y)).
+    Args:
+        X: Binary CSR matrix, one row per document.
+        vocab (List[str]): Skill of each column, sorted so that source < target.
+        min_cofreq (int): Minimum co-occurrence frequency to include a skill pair.
+        measure (str): One of "pmi", "npmi".
+    Returns:
+        List[Dict]: [{"source": skillA, "target": skillB, "weight": value}, ...]
+    """
+    if measure not in MEASURES:
+        raise ValueError(f"Unsupported PMI measure: {measure}")
+    total_docs = X.shape[0]
+    if total_docs == 0 or X.nnz == 0:
+        return []
+
+    doc_freq, rows, cols, co_freq = cooccurrence_counts(X)
+    keep = co_freq >= min_cofreq
+    return pmi_from_counts(
+        total_docs, doc_freq, rows[keep], cols[keep], co_freq[keep], vocab, measure=measure
+    )
+
+
+def cooccurrence_counts(X):
+    """
+    Returns the document and pair frequencies of a binary doc x skill matrix.
+    Counts of disjoint document sets add up, so they can be merged chunk by chunk.
+    Args:
+        X: Binary CSR matrix, one row per document.
+    Returns:
+        tuple (doc_freq, rows, cols, co_freq) with rows < cols.
+    """
+    doc_freq = np.asarray(X.sum(axis=0)).ravel()
+    cooc = sp.triu(X.T @ X, k=1).tocoo()
+    return doc_freq, cooc.row, cooc.col, cooc.data
+
+
+def pmi_from_counts(total_docs: int, doc_freq, rows, cols, co_freq, vocab: List[str],
+                    measure: str = "pmi") -> List[Dict]:
+    """
+    Computes positive-PMI edges from precomputed counts.
+    Args:
+        total_docs (int): Number of documents.
+        doc_freq (array-like): Document frequency of every skill in `vocab`.
+        rows, cols (array-like): Skill indices of each pair, with rows < cols.
+        co_freq (array-like): Co-occurrence frequency of each pair.
+        vocab (List[str]): Skill names indexed by position.
+        measure (str): One of "pmi", "npmi".
+    Returns:
+        List[Dict]: [{"source": skillA, "target": skillB, "weight": value}, ...]
+    """
+    if measure not in MEASURES:
+        raise ValueError(f"Unsupported PMI measure: {measure}")
+    doc_freq = np.asarray(doc_freq, dtype=np.float64)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    co_freq = np.asarray(co_freq, dtype=np.float64)
+    if total_docs == 0 or len(co_freq) == 0:
+        return []
+
+    pmi = np.log2(co_freq * total_docs / (doc_freq[rows] * doc_freq[cols]))
+    positive = pmi > 0
+    rows, cols, co_freq, pmi = rows[positive], cols[positive], co_freq[positive], pmi[positive]
+
+    if measure == "npmi":
+        neg_log_pxy = -np.log2(co_freq / total_docs)
+        weight = np.divide(pmi, neg_log_pxy, out=np.ones_like(pmi), where=neg_log_pxy > 0)
+    else:
+        weight = pmi
+
+    order = np.lexsort((cols, rows))
+    return [
+        {"source": vocab[i], "target": vocab[j], "weight": float(w)}
+        for i, j, w in zip(rows[order].tolist(), cols[order].tolist(), weight[order].tolist())
+    ]
@@ -0,0 +1,72 @@
+# backend/applyday/analysis/tools/minhash.py
+# MinHash signatures and LSH banding for near-duplicate texts.
+# The Jaccard similarity of two texts' word shingle sets is estimated by the share
+# of equal signature values; texts whose signatures agree on a whole band land in
+# the same bucket, so candidates are found without comparing against every text.
+import hashlib
+import re
+from typing import List, Optional, Set
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Returns the lowercased word `size`-grams of a text (the whole text if it is shorter)."""
+    words = _WORD.findall((text or "").lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _stable_hash(value: bytes) -> int:
+    """64-bit hash that, unlike hash(), is the same in every process."""
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "little")
+
+
+class MinHasher:
+    """
+    MinHash over word shingles with `num_perm` multiply-shift hash functions.
+    Args:
+        num_perm (int): Signature length; the estimate's standard error is about 1 / sqrt(num_perm).
+        shingle_size (int): Words per shingle.
+        seed (int): Seed of the hash functions; signatures are only comparable for equal seeds.
+    Methods:
+        signature(text): Returns the uint32 MinHash signature of a text (None without words).
+        band_keys(signature, bands): Returns one 64-bit key per LSH band.
+    """
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        if num_perm <= 0:
+            raise ValueError("num_perm must be positive")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Returns the signature of a text, or None for a text without words, which resembles nothing."""
+        grams = shingles(text, self.shingle_size)
+        if not grams:
+            return None
+        x = np.fromiter((_stable_hash(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        # Top 32 bits of (a * x + b) mod 2^64, one row per shingle
+        hashed = (x[:, None] * self._a[None, :] + self._b[None, :]) >> np.uint64(32)
+        return (hashed & _MASK32).min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def band_keys(signature: np.ndarray, bands: int) -> List[int]:
+        """Returns a signed 64-bit key for each of `bands` equal slices of a signature."""
+        if len(signature) % bands:
+            raise ValueError("The signature length must be a multiple of bands")
+        return [
+            int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little", signed=True)
+            for band in np.split(np.ascontiguousarray(signature, dtype=np.uint32), bands)
+        ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return float(np.mean(a == b))
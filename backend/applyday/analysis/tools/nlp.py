@@ -0,0 +1,56 @@
+# backend/applyday/analysis/tools/nlp.py
+# Process-wide registry of loaded spaCy pipelines.
+# Loading en_core_web_sm takes seconds and hundreds of MB, so every Analyst in a
+# process shares one instance. Under gunicorn (preload_app = True) the master
+# preloads the pipelines before forking so workers share the pages copy-on-write.
+import logging
+import threading
+from typing import Dict, Iterable, Tuple
+
+import spacy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "en_core_web_sm"
+DEFAULT_DISABLE = ("ner",)
+WARMUP_TEXT = "Design and build scalable backend services with Python, Django and AWS."
+
+_pipelines: Dict[Tuple[str, Tuple[str, ...]], "spacy.language.Language"] = {}
+_lock = threading.Lock()
+
+
+def get_nlp(name: str = DEFAULT_MODEL, disable: Iterable[str] = DEFAULT_DISABLE):
+    """
+    Returns the shared spaCy pipeline for `name`, loading it on first use.
+    Args:
+        name (str): spaCy package name or path.
+        disable (Iterable[str]): Pipeline components to disable.
+    Returns:
+        spacy.language.Language
+    """
+    key = (name, tuple(sorted(disable)))
+    nlp = _pipelines.get(key)
+    if nlp is None:
+        with _lock:
+            nlp = _pipelines.get(key)
+            if nlp is None:
+                logger.info("Loading spaCy pipeline %s (disable=%s)", name, list(key[1]))
+                nlp = spacy.load(name, disable=list(key[1]))
+                _pipelines[key] = nlp
+    return nlp
+
+
+def preload(name: str = DEFAULT_MODEL, disable: Iterable[str] = DEFAULT_DISABLE):
+    """Loads a pipeline into the registry ahead of the first request."""
+    return get_nlp(name, disable)
+
+
+def warmup() -> None:
+    """Runs one parse through every loaded pipeline to initialize lazily built state."""
+    for nlp in list(_pipelines.values()):
+        nlp(WARMUP_TEXT)
+
+
+def loaded() -> list:
+    """Returns the (name, disabled components) keys of the loaded pipelines."""
+    return list(_pipelines.keys())
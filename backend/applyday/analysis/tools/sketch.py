@@ -0,0 +1,158 @@
+# backend/applyday/analysis/tools/sketch.py
+# Bounded-memory approximate counting of skill pairs.
+# A count-min sketch estimates every pair count and a Space-Saving summary keeps the
+# candidate heavy pairs, so memory depends on the error bounds, not on the corpus.
+import math
+from typing import Dict, Tuple
+
+import numpy as np
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _mix64(keys: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: spreads int64 keys over 64 bits before bucketing."""
+    x = keys.astype(np.uint64)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class CountMinSketch:
+    """
+    Count-min sketch over int64 keys.
+    With probability at least 1 - delta, every estimate exceeds the true count by
+    at most epsilon * total, where total is the sum of all added counts; estimates
+    never undercount.
+    Args:
+        epsilon (float): Relative overcount bound; the width is ceil(e / epsilon)
+            rounded up to a power of two.
+        delta (float): Failure probability; the depth is ceil(ln(1 / delta)).
+        seed (int): Seed of the per-row hash functions.
+    """
+    def __init__(self, epsilon: float = 1e-4, delta: float = 0.01, seed: int = 0):
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        self.epsilon = epsilon
+        self.delta = delta
+        self.bits = max(1, math.ceil(math.log2(math.e / epsilon)))
+        self.width = 1 << self.bits
+        self.depth = max(1, math.ceil(math.log(1 / delta)))
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: odd 64-bit multipliers, top `bits` bits of the product
+        self._multipliers = rng.integers(0, 2 ** 63, self.depth, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    def _buckets(self, keys) -> np.ndarray:
+        mixed = _mix64(np.asarray(keys, dtype=np.int64))
+        shift = np.uint64(64 - self.bits)
+        return np.stack([(mixed * a) >> shift for a in self._multipliers]).astype(np.int64)
+
+    def add(self, keys, counts) -> None:
+        """Adds `counts` to `keys`."""
+        counts = np.asarray(counts, dtype=np.int64)
+        for row, buckets in enumerate(self._buckets(keys)):
+            np.add.at(self.table[row], buckets, counts)
+        self.total += int(counts.sum())
+
+    def estimate(self, keys) -> np.ndarray:
+        """Returns the estimated count of each key."""
+        if not len(keys):
+            return np.zeros(0, dtype=np.int64)
+        buckets = self._buckets(keys)
+        return np.min(self.table[np.arange(self.depth)[:, None], buckets], axis=0)
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+
+class SpaceSaving:
+    """
+    Weighted Space-Saving summary of the `capacity` heaviest int64 keys.
+    Tracked counts never undercount; any key whose true count exceeds
+    total / capacity is guaranteed to be tracked.
+    Updates are applied a batch at a time: untracked keys of a batch enter with
+    the current minimum tracked count added, then the summary is cut back to
+    `capacity` keys.
+    Args:
+        capacity (int): Maximum number of tracked keys.
+    """
+    def __init__(self, capacity: int = 10_000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def update(self, keys, counts) -> None:
+        """Adds a batch of distinct keys with their counts."""
+        keys = np.asarray(keys, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        if not len(keys):
+            return
+        floor = self.counts.min() if len(self.keys) >= self.capacity else 0
+        tracked = np.isin(keys, self.keys)
+        counts = np.where(tracked, counts, counts + floor)
+
+        all_keys = np.concatenate([self.keys, keys])
+        unique, inverse = np.unique(all_keys, return_inverse=True)
+        totals = np.zeros(len(unique), dtype=np.int64)
+        np.add.at(totals, inverse, np.concatenate([self.counts, counts]))
+        if len(unique) > self.capacity:
+            keep = np.argpartition(-totals, self.capacity - 1)[:self.capacity]
+            keep.sort()
+            unique, totals = unique[keep], totals[keep]
+        self.keys, self.counts = unique, totals
+
+    @property
+    def nbytes(self) -> int:
+        return self.keys.nbytes + self.counts.nbytes
+
+
+class ApproximatePairCounts:
+    """
+    Approximate skill pair counts: Space-Saving picks the candidate pairs and
+    their counts are the smaller of the Space-Saving and count-min estimates.
+    Memory is fixed by `epsilon`, `delta` and `heavy_hitters`.
+    Args:
+        epsilon (float): Count-min overcount bound, relative to the total pair count.
+        delta (float): Count-min failure probability.
+        heavy_hitters (int): Number of candidate pairs kept by Space-Saving.
+        seed (int): Seed of the count-min hash functions.
+    Methods:
+        update(keys, counts): Adds a batch of distinct pair keys with their counts.
+        counts(): Returns the candidate pair keys and their estimated counts.
+        params: Approximation parameters and error bounds, for the report.
+    """
+    def __init__(self, epsilon: float = 1e-4, delta: float = 0.01, heavy_hitters: int = 10_000, seed: int = 0):
+        self.sketch = CountMinSketch(epsilon, delta, seed=seed)
+        self.heavy = SpaceSaving(heavy_hitters)
+
+    def update(self, keys, counts) -> None:
+        self.sketch.add(keys, counts)
+        self.heavy.update(keys, counts)
+
+    def counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        estimates = np.minimum(self.heavy.counts, self.sketch.estimate(self.heavy.keys))
+        return self.heavy.keys, estimates
+
+    @property
+    def nbytes(self) -> int:
+        return self.sketch.nbytes + self.heavy.nbytes
+
+    @property
+    def params(self) -> Dict:
+        return {
+            "method": "count-min sketch + space-saving",
+            "epsilon": self.sketch.epsilon,
+            "delta": self.sketch.delta,
+            "width": self.sketch.width,
+            "depth": self.sketch.depth,
+            "heavy_hitters": self.heavy.capacity,
+            "total_pairs": self.sketch.total,
+            # With probability 1 - delta no reported count is higher than true + max_overcount
+            "max_overcount": self.sketch.epsilon * self.sketch.total,
+            "memory_bytes": self.nbytes,
+        }
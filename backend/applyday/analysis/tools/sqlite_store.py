@@ -0,0 +1,146 @@
+# backend/applyday/analysis/tools/sqlite_store.py
+# SQLite key-value store with LRU eviction, shared by the token and extraction caches.
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Iterable
+
+# Stay well below SQLite's bound-parameter limit
+_CHUNK = 500
+
+
+class SQLiteLRUStore:
+    """
+    SQLite-backed store of text values, shared across worker processes.
+    Entries are keyed by (namespace, key). Entries older than `max_age` seconds
+    are expired and the least recently used ones are evicted once the store
+    grows past `max_entries`. Hits and misses are counted in the store, across workers.
+    Subclasses set `table` and encode their values as text.
+    Args:
+        path (str): Path of the SQLite file, created on first use.
+        max_entries (int): Maximum number of entries.
+        max_age (float): Maximum age of an entry in seconds (None keeps entries forever).
+    Methods:
+        get_many(keys, namespace): Returns the stored values of the given keys and counts hits and misses.
+        put_many(entries, namespace): Stores values and evicts expired and old entries.
+        stats(): Returns the number of entries, hits, misses and the hit rate.
+        clear(): Removes every entry and resets the counters.
+    """
+    table = "entries"
+
+    def __init__(self, path: str, max_entries: int = 100_000, max_age: float = None):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            # WAL lets gunicorn workers read while another one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_last_used ON {self.table} (last_used)")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table}_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {self.table}_counters (name, value) VALUES (?, 0)", [("hits",), ("misses",)]
+            )
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def _oldest_allowed(self, now: float) -> float:
+        return now - self.max_age if self.max_age is not None else float("-inf")
+
+    def get_many(self, keys: Iterable[str], namespace: str = "") -> Dict[str, str]:
+        """
+        Returns the stored values of the given keys; expired entries are misses.
+        Args:
+            keys (Iterable[str]): Keys to look up.
+            namespace (str): Namespace of the keys.
+        Returns:
+            dict mapping each found key to its value.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            for i in range(0, len(keys), _CHUNK):
+                chunk = keys[i:i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, value FROM {self.table} "
+                    f"WHERE namespace = ? AND key IN ({marks}) AND created_at >= ?",
+                    [namespace, *chunk, self._oldest_allowed(now)],
+                ).fetchall()
+                found.update(rows)
+                conn.execute(
+                    f"UPDATE {self.table} SET last_used = ? WHERE namespace = ? AND key IN ({marks})",
+                    [now, namespace, *chunk],
+                )
+            conn.executemany(
+                f"UPDATE {self.table}_counters SET value = value + ? WHERE name = ?",
+                [(len(found), "hits"), (len(keys) - len(found), "misses")],
+            )
+        return found
+
+    def put_many(self, entries: Dict[str, str], namespace: str = "") -> None:
+        """
+        Stores values and evicts expired and least recently used entries.
+        Args:
+            entries (dict): Mapping of key to its value.
+            namespace (str): Namespace of the keys.
+        """
+        if not entries:
+            return
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (namespace, key, value, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(namespace, key, value, now, now) for key, value in entries.items()],
+            )
+            conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", [self._oldest_allowed(now)])
+            (count,) = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE rowid IN "
+                    f"(SELECT rowid FROM {self.table} ORDER BY last_used, rowid LIMIT ?)",
+                    [count - self.max_entries],
+                )
+
+    def stats(self) -> Dict:
+        """Returns {"entries", "hits", "misses", "hit_rate"}; hit_rate is None before any lookup."""
+        with closing(self._connect()) as conn:
+            counters = dict(conn.execute(f"SELECT name, value FROM {self.table}_counters").fetchall())
+            (entries,) = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "entries": entries,
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "hit_rate": counters["hits"] / lookups if lookups else None,
+        }
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"DELETE FROM {self.table}")
+            conn.execute(f"UPDATE {self.table}_counters SET value = 0")
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
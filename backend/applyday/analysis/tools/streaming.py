@@ -0,0 +1,272 @@
+# backend/applyday/analysis/tools/streaming.py
+# Chunked Analyst over an iterator of JobDescription rows.
+# Each chunk is analyzed by a short-lived Analyst and reduced to mergeable partial
+# aggregates (counters, role term counts, skill pair counts), so memory is bounded by
+# the chunk size and the vocabulary rather than by the number of rows. Exact pair
+# counts still grow with the distinct skill pairs; pass `pair_sketch` to bound them too.
+import threading
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from analysis.tools.analyst import Analyst, SKILL_FIELDS
+from analysis.tools.cooccurrence import pmi_from_counts
+from analysis.tools.sketch import ApproximatePairCounts
+from analysis.tools.tfidf import (
+    VECTORIZERS, document_ngrams, named_top_k, tfidf_from_term_counts, token_terms,
+)
+from analysis.tools.vocabulary import SkillVocabulary, merge_counts, split_pair_keys
+
+# Columns the report analyses read, e.g. for `queryset.values(*STREAM_COLUMNS)`
+STREAM_COLUMNS = ["role", "company", "level", "location", "employment_type", "responsibilities", *SKILL_FIELDS]
+FREQUENCY_COLUMNS = ["role", "company", "level", "location", "employment_type", *SKILL_FIELDS]
+POS_TAG_TOKENS = ("all", "verbs", "nouns", "adjectives")
+# Analyst methods whose partial aggregates can be collected
+ANALYSES = ("get_frequencies", "get_pos_tags_tokens", "get_tfidf_skills", "get_PMI_networks", "assess_swiss_knife_job")
+# Columns each method reads
+METHOD_COLUMNS = {
+    "get_frequencies": FREQUENCY_COLUMNS,
+    "get_pos_tags_tokens": ["responsibilities"],
+    "get_tfidf_skills": ["role", *SKILL_FIELDS],
+    "get_PMI_networks": SKILL_FIELDS,
+    "assess_swiss_knife_job": ["role", "company", "responsibilities", *SKILL_FIELDS],
+}
+
+
+def stream_columns(analyses: Iterable[str] = None) -> List[str]:
+    """Returns the `STREAM_COLUMNS` the given methods (see `ANALYSES`, None for all) read."""
+    if analyses is None:
+        return list(STREAM_COLUMNS)
+    needed = {col for method in analyses for col in METHOD_COLUMNS[method]}
+    return [col for col in STREAM_COLUMNS if col in needed]
+
+
+class StreamingAnalyst:
+    """
+    Computes the report analyses of `Analyst` chunk by chunk.
+    The rows are consumed once, on the first analysis call (or `prepare_skills`);
+    every method then answers from the merged partial aggregates and returns the
+    same result as `Analyst` over all rows.
+    Args:
+        rows (Iterable[Dict]): JobDescription values with the `stream_columns(analyses)`, e.g.
+            `queryset.values(*stream_columns(analyses)).iterator(chunk_size=...)`.
+        chunk_size (int): Rows analyzed at once.
+        ngram_range (tuple): N-gram range the TF-IDF term counts are collected for.
+        text_columns (Iterable[str]): Columns whose text-mode frequencies are collected.
+        pos_columns (Iterable[str]): Columns whose POS tag tokens are collected.
+        pair_sketch (ApproximatePairCounts): Counts skill pairs approximately in fixed
+            memory instead of exactly; get_PMI_networks then returns approximate edges
+            and `pmi_approximation` states the error bounds.
+        analyses (Iterable[str]): Names of the methods (see `ANALYSES`) to collect
+            aggregates for; the others are skipped per chunk and raise ValueError.
+            Defaults to all of them.
+        **analyst_options: Passed to every chunk `Analyst` (batch_size, n_process,
+            token_cache, skill_tokenizer).
+    """
+    def __init__(self, rows: Iterable[Dict], chunk_size: int = 2000, ngram_range=(1, 1),
+                 text_columns: Iterable[str] = ("role",), pos_columns: Iterable[str] = ("responsibilities",),
+                 pair_sketch: ApproximatePairCounts = None, analyses: Iterable[str] = None, **analyst_options):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.rows = iter(rows)
+        self.chunk_size = chunk_size
+        self.ngram_range = tuple(ngram_range)
+        self.text_columns = tuple(text_columns)
+        self.pos_columns = tuple(pos_columns)
+        self.pair_sketch = pair_sketch
+        self.analyses = frozenset(ANALYSES if analyses is None else analyses)
+        unknown = self.analyses - set(ANALYSES)
+        if unknown:
+            raise ValueError(f"Unsupported analyses: {sorted(unknown)}")
+        self.analyst_options = analyst_options
+        self._lock = threading.Lock()
+        self._consumed = False
+
+        self.n_rows = 0
+        self._frequencies = {col: Counter() for col in FREQUENCY_COLUMNS}
+        self._text_frequencies = {col: Counter() for col in self.text_columns}
+        self._pos_tokens = {col: {key: Counter() for key in POS_TAG_TOKENS} for col in self.pos_columns}
+        self._pos_seen = dict.fromkeys(self.pos_columns, False)
+        # Per-role TF-IDF term counts and the last words of each role document,
+        # so n-grams spanning two chunks are counted
+        self._role_terms: Dict[str, Counter] = {}
+        self._role_tails: Dict[str, List[str]] = {}
+        # Skill document frequencies by id interned in this report's vocabulary, and pair counts by pair key
+        self.vocabulary = SkillVocabulary()
+        self._skill_doc_freq = np.zeros(0, dtype=np.int64)
+        self._pair_keys = np.zeros(0, dtype=np.int64)
+        self._pair_counts = np.zeros(0, dtype=np.int64)
+        self._swiss_knife: List[Dict] = []
+        self._cache_stats = Counter()
+
+    @classmethod
+    def from_arrow(cls, table, chunk_size: int = 2000, **kwargs) -> "StreamingAnalyst":
+        """
+        Streams the rows of an Arrow table, e.g. the memory-mapped JobDescription
+        snapshot (see analysis/snapshot.py); only one record batch of `chunk_size`
+        rows is converted to Python objects at a time, with only the columns the
+        collected `analyses` read.
+        """
+        columns = [col for col in stream_columns(kwargs.get("analyses")) if col in table.column_names]
+        rows = (
+            row
+            for batch in table.select(columns).to_batches(max_chunksize=chunk_size)
+            for row in batch.to_pylist()
+        )
+        return cls(rows, chunk_size=chunk_size, **kwargs)
+
+    def _chunks(self):
+        while True:
+            chunk = list(islice(self.rows, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _consume(self) -> None:
+        """Analyzes every chunk once and merges the partial aggregates."""
+        with self._lock:
+            if self._consumed:
+                return
+            for chunk in self._chunks():
+                self._merge(Analyst(chunk, vocabulary=self.vocabulary, **self.analyst_options))
+            self._consumed = True
+
+    def _collected(self, method: str) -> None:
+        if method not in self.analyses:
+            raise ValueError(f"{method} is not collected by this StreamingAnalyst")
+        self._consume()
+
+    def _merge(self, analyst: Analyst) -> None:
+        if "get_frequencies" in self.analyses:
+            for col in FREQUENCY_COLUMNS:
+                self._frequencies[col].update(analyst.get_frequencies(col))
+            for col in self.text_columns:
+                self._text_frequencies[col].update(analyst.get_frequencies(col, text_mode=True))
+        if "get_pos_tags_tokens" in self.analyses:
+            for col in self.pos_columns:
+                if analyst.df[col].notna().any():
+                    self._pos_seen[col] = True
+                    tokens = analyst.get_pos_tags_tokens(col)
+                    for key in POS_TAG_TOKENS:
+                        self._pos_tokens[col][key].update(tokens[key])
+
+        if "get_tfidf_skills" in self.analyses:
+            max_n = self.ngram_range[1]
+            for role, tokens in analyst.role_skill_tokens().items():
+                tail = self._role_tails.get(role, [])
+                words = tail + [term for tok in tokens for term in token_terms(tok)]
+                self._role_terms.setdefault(role, Counter()).update(
+                    document_ngrams(words, self.ngram_range, skip=len(tail))
+                )
+                self._role_tails[role] = words[len(words) - (max_n - 1):] if max_n > 1 else []
+
+        if "get_PMI_networks" in self.analyses:
+            ids, doc_freq, pair_keys, pair_counts = analyst.skill_cooccurrence()
+            if len(self._skill_doc_freq) < len(self.vocabulary):
+                self._skill_doc_freq = np.pad(
+                    self._skill_doc_freq, (0, len(self.vocabulary) - len(self._skill_doc_freq))
+                )
+            self._skill_doc_freq[ids] += doc_freq
+            if self.pair_sketch is not None:
+                self.pair_sketch.update(pair_keys, pair_counts)
+            else:
+                self._pair_keys, self._pair_counts = merge_counts(
+                    self._pair_keys, self._pair_counts, pair_keys, pair_counts
+                )
+
+        if "assess_swiss_knife_job" in self.analyses:
+            for result in analyst.assess_swiss_knife_job():
+                result["index"] += self.n_rows
+                self._swiss_knife.append(result)
+
+        self._cache_stats.update(analyst.cache_stats)
+        self.n_rows += len(analyst.df)
+
+    def prepare_skills(self) -> None:
+        """Consumes the rows, e.g. before the analyses run concurrently."""
+        self._consume()
+
+    @property
+    def cache_stats(self) -> dict:
+        """Returns the tokenization cache counters summed over the chunks."""
+        return {key: self._cache_stats[key] for key in ("hits", "misses", "store_hits", "entries")}
+
+    def get_frequencies(self, column: str, text_mode=False) -> Counter:
+        """Returns frequency counts for a column, like `Analyst.get_frequencies`."""
+        self._collected("get_frequencies")
+        collected = self._text_frequencies if text_mode else self._frequencies
+        if column not in collected:
+            raise ValueError(f"Frequencies of {column} (text_mode={text_mode}) are not collected")
+        return Counter(collected[column])
+
+    def get_pos_tags_tokens(self, column: str) -> dict:
+        """Returns POS tag token counts for a column, like `Analyst.get_pos_tags_tokens`."""
+        self._collected("get_pos_tags_tokens")
+        if column not in self._pos_tokens:
+            raise ValueError(f"POS tag tokens of {column} are not collected")
+        if not self._pos_seen[column]:
+            return {key: [] for key in POS_TAG_TOKENS}
+        return {key: dict(counts) for key, counts in self._pos_tokens[column].items()}
+
+    def get_tfidf_skills(self, top_k: int = 10, ngram_range=None,
+                         vectorizer: str = "tfidf") -> Dict[str, List[Dict[str, float]]]:
+        """Returns top-k TF-IDF skills per role, like `Analyst.get_tfidf_skills`."""
+        if vectorizer not in VECTORIZERS:
+            raise ValueError(f"Unsupported TF-IDF vectorizer: {vectorizer}")
+        if ngram_range is not None and tuple(ngram_range) != self.ngram_range:
+            raise ValueError(f"Term counts were collected for ngram_range={self.ngram_range}")
+        self._collected("get_tfidf_skills")
+        roles = list(self._role_terms)
+        counts = [self._role_terms[role] for role in roles]
+        if not roles or not any(counts):
+            return {}
+        X, feature_names = tfidf_from_term_counts(counts, vectorizer=vectorizer)
+        return {
+            role: [{"skill": name, "score": float(score)} for name, score in top]
+            for role, top in zip(roles, named_top_k(X, feature_names, top_k))
+        }
+
+    def get_PMI_networks(self, min_cofreq: int = 2, measure: str = "pmi") -> List[Dict]:
+        """
+        Returns the skill PMI network, like `Analyst.get_PMI_networks`.
+        With a `pair_sketch`, only its candidate pairs are considered and their
+        co-occurrence counts are estimates (see `pmi_approximation`).
+        """
+        self._collected("get_PMI_networks")
+        if self.pair_sketch is not None:
+            pair_keys, pair_counts = self.pair_sketch.counts()
+        else:
+            pair_keys, pair_counts = self._pair_keys, self._pair_counts
+        ids = np.flatnonzero(self._skill_doc_freq)
+        names = self.vocabulary.skills(ids)
+        # Rank ids alphabetically, the vocabulary order of Analyst.get_PMI_networks
+        order = np.argsort(np.array(names, dtype=object), kind="stable")
+        rank = np.zeros(len(self._skill_doc_freq), dtype=np.int64)
+        rank[ids[order]] = np.arange(len(ids))
+
+        keep = pair_counts >= min_cofreq
+        a, b = split_pair_keys(pair_keys[keep])
+        ra, rb = rank[a], rank[b]
+        return pmi_from_counts(
+            self.n_rows,
+            self._skill_doc_freq[ids[order]],
+            np.minimum(ra, rb),
+            np.maximum(ra, rb),
+            pair_counts[keep],
+            [names[i] for i in order.tolist()],
+            measure=measure,
+        )
+
+    def pmi_approximation(self) -> Dict:
+        """Returns the pair sketch parameters and error bounds, or None for exact counts."""
+        if self.pair_sketch is None:
+            return None
+        self._consume()
+        return self.pair_sketch.params
+
+    def assess_swiss_knife_job(self) -> List[Dict]:
+        """Returns the ODI of every row, like `Analyst.assess_swiss_knife_job`."""
+        self._collected("assess_swiss_knife_job")
+        return [dict(result) for result in self._swiss_knife]
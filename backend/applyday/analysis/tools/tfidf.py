@@ -0,0 +1,194 @@
+# backend/applyday/analysis/tools/tfidf.py
+# Sparse-aware TF-IDF helpers for the Analyst.
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterator, List, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+VECTORIZERS = ("tfidf", "hashing")
+HASHING_FEATURES = 2 ** 20
+
+_term_analyzer = TfidfVectorizer().build_analyzer()
+
+
+@lru_cache(maxsize=None)
+def token_terms(token: str) -> Tuple[str, ...]:
+    """Returns the unigram terms TfidfVectorizer extracts from a skill token."""
+    return tuple(_term_analyzer(token))
+
+
+def tfidf_from_counts(C, doc_freq, n_docs: int):
+    """
+    Computes TF-IDF from a document x term count matrix and stored document frequencies.
+    Uses the TfidfTransformer defaults (smooth idf, l2 norm), so the scores equal a
+    TfidfVectorizer fit on the same documents without refitting it.
+    Args:
+        C: Sparse document x term count matrix.
+        doc_freq (array-like): Number of documents containing each term.
+        n_docs (int): Number of documents, including those without terms.
+    Returns:
+        CSR matrix of TF-IDF scores.
+    """
+    idf = np.log((1 + n_docs) / (1 + np.asarray(doc_freq, dtype=np.float64))) + 1
+    X = sp.csr_matrix(C, dtype=np.float64) @ sp.diags(idf)
+    return normalize(X, norm="l2")
+
+
+def sparse_top_k(X, k: int) -> Iterator[List[Tuple[int, float]]]:
+    """
+    Yields the top-k (column, score) pairs of every CSR row without densifying.
+    Explanation:
+    - Works on the row's slice of `X.data`/`X.indices` only, so cost depends on the
+      row's nonzeros rather than the vocabulary size.
+    - `np.argpartition` selects the k largest scores; only those k are sorted,
+      by descending score then column index.
+    Args:
+        X: CSR matrix of scores.
+        k (int): Number of entries to keep per row.
+    Yields:
+        list of (column index, score) pairs with score > 0.
+    """
+    X = X.tocsr()
+    for i in range(X.shape[0]):
+        start, end = X.indptr[i], X.indptr[i + 1]
+        data, indices = X.data[start:end], X.indices[start:end]
+        positive = data > 0
+        data, indices = data[positive], indices[positive]
+        if k <= 0 or len(data) == 0:
+            yield []
+            continue
+        if len(data) > k:
+            part = np.argpartition(-data, k - 1)[:k]
+            data, indices = data[part], indices[part]
+        order = np.lexsort((indices, -data))
+        yield list(zip(indices[order].tolist(), data[order].tolist()))
+
+
+def tfidf_from_documents(docs: List[str], ngram_range=(1, 1), vectorizer: str = "tfidf"):
+    """
+    Fits TF-IDF over whitespace-joined documents.
+    Args:
+        docs (List[str]): One document per role.
+        ngram_range (tuple): (min_n, max_n) n-gram range.
+        vectorizer (str): "tfidf" for TfidfVectorizer, or "hashing" for
+            HashingVectorizer + TfidfTransformer, which keeps no vocabulary while fitting.
+    Returns:
+        tuple (X, feature_names) where `feature_names[j]` names column j; with "hashing",
+        a `HashedFeatureNames` to resolve for the columns needed (see `named_top_k`).
+    """
+    if vectorizer not in VECTORIZERS:
+        raise ValueError(f"Unsupported TF-IDF vectorizer: {vectorizer}")
+    ngram_range = tuple(ngram_range)
+
+    if vectorizer == "tfidf":
+        vec = TfidfVectorizer(ngram_range=ngram_range)
+        X = vec.fit_transform(docs)
+        return X, vec.get_feature_names_out()
+
+    vec = HashingVectorizer(
+        ngram_range=ngram_range, n_features=HASHING_FEATURES, alternate_sign=False, norm=None
+    )
+    X = TfidfTransformer().fit_transform(vec.transform(docs))
+    return X, HashedFeatureNames(vec, docs)
+
+
+def _hash_terms(terms: List[str], n_features: int) -> np.ndarray:
+    """Returns the HashingVectorizer column of every term."""
+    term_hasher = HashingVectorizer(
+        analyzer=lambda term: [term], n_features=n_features, alternate_sign=False, norm=None
+    )
+    return term_hasher.transform(terms).tocsr().indices
+
+
+class HashedFeatureNames:
+    """
+    Feature names of a HashingVectorizer fit, recovered on demand.
+    Only the columns asked for are named, so no vocabulary of the documents is built.
+    """
+    def __init__(self, vec: HashingVectorizer, docs: List[str]):
+        self.vec = vec
+        self.docs = docs
+
+    def resolve(self, columns) -> Dict[int, str]:
+        """Names the given hashed columns (colliding terms are joined with '|' in sorted order)."""
+        columns = set(columns)
+        if not columns:
+            return {}
+        analyzer = self.vec.build_analyzer()
+        found: Dict[int, Set[str]] = {}
+        # One pass over the documents, hashing each document's terms together
+        for doc in self.docs:
+            terms = list(set(analyzer(doc)))
+            if not terms:
+                continue
+            for term, col in zip(terms, _hash_terms(terms, self.vec.n_features).tolist()):
+                if col in columns:
+                    found.setdefault(col, set()).add(term)
+        return {col: "|".join(sorted(terms)) for col, terms in found.items()}
+
+
+def named_top_k(X, feature_names, k: int) -> List[List[Tuple[str, float]]]:
+    """
+    Returns the top-k (feature name, score) pairs of every row, see `sparse_top_k`.
+    `HashedFeatureNames` are only resolved for the selected columns.
+    """
+    tops = list(sparse_top_k(X, k))
+    if isinstance(feature_names, HashedFeatureNames):
+        feature_names = feature_names.resolve({j for top in tops for j, _ in top})
+    return [[(str(feature_names[j]), score) for j, score in top] for top in tops]
+
+
+def document_ngrams(words: List[str], ngram_range=(1, 1), skip: int = 0) -> Iterator[str]:
+    """
+    Yields the word n-grams TfidfVectorizer extracts from a sequence of analyzer words.
+    Args:
+        words (List[str]): Analyzer words (see `token_terms`) of a document.
+        ngram_range (tuple): (min_n, max_n) n-gram range.
+        skip (int): Number of leading words already counted; only n-grams ending
+            after them are yielded, so a document can be counted in pieces.
+    """
+    min_n, max_n = ngram_range
+    for n in range(min_n, max_n + 1):
+        for i in range(max(0, skip - n + 1), len(words) - n + 1):
+            yield " ".join(words[i:i + n])
+
+
+def tfidf_from_term_counts(counts: List[Counter], vectorizer: str = "tfidf"):
+    """
+    Computes TF-IDF from per-document term counts.
+    Gives the same scores and feature names as `tfidf_from_documents` on the
+    documents the counts were taken from.
+    Args:
+        counts (List[Counter]): Term counts of each document.
+        vectorizer (str): "tfidf" (sorted vocabulary) or "hashing" (hashed columns).
+    Returns:
+        tuple (X, feature_names) where `feature_names[j]` names column j.
+    """
+    if vectorizer not in VECTORIZERS:
+        raise ValueError(f"Unsupported TF-IDF vectorizer: {vectorizer}")
+    terms = sorted(set().union(*counts))
+    if vectorizer == "tfidf":
+        columns = np.arange(len(terms))
+        feature_names = np.array(terms, dtype=object)
+        n_features = len(terms)
+    else:
+        columns = _hash_terms(terms, HASHING_FEATURES) if terms else np.zeros(0, dtype=np.int64)
+        feature_names = {}
+        for term, col in zip(terms, columns.tolist()):
+            feature_names[col] = f"{feature_names[col]}|{term}" if col in feature_names else term
+        n_features = HASHING_FEATURES
+    term_column = dict(zip(terms, columns.tolist()))
+
+    rows, cols, data = [], [], []
+    for i, doc_counts in enumerate(counts):
+        for term, count in doc_counts.items():
+            rows.append(i)
+            cols.append(term_column[term])
+            data.append(count)
+    C = sp.csr_matrix((data, (rows, cols)), shape=(len(counts), n_features))
+    C.sum_duplicates()
+    return TfidfTransformer().fit_transform(C), feature_names
@@ -0,0 +1,51 @@
+# backend/applyday/analysis/tools/token_cache.py
+# Persistent spaCy token cache shared by every Analyst and worker process.
+import json
+from typing import Dict, Iterable, List
+
+from analysis.tools.sqlite_store import SQLiteLRUStore
+
+
+class TokenCache(SQLiteLRUStore):
+    """
+    SQLite-backed store of spaCy token output.
+    Entries are keyed by (text hash, model name, model version) so a model
+    upgrade never serves stale tokens. The least recently used entries are
+    evicted once the store grows past `max_entries`.
+    Args:
+        path (str): Path of the SQLite file, created on first use.
+        max_entries (int): Maximum number of cached texts.
+    Methods:
+        get_many(keys, model, version): Returns cached token rows for the given text hashes.
+        put_many(entries, model, version): Stores token rows and evicts old entries.
+        clear(): Removes every entry.
+    """
+    table = "token_rows"
+
+    def __init__(self, path: str, max_entries: int = 200_000):
+        super().__init__(path, max_entries=max_entries)
+
+    def get_many(self, keys: Iterable[str], model: str, version: str) -> Dict[str, List[list]]:
+        """
+        Returns cached token rows for the given text hashes.
+        Args:
+            keys (Iterable[str]): Text hashes to look up.
+            model (str): spaCy pipeline name.
+            version (str): spaCy pipeline version.
+        Returns:
+            dict mapping each found hash to its list of token rows.
+        """
+        found = super().get_many(keys, namespace=f"{model}:{version}")
+        return {key: json.loads(tokens) for key, tokens in found.items()}
+
+    def put_many(self, entries: Dict[str, List[list]], model: str, version: str) -> None:
+        """
+        Stores token rows and evicts the least recently used entries.
+        Args:
+            entries (dict): Mapping of text hash to its list of token rows.
+            model (str): spaCy pipeline name.
+            version (str): spaCy pipeline version.
+        """
+        super().put_many(
+            {key: json.dumps(tokens) for key, tokens in entries.items()}, namespace=f"{model}:{version}"
+        )
@@ -0,0 +1,164 @@
+# backend/applyday/analysis/tools/vocabulary.py
+# Interned skill ids and CSR-style JD skill sets.
+# Every distinct skill string is stored once per vocabulary and JDs hold int32 ids,
+# so counting, co-occurrence and overlap run on NumPy arrays instead of re-hashing
+# Python strings. Each Analyst (or StreamingAnalyst) owns its vocabulary, so it is
+# freed with the report instead of growing for the life of the worker process.
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+# Pair keys pack two ids as (a << 32) | b
+PAIR_SHIFT = np.int64(32)
+
+
+class SkillVocabulary:
+    """
+    Append-only mapping of skill strings to compact int32 ids.
+    Ids are assigned in order of first use and never change, so arrays of ids
+    from different Analysts (or chunks) can be merged directly.
+    """
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._skills: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def intern_many(self, skills: Iterable[str]) -> np.ndarray:
+        """Returns the ids of `skills`, adding unseen ones."""
+        skills = skills if isinstance(skills, list) else list(skills)
+        ids = self._ids
+        missing = [skill for skill in dict.fromkeys(skills) if skill not in ids]
+        if missing:
+            with self._lock:
+                for skill in missing:
+                    if skill not in ids:
+                        # Append first so a published id always resolves
+                        self._skills.append(skill)
+                        ids[skill] = len(self._skills) - 1
+        return np.fromiter((ids[skill] for skill in skills), dtype=np.int32, count=len(skills))
+
+    def known_ids(self, skills: Iterable[str]) -> np.ndarray:
+        """Returns the ids of those `skills` already interned, without adding the others."""
+        ids = self._ids
+        return np.fromiter((ids[skill] for skill in skills if skill in ids), dtype=np.int32)
+
+    def skills(self, ids: Iterable[int]) -> List[str]:
+        """Returns the skill strings of `ids`."""
+        skills = self._skills
+        return [skills[i] for i in np.asarray(ids).tolist()]
+
+
+
+class SkillSets:
+    """
+    Skill ids of every JD in CSR form: row i holds `indices[indptr[i]:indptr[i + 1]]`.
+    Sets (`unique=True`) are sorted and deduplicated; multisets keep input order.
+    Args:
+        indptr (np.ndarray): int64 row offsets, length n_rows + 1.
+        indices (np.ndarray): int32 skill ids.
+        vocabulary (SkillVocabulary): Vocabulary the ids belong to.
+    """
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, vocabulary: SkillVocabulary):
+        self.indptr = indptr
+        self.indices = indices
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_pairs(cls, rows, ids, n_rows: int, vocabulary: SkillVocabulary,
+                   unique: bool = True) -> "SkillSets":
+        """Builds skill sets from (row, skill id) pairs given in row order."""
+        rows = np.asarray(rows, dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int32)
+        if unique and len(ids):
+            order = np.lexsort((ids, rows))
+            rows, ids = rows[order], ids[order]
+            keep = np.ones(len(ids), dtype=bool)
+            keep[1:] = (rows[1:] != rows[:-1]) | (ids[1:] != ids[:-1])
+            rows, ids = rows[keep], ids[keep]
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+        return cls(indptr, ids, vocabulary)
+
+    @classmethod
+    def from_lists(cls, lists: Iterable[Iterable], unique: bool = True,
+                   normalize: Optional[Callable[[object], str]] = str,
+                   vocabulary: SkillVocabulary = None) -> "SkillSets":
+        """Builds skill sets from per-JD skill lists, interning `normalize(skill)` (into a new vocabulary by default)."""
+        vocabulary = vocabulary if vocabulary is not None else SkillVocabulary()
+        lengths, flat = [], []
+        for skills in lists:
+            before = len(flat)
+            flat.extend(normalize(skill) for skill in skills)
+            lengths.append(len(flat) - before)
+        rows = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+        return cls.from_pairs(rows, vocabulary.intern_many(flat), len(lengths), vocabulary, unique=unique)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes
+
+    def sizes(self) -> np.ndarray:
+        """Returns the number of skills of every JD."""
+        return np.diff(self.indptr)
+
+    def row(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def frequencies(self) -> Counter:
+        """Returns skill counts, keyed by skill in order of first appearance."""
+        if not len(self.indices):
+            return Counter()
+        ids, first = np.unique(self.indices, return_index=True)
+        counts = np.bincount(self.indices)[ids]
+        order = np.argsort(first, kind="stable")
+        return Counter(dict(zip(self.vocabulary.skills(ids[order]), counts[order].tolist())))
+
+    def overlap(self, skills: Iterable[str]) -> np.ndarray:
+        """Returns how many of `skills` every JD contains."""
+        wanted = self.vocabulary.known_ids(skills)
+        rows = np.repeat(np.arange(len(self), dtype=np.int64), self.sizes())
+        return np.bincount(rows[np.isin(self.indices, wanted)], minlength=len(self))
+
+    def cooccurrence(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns document and pair frequencies of the skill sets.
+        Returns:
+            tuple (ids, doc_freq, pair_keys, pair_counts): skill ids with their
+            document frequency, and pairs as `(a << 32) | b` keys with a < b.
+        """
+        ids, local = np.unique(self.indices, return_inverse=True)
+        X = sp.csr_matrix(
+            (np.ones(len(local), dtype=np.int32), local.astype(np.int32), self.indptr),
+            shape=(len(self), len(ids)),
+        )
+        doc_freq = np.asarray(X.sum(axis=0)).ravel().astype(np.int64)
+        cooc = sp.triu(X.T @ X, k=1).tocoo()
+        a, b = ids[cooc.row].astype(np.int64), ids[cooc.col].astype(np.int64)
+        keys = (np.minimum(a, b) << PAIR_SHIFT) | np.maximum(a, b)
+        return ids, doc_freq, keys, cooc.data.astype(np.int64)
+
+
+def merge_counts(keys: np.ndarray, counts: np.ndarray, new_keys: np.ndarray, new_counts: np.ndarray):
+    """Adds `new_counts` to the counts of `keys`; returns sorted unique keys and their counts."""
+    keys = np.concatenate([keys, new_keys])
+    if not len(keys):
+        return keys.astype(np.int64), np.zeros(0, dtype=np.int64)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    totals = np.zeros(len(unique), dtype=np.int64)
+    np.add.at(totals, inverse, np.concatenate([counts, new_counts]).astype(np.int64))
+    return unique, totals
+
+
+def split_pair_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the two skill ids of every pair key."""
+    keys = np.asarray(keys, dtype=np.int64)
+    return keys >> PAIR_SHIFT, keys & np.int64(0xFFFFFFFF)
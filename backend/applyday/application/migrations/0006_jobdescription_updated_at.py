@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application', '0005_alter_jobdescription_company_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobdescription',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -49,6 +49,8 @@ class JobDescription(models.Model):
     
     # Fields for structured job description data
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped on every save; part of the report fingerprint (see AnalysisService.fingerprint)
+    updated_at = models.DateTimeField(auto_now=True)
     company = models.CharField(max_length=255, null=True, blank=True)
     role = models.CharField(max_length=255, null=True, blank=True)
     level = models.CharField(max_length=255, null=True, blank=True)
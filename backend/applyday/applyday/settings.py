@@ -166,6 +166,54 @@ STATIC_URL = 'static/'
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Analysis (spaCy) settings
+# Texts are parsed in batches with nlp.pipe; set N_PROCESS to -1 to use every core
+ANALYSIS_NLP_BATCH_SIZE = int(os.environ.get('ANALYSIS_NLP_BATCH_SIZE', '256'))
+ANALYSIS_NLP_N_PROCESS = int(os.environ.get('ANALYSIS_NLP_N_PROCESS', '1'))
+# "structured" tokenizes the normalized skill fields without spaCy
+ANALYSIS_SKILL_TOKENIZER = os.environ.get('ANALYSIS_SKILL_TOKENIZER', 'spacy')
+# Persistent spaCy token cache shared across reports and workers; empty path disables it
+ANALYSIS_TOKEN_CACHE_PATH = os.environ.get('ANALYSIS_TOKEN_CACHE_PATH', os.path.join(BASE_DIR, 'cache', 'analysis_tokens.sqlite3'))
+ANALYSIS_TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('ANALYSIS_TOKEN_CACHE_MAX_ENTRIES', '200000'))
+# Stream report rows from the database in chunks of this size (0 loads every row with model_to_dict)
+ANALYSIS_STREAM_CHUNK_SIZE = int(os.environ.get('ANALYSIS_STREAM_CHUNK_SIZE', '2000'))
+# Append-only Arrow snapshot of JobDescription, read memory-mapped by reports instead of the ORM
+# while its row count, latest id and latest updated_at match the table (else reports read the ORM)
+ANALYSIS_SNAPSHOT_ENABLED = os.environ.get('ANALYSIS_SNAPSHOT_ENABLED', 'False').lower() == 'true'
+ANALYSIS_SNAPSHOT_DIR = os.environ.get('ANALYSIS_SNAPSHOT_DIR', os.path.join(MEDIA_ROOT, 'analytics', 'job_descriptions'))
+# Compact the snapshot once it has more parts than this
+ANALYSIS_SNAPSHOT_MAX_PARTS = int(os.environ.get('ANALYSIS_SNAPSHOT_MAX_PARTS', '64'))
+# Maintain the aggregate tables on every JobDescription write; with the structured skill tokenizer, answer
+# full-corpus freq.*, graph.skills and unigram tfidf.skills from them, and freq.* of whole-day
+# start_at/end_at ranges from the day buckets. Run `rebuild_skill_aggregates` after enabling them on existing data
+ANALYSIS_AGGREGATE_TABLES = os.environ.get('ANALYSIS_AGGREGATE_TABLES', 'False').lower() == 'true'
+# TF-IDF vectorizer: "tfidf" keeps a vocabulary, "hashing" uses HashingVectorizer for very large vocabularies
+ANALYSIS_TFIDF_VECTORIZER = os.environ.get('ANALYSIS_TFIDF_VECTORIZER', 'tfidf')
+# Run the independent report analyses "serial", on a "thread" pool or on forked "process" workers.
+# spaCy holds the GIL, so "thread" gains little; use "process" on machines with 2+ cores
+ANALYSIS_EXECUTOR = os.environ.get('ANALYSIS_EXECUTOR', 'serial')
+ANALYSIS_EXECUTOR_WORKERS = int(os.environ.get('ANALYSIS_EXECUTOR_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Count streamed skill pairs with a count-min sketch + Space-Saving in fixed memory;
+# co-occurrence counts are then overestimated by at most EPSILON * total pairs with probability 1 - DELTA.
+# Only streamed reports (ANALYSIS_STREAM_CHUNK_SIZE > 0 or the snapshot) not served from the aggregate
+# tables are approximated; the in-memory Analyst and the aggregate tables count pairs exactly and log a warning
+ANALYSIS_PMI_APPROXIMATE = os.environ.get('ANALYSIS_PMI_APPROXIMATE', 'False').lower() == 'true'
+ANALYSIS_PMI_EPSILON = float(os.environ.get('ANALYSIS_PMI_EPSILON', '0.0001'))
+ANALYSIS_PMI_DELTA = float(os.environ.get('ANALYSIS_PMI_DELTA', '0.01'))
+ANALYSIS_PMI_HEAVY_HITTERS = int(os.environ.get('ANALYSIS_PMI_HEAVY_HITTERS', '10000'))
+# Near-duplicate JD texts: minimum estimated Jaccard similarity of their word shingles,
+# and whether extraction reuses the JobDescription of an extracted near-duplicate instead of calling the LLM
+ANALYSIS_DUPLICATE_THRESHOLD = float(os.environ.get('ANALYSIS_DUPLICATE_THRESHOLD', '0.8'))
+ANALYSIS_DUPLICATE_REUSE = os.environ.get('ANALYSIS_DUPLICATE_REUSE', 'False').lower() == 'true'
+
+# Maximum concurrent LLM calls when extracting job descriptions (1 = one at a time)
+AI_EXTRACTION_CONCURRENCY = int(os.environ.get('AI_EXTRACTION_CONCURRENCY', '8'))
+# LLM extraction cache keyed by the normalized JD text, prompt, model and JobSchema version; empty path disables it
+AI_EXTRACTION_CACHE_PATH = os.environ.get('AI_EXTRACTION_CACHE_PATH', os.path.join(BASE_DIR, 'cache', 'ai_extractions.sqlite3'))
+AI_EXTRACTION_CACHE_MAX_ENTRIES = int(os.environ.get('AI_EXTRACTION_CACHE_MAX_ENTRIES', '100000'))
+# Entries older than this are extracted again (0 keeps them forever)
+AI_EXTRACTION_CACHE_MAX_AGE_DAYS = float(os.environ.get('AI_EXTRACTION_CACHE_MAX_AGE_DAYS', '90'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
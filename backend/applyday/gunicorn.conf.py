@@ -20,6 +20,9 @@ max_requests_jitter = 10
 # Preload app for better performance
 preload_app = True
 
+# Load spaCy in the master so forked workers share the model pages copy-on-write
+preload_nlp = os.environ.get("ANALYSIS_PRELOAD_NLP", "True").lower() == "true"
+
 # Logging
 accesslog = "-"  # Log to stdout
 errorlog = "-"   # Log to stderr
@@ -45,3 +48,30 @@ raw_env = [
 limit_request_line = 4094
 limit_request_fields = 100
 limit_request_field_size = 8190
+
+
+# Server hooks
+def when_ready(server):
+    """Preload the spaCy pipeline in the master before workers are forked."""
+    if not preload_nlp:
+        return
+    try:
+        import gc
+        from analysis.tools.nlp import preload
+        preload()
+        # Keep the preloaded objects out of GC passes so workers don't dirty shared pages
+        gc.freeze()
+        server.log.info("spaCy pipeline preloaded")
+    except Exception as e:
+        server.log.warning("spaCy preload failed, workers will load it lazily: %s", e)
+
+
+def post_fork(server, worker):
+    """Warm up the inherited pipeline so the first report does not pay for it."""
+    if not preload_nlp:
+        return
+    try:
+        from analysis.tools.nlp import warmup
+        warmup()
+    except Exception as e:
+        server.log.warning("spaCy warmup failed: %s", e)
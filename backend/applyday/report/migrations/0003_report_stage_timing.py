@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0002_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportStageTiming',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(max_length=100)),
+                ('wall_time', models.FloatField(help_text='Seconds')),
+                ('cpu_time', models.FloatField(help_text='CPU seconds of the thread running the stage')),
+                ('input_rows', models.IntegerField(blank=True, null=True)),
+                ('output_size', models.IntegerField(blank=True, help_text='Bytes of the stage output as JSON', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timings', to='report.analysisreport')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0003_report_stage_timing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisreport',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0004_analysisreport_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisreport',
+            name='params',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='analysisreport',
+            name='selection',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
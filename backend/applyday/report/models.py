@@ -5,6 +5,12 @@ from django.db import models
 class AnalysisReport(models.Model):
     """Model representing an analysis report."""
     created_at = models.DateTimeField(auto_now_add=True)
+    # Hash of the analyzed JobDescriptions and the analysis configuration (see AnalysisService.fingerprint)
+    fingerprint = models.CharField(max_length=64, null=True, blank=True, db_index=True)
+    # {"job_ids": [...]} or {"start_at": ..., "end_at": ...} ({} for all), and the request parameters,
+    # so missing analyses can be filled in later (see AnalysisService.fill_report)
+    selection = models.JSONField(null=True, blank=True)
+    params = models.JSONField(null=True, blank=True)
 
     def __str__(self):
         return f"Report {self.id} - {self.created_at.strftime('%Y-%m-%d %H:%M:%S')}"
@@ -25,3 +31,20 @@ class Summary(models.Model):
     def __str__(self) -> str:
         return f"Summary for Report {self.report.id} - {self.created_at.strftime('%Y-%m-%d %H:%M:%S')}"
 
+
+
+class ReportStageTiming(models.Model):
+    """Wall and CPU time of one stage of building a report (an analysis, a DB write or an LLM call)."""
+    report = models.ForeignKey(AnalysisReport, on_delete=models.CASCADE, related_name="timings")
+    stage = models.CharField(max_length=100)
+    wall_time = models.FloatField(help_text="Seconds")
+    cpu_time = models.FloatField(help_text="CPU seconds of the thread running the stage")
+    input_rows = models.IntegerField(null=True, blank=True)
+    output_size = models.IntegerField(null=True, blank=True, help_text="Bytes of the stage output as JSON")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"Report {self.report_id} {self.stage}: {self.wall_time:.3f}s"
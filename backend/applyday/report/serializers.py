@@ -2,7 +2,8 @@
 # Author: Zhuang Xiaojian
 from rest_framework.serializers import ModelSerializer, SerializerMethodField
 
-from .models import AnalysisReport, AnalysisResult, Summary
+from .models import AnalysisReport, AnalysisResult, ReportStageTiming, Summary
+from .services.generate_report import AnalysisService
 
 class AnalysisResultSerializer(ModelSerializer):
     class Meta:
@@ -10,6 +11,12 @@ class AnalysisResultSerializer(ModelSerializer):
         fields = ["id", "name", "result"]
         read_only_fields = ['id', 'name', 'result']
 
+class ReportStageTimingSerializer(ModelSerializer):
+    class Meta:
+        model = ReportStageTiming
+        fields = ["stage", "wall_time", "cpu_time", "input_rows", "output_size"]
+        read_only_fields = fields
+
 class SummarySerializer(ModelSerializer):
     class Meta:
         model = Summary
@@ -18,13 +25,23 @@ class SummarySerializer(ModelSerializer):
 
 class AnalysisReportSerializer(ModelSerializer):
     results = AnalysisResultSerializer(many=True, read_only=True)
+    timings = ReportStageTimingSerializer(many=True, read_only=True)
     latest_summary = SerializerMethodField()
-
+    analyses = SerializerMethodField()
+    missing_analyses = SerializerMethodField()
 
     class Meta:
         model = AnalysisReport
-        fields = ["id", "created_at", "results", "latest_summary"]
-        read_only_fields = ['created_at']
+        fields = ["id", "created_at", "fingerprint", "analyses", "missing_analyses",
+                  "results", "timings", "latest_summary"]
+        read_only_fields = ['created_at', 'fingerprint']
+
+    def get_analyses(self, obj):
+        return AnalysisService.computed_analyses(obj)
+
+    def get_missing_analyses(self, obj):
+        computed = set(AnalysisService.computed_analyses(obj))
+        return [name for name in AnalysisService.ANALYSES if name not in computed]
 
     def get_latest_summary(self, obj):
         latest_summary = obj.summary.order_by('-created_at').first()
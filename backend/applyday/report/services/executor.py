@@ -0,0 +1,89 @@
+# backend/applyday/report/services/executor.py
+# Runs independent report analyses serially, on a thread pool or on forked worker processes.
+# spaCy parsing and most pandas/numpy steps of the analyses hold the GIL, so "thread" mostly
+# overlaps the database reads; "process" is the mode expected to cut report latency, on 2+ cores.
+# Compare the modes on the target machine with analysis/benchmarks/bench_executor.py; the
+# recorded run in analysis/benchmarks/results/ is from a 1-core machine, where "process"
+# only adds the fork overhead (0.57x serial) and "thread" stays close to serial (0.91x).
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict
+
+from django import db
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ("serial", "thread", "process")
+
+# Tasks of this worker process's pool, set by its initializer. Forked workers inherit
+# the initializer arguments, so neither the callables nor the Analyst they close over
+# are ever pickled, and concurrent pools in one parent never see each other's tasks
+_forked_tasks: Dict[str, Callable[[], Any]] = {}
+
+
+def _run_in_thread(fn: Callable[[], Any]) -> Any:
+    try:
+        return fn()
+    finally:
+        # Django opens one connection per thread
+        db.connections.close_all()
+
+
+def _init_forked(tasks: Dict[str, Callable[[], Any]]) -> None:
+    global _forked_tasks
+    _forked_tasks = tasks
+
+
+def _run_forked(name: str) -> Any:
+    try:
+        return _forked_tasks[name]()
+    finally:
+        db.connections.close_all()
+
+
+def _run_serial(tasks: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    return {name: fn() for name, fn in tasks.items()}
+
+
+def run_tasks(tasks: Dict[str, Callable[[], Any]], mode: str = "serial", workers: int = 4) -> Dict[str, Any]:
+    """
+    Runs independent zero-argument tasks and gathers their results.
+    Args:
+        tasks (dict): Result name -> callable. Tasks must only read shared state.
+        mode (str): "serial", "thread" (ThreadPoolExecutor, mostly GIL-bound for spaCy)
+            or "process" (ProcessPoolExecutor on the fork start method, the one
+            expected to speed up CPU-bound analyses on multi-core machines).
+        workers (int): Maximum number of threads or processes.
+    Returns:
+        dict of results, in the order of `tasks` whatever the completion order.
+    Falls back to serial execution when `workers` <= 1, when fork is not available
+    or when the process pool cannot be started; exceptions raised by a task propagate.
+    """
+    if mode not in EXECUTORS:
+        raise ValueError(f"Unsupported executor: {mode}")
+    if mode == "serial" or workers <= 1 or len(tasks) <= 1:
+        return _run_serial(tasks)
+
+    if mode == "thread":
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis") as pool:
+            futures = {name: pool.submit(_run_in_thread, fn) for name, fn in tasks.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Process executor needs the fork start method; running analyses serially")
+        return _run_serial(tasks)
+
+    # Children must not share the parent's database connections
+    db.connections.close_all()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_forked, initargs=(tasks,),
+        ) as pool:
+            futures = {name: pool.submit(_run_forked, name) for name in tasks}
+            return {name: future.result() for name, future in futures.items()}
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning("Process executor failed (%s); running analyses serially", e)
+        return _run_serial(tasks)
@@ -1,6 +1,35 @@
+import hashlib
+import json
+import logging
+from datetime import datetime
+from functools import partial
+
+from django.conf import settings
+from django.forms.models import model_to_dict
+from django.utils.timezone import make_aware
+
+from analysis import aggregates, snapshot
 from analysis.tools.analyst import Analyst
+from analysis.tools.sketch import ApproximatePairCounts
+from analysis.tools.streaming import StreamingAnalyst, stream_columns
+from analysis.tools.token_cache import TokenCache
+from .executor import run_tasks
+from .timing import StageRecorder, output_size, timed_call
+from application.models import JobDescription
 from ..models import AnalysisReport, AnalysisResult
 
+logger = logging.getLogger(__name__)
+
+# Part of every report fingerprint; bump it when a change to the analyses alters their results
+FINGERPRINT_VERSION = 1
+# Analyst methods that need the shared skill frames (see Analyst.prepare_skills)
+SKILL_METHODS = {"get_tfidf_skills", "get_PMI_networks", "assess_swiss_knife_job"}
+
+
+class StaleReportError(ValueError):
+    """The JobDescriptions or settings of a report changed since it was computed."""
+
+
 class AnalysisService:
     freq_choices = [
         'level',
@@ -11,32 +40,458 @@ class AnalysisService:
         'databases',
         'employment_type',
     ]
+    # Report result name -> the Analyst method computing it
+    ANALYSES = {
+        "freq.role": "get_frequencies",
+        **{f"freq.{choice}": "get_frequencies" for choice in freq_choices},
+        "pos.responsibilities": "get_pos_tags_tokens",
+        "tfidf.skills": "get_tfidf_skills",
+        "graph.skills": "get_PMI_networks",
+        "swiss_knife": "assess_swiss_knife_job",
+    }
 
     @staticmethod
-    def analyze(analyst: Analyst) -> dict:
-        """Returns a dict of analysis results."""
-        results = {}
+    def analyst_options() -> dict:
+        """Returns the Analyst keyword arguments configured by the ANALYSIS_* settings."""
+        token_cache = None
+        if settings.ANALYSIS_TOKEN_CACHE_PATH:
+            token_cache = TokenCache(
+                settings.ANALYSIS_TOKEN_CACHE_PATH,
+                max_entries=settings.ANALYSIS_TOKEN_CACHE_MAX_ENTRIES,
+            )
+        return {
+            "batch_size": settings.ANALYSIS_NLP_BATCH_SIZE,
+            "n_process": settings.ANALYSIS_NLP_N_PROCESS,
+            "token_cache": token_cache,
+            "skill_tokenizer": settings.ANALYSIS_SKILL_TOKENIZER,
+        }
+
+    @staticmethod
+    def pair_sketch() -> ApproximatePairCounts:
+        """Returns the skill pair sketch for streamed reports, or None when ANALYSIS_PMI_APPROXIMATE is off."""
+        if not settings.ANALYSIS_PMI_APPROXIMATE:
+            return None
+        return ApproximatePairCounts(
+            epsilon=settings.ANALYSIS_PMI_EPSILON,
+            delta=settings.ANALYSIS_PMI_DELTA,
+            heavy_hitters=settings.ANALYSIS_PMI_HEAVY_HITTERS,
+        )
+
+    @staticmethod
+    def build_analyst(jd_dicts) -> Analyst:
+        """Builds an Analyst configured from the ANALYSIS_* settings."""
+        return Analyst(jd_dicts, **AnalysisService.analyst_options())
+
+    @staticmethod
+    def analyst_methods(analyses=None) -> list:
+        """Returns the Analyst methods behind report `analyses` (None for every method)."""
+        if analyses is None:
+            return None
+        return sorted({AnalysisService.ANALYSES[name] for name in analyses})
+
+    @staticmethod
+    def build_queryset_analyst(jds, tfidf_params: dict = None, analyses=None):
+        """
+        Builds the analyst for a JobDescription queryset.
+        With ANALYSIS_STREAM_CHUNK_SIZE > 0 the rows are streamed into a StreamingAnalyst
+        (counting skill pairs approximately with ANALYSIS_PMI_APPROXIMATE), with only the
+        columns the report `analyses` read and collecting only what they need; otherwise
+        every row is loaded with model_to_dict into an Analyst.
+        """
+        chunk_size = settings.ANALYSIS_STREAM_CHUNK_SIZE
+        if chunk_size <= 0:
+            return AnalysisService.build_analyst([model_to_dict(jd) for jd in jds])
+        methods = AnalysisService.analyst_methods(analyses)
+        rows = jds.values(*stream_columns(methods)).iterator(chunk_size=chunk_size)
+        return StreamingAnalyst(
+            rows,
+            chunk_size=chunk_size,
+            ngram_range=(tfidf_params or {}).get("ngram_range", (1, 1)),
+            pair_sketch=AnalysisService.pair_sketch(),
+            analyses=methods,
+            **AnalysisService.analyst_options(),
+        )
+
+    @staticmethod
+    def build_snapshot_analyst(table, tfidf_params: dict = None, analyses=None) -> StreamingAnalyst:
+        """Builds a StreamingAnalyst over rows of the memory-mapped JobDescription snapshot."""
+        return StreamingAnalyst.from_arrow(
+            table,
+            chunk_size=settings.ANALYSIS_STREAM_CHUNK_SIZE or 2000,
+            ngram_range=(tfidf_params or {}).get("ngram_range", (1, 1)),
+            pair_sketch=AnalysisService.pair_sketch(),
+            analyses=AnalysisService.analyst_methods(analyses),
+            **AnalysisService.analyst_options(),
+        )
+
+    @staticmethod
+    def parse_flag(value) -> bool:
+        """Returns whether a request flag such as `force` is set (true, "true", "1", "yes")."""
+        if isinstance(value, bool):
+            return value
+        return str(value).strip().lower() in ("1", "true", "yes")
+
+    @staticmethod
+    def report_params(tfidf_params: dict = None, graph_params: dict = None) -> dict:
+        """Returns the request parameters of a report as stored in AnalysisReport.params."""
+        tfidf_params = dict(tfidf_params or {})
+        if "ngram_range" in tfidf_params:
+            tfidf_params["ngram_range"] = list(tfidf_params["ngram_range"])
+        return {"tfidf": tfidf_params, "graph": dict(graph_params or {})}
+
+    @staticmethod
+    def analysis_config(tfidf_params: dict = None, use_aggregates: bool = False, graph_params: dict = None) -> dict:
+        """Returns the parameters and ANALYSIS_* settings that change the results of a report."""
+        pmi = None
+        if settings.ANALYSIS_PMI_APPROXIMATE:
+            pmi = [settings.ANALYSIS_PMI_EPSILON, settings.ANALYSIS_PMI_DELTA, settings.ANALYSIS_PMI_HEAVY_HITTERS]
+        return {
+            "version": FINGERPRINT_VERSION,
+            **AnalysisService.report_params(tfidf_params, graph_params),
+            "skill_tokenizer": settings.ANALYSIS_SKILL_TOKENIZER,
+            "aggregates": use_aggregates,
+            "pmi_approximation": pmi,
+        }
+
+    @staticmethod
+    def fingerprint(jds, config: dict) -> str:
+        """
+        Returns a SHA-256 fingerprint of a JobDescription selection and an analysis config.
+        Every selected id and its `updated_at` stamp are hashed, so adding, removing
+        or editing a selected JobDescription (through save()) changes the fingerprint.
+        """
+        digest = hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+        for pk, updated_at in jds.order_by("id").values_list("id", "updated_at").iterator(chunk_size=2000):
+            digest.update(f"{pk}:{updated_at.isoformat()};".encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def find_report(fingerprint: str) -> AnalysisReport:
+        """Returns the latest report with this fingerprint, or None."""
+        return AnalysisReport.objects.filter(fingerprint=fingerprint).order_by("-created_at", "-id").first()
+
+    @staticmethod
+    def parse_analyses(data) -> list:
+        """
+        Validates the optional `analyses` request parameter, a list of result names (see ANALYSES).
+        Returns them in report order, or None for every analysis; raises ValueError on bad input.
+        """
+        names = data.get("analyses")
+        if names is None:
+            return None
+        if not isinstance(names, list) or not names:
+            raise ValueError("analyses must be a non-empty list of analysis names")
+        unknown = [str(name) for name in names if name not in AnalysisService.ANALYSES]
+        if unknown:
+            raise ValueError(f"Unknown analyses: {', '.join(unknown)}")
+        return [name for name in AnalysisService.ANALYSES if name in names]
 
-        results["freq.role"] = dict(analyst.get_frequencies("role", text_mode=True).most_common(20))
+    @staticmethod
+    def parse_graph_params(data) -> dict:
+        """
+        Validates the optional `min_cofreq` request parameter.
+        Returns keyword arguments for Analyst.get_PMI_networks; raises ValueError on bad input.
+        """
+        params = {}
+        min_cofreq = data.get("min_cofreq")
+        if min_cofreq is not None:
+            if isinstance(min_cofreq, bool) or not str(min_cofreq).isdigit() or not 1 <= int(min_cofreq) <= 1000:
+                raise ValueError("min_cofreq must be an integer between 1 and 1000")
+            params["min_cofreq"] = int(min_cofreq)
+        return params
+
+    @staticmethod
+    def parse_tfidf_params(data) -> dict:
+        """
+        Validates the optional `top_k` and `ngram_range` request parameters.
+        Returns keyword arguments for Analyst.get_tfidf_skills; raises ValueError on bad input.
+        """
+        params = {"vectorizer": settings.ANALYSIS_TFIDF_VECTORIZER}
+
+        top_k = data.get("top_k")
+        if top_k is not None:
+            if isinstance(top_k, bool) or not str(top_k).isdigit() or not 1 <= int(top_k) <= 100:
+                raise ValueError("top_k must be an integer between 1 and 100")
+            params["top_k"] = int(top_k)
+
+        ngram_range = data.get("ngram_range")
+        if ngram_range is not None:
+            try:
+                min_n, max_n = (int(n) for n in ngram_range)
+            except (TypeError, ValueError):
+                raise ValueError("ngram_range must be a pair of integers, e.g. [1, 2]")
+            if not 1 <= min_n <= max_n <= 3:
+                raise ValueError("ngram_range must satisfy 1 <= min_n <= max_n <= 3")
+            params["ngram_range"] = (min_n, max_n)
+        return params
+
+    @staticmethod
+    def aggregate_analyses(use_aggregates: bool = False, tfidf_params: dict = None, day_range: tuple = None) -> set:
+        """Returns the report analyses answered from the aggregate tables instead of the analyst (see analysis_tasks)."""
+        served = set()
+        if day_range or use_aggregates:
+            served.update(f"freq.{choice}" for choice in AnalysisService.freq_choices
+                          if choice in aggregates.FREQUENCY_FIELDS)
+        if use_aggregates:
+            served.add("graph.skills")
+            tfidf_params = tfidf_params or {}
+            if (tfidf_params.get("vectorizer", "tfidf") == "tfidf"
+                    and tuple(tfidf_params.get("ngram_range", (1, 1))) == (1, 1)):
+                served.add("tfidf.skills")
+        return served
+
+    @staticmethod
+    def analysis_tasks(analyst: Analyst, use_aggregates: bool = False, tfidf_params: dict = None,
+                       day_range: tuple = None, graph_params: dict = None, analyses=None) -> dict:
+        """
+        Returns the independent analyses of a report as {result name: zero-argument callable}.
+        With `use_aggregates`, the analyst must cover every JobDescription: the
+        `freq.*` value counts and `graph.skills` are then read from the
+        incrementally maintained aggregate tables instead of being recomputed,
+        as is `tfidf.skills` for the default unigram TfidfVectorizer mode.
+        With `day_range` (first, last local day, see aggregates.whole_day_range), the
+        analyst must cover exactly the JDs created in those days, and the `freq.*`
+        value counts are merged from the day buckets.
+        `graph_params` are passed to get_PMI_networks. With `analyses`, only those
+        results are returned.
+        """
+        tasks = {}
+        graph_params = graph_params or {}
+
+        served = AnalysisService.aggregate_analyses(use_aggregates, tfidf_params, day_range)
+        tasks["freq.role"] = lambda: dict(analyst.get_frequencies("role", text_mode=True).most_common(20))
         for choice in AnalysisService.freq_choices:
-            results[f"freq.{choice}"] = dict(analyst.get_frequencies(choice, text_mode=False))
+            if f"freq.{choice}" not in served:
+                tasks[f"freq.{choice}"] = lambda c=choice: dict(analyst.get_frequencies(c, text_mode=False))
+            elif day_range:
+                tasks[f"freq.{choice}"] = lambda c=choice: dict(aggregates.get_range_frequencies(c, *day_range))
+            else:
+                tasks[f"freq.{choice}"] = lambda c=choice: dict(aggregates.get_frequencies(c))
+
+        tasks["pos.responsibilities"] = partial(analyst.get_pos_tags_tokens, "responsibilities")
+        tfidf_params = tfidf_params or {}
+        if "tfidf.skills" in served:
+            tasks["tfidf.skills"] = partial(aggregates.get_tfidf_skills, top_k=tfidf_params.get("top_k", 10))
+        else:
+            tasks["tfidf.skills"] = partial(analyst.get_tfidf_skills, **tfidf_params)
+        if "graph.skills" in served:
+            tasks["graph.skills"] = partial(aggregates.get_PMI_networks, **graph_params)
+        else:
+            tasks["graph.skills"] = partial(analyst.get_PMI_networks, **graph_params)
+            if getattr(analyst, "pair_sketch", None) is not None:
+                # State the error bounds of the approximate graph in the report
+                tasks["pmi_approximation"] = analyst.pmi_approximation
+        tasks["swiss_knife"] = analyst.assess_swiss_knife_job
+
+        if analyses is not None:
+            selected = set(analyses)
+            if "graph.skills" in selected:
+                selected.add("pmi_approximation")
+            tasks = {name: task for name, task in tasks.items() if name in selected}
+        if settings.ANALYSIS_PMI_APPROXIMATE and "graph.skills" in tasks and "pmi_approximation" not in tasks:
+            logger.warning(
+                "ANALYSIS_PMI_APPROXIMATE only applies to streamed reports (ANALYSIS_STREAM_CHUNK_SIZE > 0 "
+                "or the snapshot) without the aggregate tables; counting skill pairs exactly"
+            )
+        return tasks
 
-        results["pos.responsibilities"] = analyst.get_pos_tags_tokens("responsibilities")
-        results["tfidf.skills"] = analyst.get_tfidf_skills()
-        results["graph.skills"] = analyst.get_PMI_networks()
-        results["swiss_knife"] = analyst.assess_swiss_knife_job()
+    @staticmethod
+    def analyze(analyst: Analyst, use_aggregates: bool = False, tfidf_params: dict = None,
+                executor: str = None, day_range: tuple = None, recorder: StageRecorder = None,
+                graph_params: dict = None, analyses=None) -> dict:
+        """
+        Returns a dict of analysis results.
+        `tfidf_params` are passed to Analyst.get_tfidf_skills (see parse_tfidf_params).
+        The analyses run on `executor` ("serial", "thread" or "process", defaulting to
+        ANALYSIS_EXECUTOR) with up to ANALYSIS_EXECUTOR_WORKERS workers.
+        With a `recorder`, every analysis (and the shared "prepare" step) is recorded as a stage.
+        With `analyses`, only those results (and the intermediates they share) are computed.
+        """
+        executor = executor or settings.ANALYSIS_EXECUTOR
+        recorder = recorder or StageRecorder()
+        tasks = AnalysisService.analysis_tasks(
+            analyst, use_aggregates=use_aggregates, tfidf_params=tfidf_params, day_range=day_range,
+            graph_params=graph_params, analyses=analyses,
+        )
+        # Analyses answered from the aggregate tables need nothing from the analyst
+        served = AnalysisService.aggregate_analyses(use_aggregates, tfidf_params, day_range)
+        methods = {AnalysisService.ANALYSES.get(name) for name in tasks if name not in served}
+        if isinstance(analyst, StreamingAnalyst):
+            prepare = bool(methods & analyst.analyses)
+        else:
+            prepare = executor != "serial" and bool(methods & SKILL_METHODS)
+        if prepare:
+            # Build the skill frames (or consume the streamed rows) once instead of in every worker,
+            # and keep that cost out of whichever analysis would have come first
+            with recorder.stage("prepare") as stage:
+                analyst.prepare_skills()
+                stage["input_rows"] = analyst.n_rows
+        timed = run_tasks(
+            {name: partial(timed_call, fn) for name, fn in tasks.items()},
+            mode=executor, workers=settings.ANALYSIS_EXECUTOR_WORKERS,
+        )
+        results = {}
+        for name, (result, wall_time, cpu_time) in timed.items():
+            results[name] = result
+            recorder.add(name, wall_time, cpu_time, input_rows=analyst.n_rows, output_size=output_size(result))
         return results
-    
+
     @staticmethod
-    def generate_report(analyst: Analyst) -> AnalysisReport:
-        """Generates and saves an AnalysisReport based on the provided Analyst."""
-        analysis_results = AnalysisService.analyze(analyst)
+    def generate_report(analyst: Analyst, use_aggregates: bool = False, tfidf_params: dict = None,
+                        day_range: tuple = None, recorder: StageRecorder = None,
+                        fingerprint: str = None, graph_params: dict = None, analyses=None,
+                        selection: dict = None, report: AnalysisReport = None) -> AnalysisReport:
+        """
+        Generates and saves an AnalysisReport based on the provided Analyst.
+        The per-stage timings (analyses and the "db.write" of the results, plus any
+        stages already in `recorder`) are stored with the report, as are `fingerprint`,
+        the JobDescription `selection` and the request parameters, so that later
+        requests can reuse the report (see find_report) or fill in analyses (see fill_report).
+        With `report`, the results are added to that existing report instead.
+        """
+        recorder = recorder or StageRecorder()
+        analysis_results = AnalysisService.analyze(
+            analyst, use_aggregates=use_aggregates, tfidf_params=tfidf_params, day_range=day_range,
+            recorder=recorder, graph_params=graph_params, analyses=analyses,
+        )
+        logger.info("Analyst token cache: %s", analyst.cache_stats)
 
+        with recorder.stage("db.write", input_rows=len(analysis_results)) as stage:
+            if report is None:
+                report = AnalysisReport.objects.create(
+                    fingerprint=fingerprint,
+                    selection=selection,
+                    params=AnalysisService.report_params(tfidf_params, graph_params),
+                )
+            objs = [
+                AnalysisResult(report=report, name=k, result=v)
+                for k, v in analysis_results.items()
+            ]
+            AnalysisResult.objects.bulk_create(objs)
+            stage["output"] = analysis_results
+        recorder.save(report)
+        return report
+
+    @staticmethod
+    def select_job_descriptions(selection: dict):
+        """
+        Resolves a report selection: {"job_ids": [...]} or {"start_at": iso, "end_at": iso},
+        or {} for every JobDescription. An `end_at` in the last second of a day covers the whole day.
+        Returns:
+            tuple (queryset, start, end) with the aware range bounds, or None for both.
+        """
+        selection = selection or {}
+        if selection.get("job_ids"):
+            return JobDescription.objects.filter(id__in=selection["job_ids"]), None, None
+        if selection.get("start_at") and selection.get("end_at"):
+            start = make_aware(datetime.fromisoformat(selection["start_at"]))
+            end = aggregates.range_end(make_aware(datetime.fromisoformat(selection["end_at"])))
+            return JobDescription.objects.filter(created_at__range=(start, end)), start, end
+        return JobDescription.objects.all(), None, None
+
+    @staticmethod
+    def computed_analyses(report: AnalysisReport) -> list:
+        """Returns the ANALYSES names stored in a report, in report order."""
+        names = {result.name for result in report.results.all()}
+        return [name for name in AnalysisService.ANALYSES if name in names]
+
+    @staticmethod
+    def _compute(selection: dict, tfidf_params: dict, graph_params: dict, analyses,
+                 recorder: StageRecorder = None, fingerprint: str = None, report: AnalysisReport = None):
+        """Computes `analyses` over `selection` into a new report, or into `report`."""
+        jds, start, end = AnalysisService.select_job_descriptions(selection)
+        use_aggregates, day_range = AnalysisService._aggregate_options(selection, start, end)
+        # The analyst only reads the columns of the analyses the aggregate tables do not answer
+        served = AnalysisService.aggregate_analyses(use_aggregates, tfidf_params, day_range)
+        analyst_analyses = [name for name in (analyses or AnalysisService.ANALYSES) if name not in served]
+        recorder = recorder or StageRecorder()
+        # Read the rows from the memory-mapped snapshot when there is an up-to-date one
+        with recorder.stage("load"):
+            table = snapshot.load_current() if settings.ANALYSIS_SNAPSHOT_ENABLED else None
+            if table is not None:
+                table = snapshot.filter_table(table, ids=selection.get("job_ids"), start=start, end=end)
+                analyst = AnalysisService.build_snapshot_analyst(
+                    table, tfidf_params=tfidf_params, analyses=analyst_analyses,
+                )
+            else:
+                analyst = AnalysisService.build_queryset_analyst(
+                    jds, tfidf_params=tfidf_params, analyses=analyst_analyses,
+                )
+        return AnalysisService.generate_report(
+            analyst, use_aggregates=use_aggregates, tfidf_params=tfidf_params, day_range=day_range,
+            recorder=recorder, fingerprint=fingerprint, graph_params=graph_params, analyses=analyses,
+            selection=selection, report=report,
+        )
+
+    @staticmethod
+    def _aggregate_options(selection: dict, start, end):
+        """
+        Returns (use_aggregates, day_range): full-corpus reports can read frequencies and the
+        skill graph from the aggregate tables, whole-day ranges their frequencies from the day buckets.
+        The tables hold structured-tokenizer skills, so they are not used with any other tokenizer.
+        """
+        if not aggregates.serving_enabled() or selection.get("job_ids"):
+            return False, None
+        if start is None:
+            return True, None
+        return False, aggregates.whole_day_range(start, end)
+
+    @staticmethod
+    def _selection_fingerprint(selection: dict, tfidf_params: dict, graph_params: dict) -> str:
+        jds, start, end = AnalysisService.select_job_descriptions(selection)
+        use_aggregates, _ = AnalysisService._aggregate_options(selection, start, end)
+        return AnalysisService.fingerprint(
+            jds, AnalysisService.analysis_config(tfidf_params, use_aggregates=use_aggregates, graph_params=graph_params)
+        )
+
+    @staticmethod
+    def create_report(selection: dict, tfidf_params: dict = None, graph_params: dict = None, analyses=None,
+                      force: bool = False, recorder: StageRecorder = None):
+        """
+        Returns (report, created) for the `analyses` (None for all) of a JobDescription selection.
+        Unless `force` is set, the latest report with the same fingerprint is returned
+        instead of a new one, after computing any requested analyses it lacks. The stages
+        of `recorder` are saved onto the returned report either way. `tfidf_params` default to
+        those of a request without TF-IDF parameters, so every caller fingerprints alike.
+        """
+        if tfidf_params is None:
+            tfidf_params = AnalysisService.parse_tfidf_params({})
+        selection = {key: value for key, value in (selection or {}).items() if value}
+        fingerprint = AnalysisService._selection_fingerprint(selection, tfidf_params, graph_params)
+        if not force:
+            report = AnalysisService.find_report(fingerprint)
+            if report is not None:
+                computed = AnalysisService.computed_analyses(report)
+                missing = [name for name in (analyses or AnalysisService.ANALYSES) if name not in computed]
+                if missing:
+                    AnalysisService._compute(selection, tfidf_params, graph_params, missing,
+                                             recorder=recorder, report=report)
+                elif recorder is not None:
+                    # Keep the stages timed by the caller, e.g. the pipeline's LLM extraction
+                    recorder.save(report)
+                return report, False
+        report = AnalysisService._compute(selection, tfidf_params, graph_params, analyses,
+                                          recorder=recorder, fingerprint=fingerprint)
+        return report, True
+
+    @staticmethod
+    def fill_report(report: AnalysisReport, analyses=None) -> AnalysisReport:
+        """
+        Computes the `analyses` (None for all) a report lacks, with its stored selection and parameters.
+        Raises ValueError for reports without a stored selection and StaleReportError when its
+        JobDescriptions or analysis settings changed since it was computed.
+        """
+        if report.selection is None or report.params is None:
+            raise ValueError("The report has no stored selection; create a new report instead")
+        tfidf_params = dict(report.params.get("tfidf", {}))
+        if "ngram_range" in tfidf_params:
+            tfidf_params["ngram_range"] = tuple(tfidf_params["ngram_range"])
+        graph_params = report.params.get("graph", {})
+        if AnalysisService._selection_fingerprint(report.selection, tfidf_params, graph_params) != report.fingerprint:
+            raise StaleReportError("The job descriptions or analysis settings changed since the report was computed")
 
-        report = AnalysisReport.objects.create()
-        objs = [
-            AnalysisResult(report=report, name=k, result=v)
-            for k, v in analysis_results.items()
-        ]
-        AnalysisResult.objects.bulk_create(objs)
-        return report
\ No newline at end of file
+        computed = AnalysisService.computed_analyses(report)
+        missing = [name for name in (analyses or AnalysisService.ANALYSES) if name not in computed]
+        if missing:
+            AnalysisService._compute(report.selection, tfidf_params, graph_params, missing, report=report)
+        return report
@@ -1,32 +1,53 @@
 from django.forms.models import model_to_dict
 
-from application.models import Application
+from application.models import JobDescriptionText
 from ai.services.extract_jd import process_extract
 from ai.services.get_insights import get_insights
+from report.models import AnalysisReport, AnalysisResult
 from report.services.generate_report import AnalysisService
-from analysis.tools.analyst import Analyst
+from report.services.timing import StageRecorder
 
 class PipelineService:
     
     @staticmethod
-    def run_extraction_pipeline(job_ids=None):
+    def job_text_ids(application_ids=None) -> list:
+        """Returns the JobDescriptionText IDs of the applications (all when None) in one query."""
+        texts = JobDescriptionText.objects.filter(application__isnull=False)
+        if application_ids:
+            texts = texts.filter(application_id__in=application_ids)
+        return list(texts.order_by("id").values_list("id", flat=True))
 
-        applications = Application.objects.filter(id__in=job_ids) if job_ids else Application.objects.all()
-        jd_texts = [app.apply_description for app in applications if hasattr(app, "apply_description")] # type: ignore
+    @staticmethod
+    def run_extraction_pipeline(job_ids=None, force=False):
+        """
+        Extracts the JobDescriptions of the applications and generates their report.
+        An existing report of the same JobDescriptions and configuration is returned
+        instead, unless `force` is set.
+        """
 
-        if not jd_texts:
-            raise ValueError("No job descriptions found for the given applications.")
-        jd_ids = [jt.id for jt in jd_texts]
-        jds = process_extract(job_ids=jd_ids)
+        jd_ids = PipelineService.job_text_ids(job_ids)
 
-        jd_dicts = [model_to_dict(j) for j in jds]
-        analyst = Analyst(jd_dicts)
-        report = AnalysisService.generate_report(analyst)
+        if not jd_ids:
+            raise ValueError("No job descriptions found for the given applications.")
+        recorder = StageRecorder()
+        with recorder.stage("llm.extraction", input_rows=len(jd_ids)) as stage:
+            jds = process_extract(job_ids=jd_ids)
+            stage["output"] = [model_to_dict(jd) for jd in jds]
+        if not jds:
+            raise ValueError("No job descriptions could be extracted for the given applications.")
 
+        report, _ = AnalysisService.create_report(
+            {"job_ids": [j.id for j in jds]}, force=force, recorder=recorder,
+        )
         return report
-    
 
     @staticmethod
     def run_insight_pipeline(report_id, resume_id, languages):
-        report = get_insights(report_id, resume_id, languages=languages)
-        return report
\ No newline at end of file
+        recorder = StageRecorder()
+        # get_insights raises ValueError for an unknown report before anything is saved
+        input_rows = AnalysisResult.objects.filter(report_id=report_id).count()
+        with recorder.stage("llm.insights", input_rows=input_rows) as stage:
+            summary = get_insights(report_id, resume_id, languages=languages)
+            stage["output"] = summary
+        recorder.save(AnalysisReport(pk=report_id))
+        return summary
\ No newline at end of file
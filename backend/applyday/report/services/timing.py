@@ -0,0 +1,68 @@
+# backend/applyday/report/services/timing.py
+# Per-stage wall/CPU timings of report generation, stored as ReportStageTiming rows.
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..models import AnalysisReport, ReportStageTiming
+
+
+def output_size(value: Any) -> int:
+    """Returns the size in bytes of `value` serialized as JSON."""
+    return len(json.dumps(value, default=str).encode("utf-8"))
+
+
+def timed_call(fn: Callable[[], Any]) -> Tuple[Any, float, float]:
+    """
+    Calls `fn` and returns (result, wall seconds, CPU seconds).
+    CPU time is that of the calling thread, so it is meaningful on thread pools and
+    in forked workers alike (work done in spaCy `n_process` children is not included).
+    """
+    wall, cpu = time.perf_counter(), time.thread_time()
+    result = fn()
+    return result, time.perf_counter() - wall, time.thread_time() - cpu
+
+
+class StageRecorder:
+    """
+    Collects the stages of one report build and saves them with the report.
+    Methods:
+        add(stage, wall_time, cpu_time, input_rows, output_size): Records a measured stage.
+        stage(name, input_rows): Context manager timing its block; set `output` on the
+            yielded dict to record the output size.
+        save(report): Stores the recorded stages as ReportStageTiming rows.
+    """
+    def __init__(self):
+        self.stages: List[Dict] = []
+
+    def add(self, stage: str, wall_time: float, cpu_time: float, input_rows: int = None,
+            output_size: int = None) -> None:
+        self.stages.append({
+            "stage": stage,
+            "wall_time": wall_time,
+            "cpu_time": cpu_time,
+            "input_rows": input_rows,
+            "output_size": output_size,
+        })
+
+    @contextmanager
+    def stage(self, name: str, input_rows: int = None):
+        info = {"input_rows": input_rows}
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield info
+        finally:
+            self.add(
+                name,
+                time.perf_counter() - wall,
+                time.thread_time() - cpu,
+                input_rows=info.get("input_rows"),
+                output_size=output_size(info["output"]) if "output" in info else None,
+            )
+
+    def save(self, report: AnalysisReport) -> None:
+        ReportStageTiming.objects.bulk_create(
+            [ReportStageTiming(report=report, **stage) for stage in self.stages]
+        )
+        self.stages = []
@@ -0,0 +1,72 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from analysis.benchmarks.corpus import generate_jds
+from analysis.tools.analyst import Analyst
+from report.services import executor
+from report.services.generate_report import AnalysisService
+
+
+@override_settings(ANALYSIS_EXECUTOR_WORKERS=3)
+class AnalysisExecutorTest(SimpleTestCase):
+    """Test cases for running the report analyses concurrently."""
+
+    def setUp(self):
+        """Set up a small corpus and its serial results."""
+        self.data = generate_jds(60)
+        self.expected = AnalysisService.analyze(Analyst(self.data), executor="serial")
+
+    def test_thread_executor_matches_serial(self):
+        """Test that the thread pool gathers the same results in the same order."""
+        results = AnalysisService.analyze(Analyst(self.data), executor="thread")
+
+        self.assertEqual(list(results), list(self.expected))
+        self.assertEqual(results, self.expected)
+
+    def test_process_executor_matches_serial(self):
+        """Test that forked workers gather the same results in the same order."""
+        results = AnalysisService.analyze(Analyst(self.data), executor="process")
+
+        self.assertEqual(list(results), list(self.expected))
+        self.assertEqual(results, self.expected)
+
+    def test_process_executor_falls_back_without_fork(self):
+        """Test the serial fallback when fork is unavailable."""
+        with mock.patch.object(executor.multiprocessing, "get_all_start_methods", return_value=["spawn"]):
+            results = AnalysisService.analyze(Analyst(self.data), executor="process")
+
+        self.assertEqual(results, self.expected)
+
+    def test_concurrent_process_pools_keep_their_own_tasks(self):
+        """Test that two reports built at once in one worker each get their own results."""
+        results = {}
+
+        def build(label):
+            results[label] = executor.run_tasks(
+                {"a": lambda: f"{label}-a", "b": lambda: f"{label}-b"}, mode="process", workers=2,
+            )
+
+        threads = [threading.Thread(target=build, args=(label,)) for label in ("first", "second")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results["first"], {"a": "first-a", "b": "first-b"})
+        self.assertEqual(results["second"], {"a": "second-a", "b": "second-b"})
+
+    def test_task_errors_propagate(self):
+        """Test that a failing analysis raises in every mode."""
+        def fail():
+            raise RuntimeError("boom")
+
+        for mode in executor.EXECUTORS:
+            with self.assertRaises(RuntimeError):
+                executor.run_tasks({"ok": lambda: 1, "fail": fail}, mode=mode, workers=2)
+
+    def test_unknown_executor_is_rejected(self):
+        """Test that an unsupported mode raises ValueError."""
+        with self.assertRaises(ValueError):
+            executor.run_tasks({"ok": lambda: 1}, mode="cluster")
@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from application.models import Application, JobDescription, JobDescriptionText
+from report.models import AnalysisReport, ReportStageTiming
+from report.services.pipeline_service import PipelineService
+from report.services.timing import output_size
+
+
+@override_settings(ANALYSIS_SKILL_TOKENIZER="structured", ANALYSIS_TOKEN_CACHE_PATH="")
+class ReportStageTimingTest(TestCase):
+    """Test cases for the per-stage timings stored with reports."""
+
+    def setUp(self):
+        """Create two JDs."""
+        self.client = APIClient()
+        self.jds = [
+            JobDescription.objects.create(
+                job_text=JobDescriptionText.objects.create(text="JD text"), role=role,
+                programming_languages=["python", "sql"], responsibilities=["build apis"],
+            )
+            for role in ("backend", "data")
+        ]
+
+    def test_report_api_returns_stage_timings(self):
+        """Test that every analysis, the load and the DB write are timed and returned."""
+        for executor in ("serial", "thread"):
+            with self.settings(ANALYSIS_EXECUTOR=executor, ANALYSIS_EXECUTOR_WORKERS=2):
+                response = self.client.post("/report/", {"force": True}, format="json")
+
+            self.assertEqual(response.status_code, 201)
+            timings = {t["stage"]: t for t in response.data["timings"]}
+            results = {r["name"]: r["result"] for r in response.data["results"]}
+            self.assertEqual(set(results) - set(timings), set())
+            self.assertIn("load", timings)
+            self.assertEqual(timings["db.write"]["input_rows"], len(results))
+            for name, result in results.items():
+                self.assertEqual(timings[name]["input_rows"], 2)
+                self.assertEqual(timings[name]["output_size"], output_size(result))
+                self.assertGreaterEqual(timings[name]["wall_time"], 0)
+                self.assertGreaterEqual(timings[name]["cpu_time"], 0)
+
+        report = AnalysisReport.objects.first()
+        detail = self.client.get(f"/report/{report.id}/")
+        self.assertEqual(len(detail.data["timings"]), report.timings.count())
+
+    def test_pipeline_records_llm_stages(self):
+        """Test that the extraction and insight LLM calls are timed with the report."""
+        application = Application.objects.create(company="ACME", job_title="Engineer")
+        JobDescriptionText.objects.filter(pk=self.jds[0].job_text_id).update(application=application)
+
+        with mock.patch("report.services.pipeline_service.process_extract", return_value=self.jds) as extract:
+            report = PipelineService.run_extraction_pipeline(job_ids=[application.id])
+        extract.assert_called_once()
+        with mock.patch("report.services.pipeline_service.get_insights", return_value="# Summary"):
+            PipelineService.run_insight_pipeline(report.id, None, languages="en")
+
+        stages = {t.stage: t for t in ReportStageTiming.objects.filter(report=report)}
+        self.assertEqual(stages["llm.extraction"].input_rows, 1)
+        self.assertEqual(stages["llm.insights"].input_rows, report.results.count())
+        self.assertEqual(stages["llm.insights"].output_size, output_size("# Summary"))
+        self.assertIn("db.write", stages)
@@ -0,0 +1,381 @@
+import shutil
+import tempfile
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+
+from django.test import TestCase, override_settings
+from django.utils.timezone import make_aware
+from rest_framework.test import APIClient
+
+from analysis import aggregates
+from application.models import Application, JobDescription, JobDescriptionText
+from report.models import AnalysisReport, ReportStageTiming
+from report.services.pipeline_service import PipelineService
+
+
+@override_settings(ANALYSIS_SKILL_TOKENIZER="structured", ANALYSIS_TOKEN_CACHE_PATH="")
+class ReportCreateTfidfParamsTest(TestCase):
+    """Test cases for the TF-IDF request parameters of report creation."""
+
+    def setUp(self):
+        """Set up two roles with multi-word skills."""
+        self.client = APIClient()
+        JobDescription.objects.create(
+            job_text=JobDescriptionText.objects.create(text="JD text"), role="backend", programming_languages=["python"], frameworks_tools=["apache kafka"],
+            responsibilities=["build apis"],
+        )
+        JobDescription.objects.create(
+            job_text=JobDescriptionText.objects.create(text="JD text"), role="frontend", programming_languages=["typescript"], frameworks_tools=["react native"],
+            responsibilities=["build pages"],
+        )
+
+    def test_top_k_and_ngram_range_are_passed_to_tfidf(self):
+        """Test that the request parameters reach get_tfidf_skills of either analyst."""
+        for chunk_size, target in ((0, "analysis.tools.analyst.Analyst"),
+                                   (500, "analysis.tools.streaming.StreamingAnalyst")):
+            with self.settings(ANALYSIS_STREAM_CHUNK_SIZE=chunk_size), \
+                    mock.patch(f"{target}.get_tfidf_skills", return_value={}) as tfidf:
+                response = self.client.post("/report/", {"top_k": 3, "ngram_range": [1, 2], "force": True}, format="json")
+
+            self.assertEqual(response.status_code, 201)
+            tfidf.assert_called_once_with(vectorizer="tfidf", top_k=3, ngram_range=(1, 2))
+
+    def test_streamed_report_matches_loaded_report(self):
+        """Test that streaming the rows in chunks gives the same report results."""
+        results = {}
+        for chunk_size in (0, 1):
+            with self.settings(ANALYSIS_STREAM_CHUNK_SIZE=chunk_size):
+                response = self.client.post("/report/", {"force": True}, format="json")
+            report = AnalysisReport.objects.get(pk=response.data["id"])
+            results[chunk_size] = {r.name: r.result for r in report.results.all()}
+
+        self.assertEqual(results[1], results[0])
+
+    def test_approximate_pmi_states_its_parameters(self):
+        """Test that an approximate skill graph is reported with its sketch parameters."""
+        with self.settings(ANALYSIS_PMI_APPROXIMATE=True, ANALYSIS_PMI_EPSILON=0.001, ANALYSIS_PMI_HEAVY_HITTERS=100):
+            response = self.client.post("/report/", {}, format="json")
+
+        report = AnalysisReport.objects.get(pk=response.data["id"])
+        params = report.results.get(name="pmi_approximation").result
+        self.assertEqual(params["epsilon"], 0.001)
+        self.assertEqual(params["heavy_hitters"], 100)
+        self.assertTrue(report.results.filter(name="graph.skills").exists())
+
+    def test_approximate_pmi_is_not_claimed_for_loaded_reports(self):
+        """Test that a report loaded in memory counts pairs exactly and warns about the setting."""
+        with self.settings(ANALYSIS_PMI_APPROXIMATE=True, ANALYSIS_STREAM_CHUNK_SIZE=0), \
+                self.assertLogs("report.services.generate_report", level="WARNING") as logs:
+            response = self.client.post("/report/", {}, format="json")
+
+        report = AnalysisReport.objects.get(pk=response.data["id"])
+        self.assertFalse(report.results.filter(name="pmi_approximation").exists())
+        self.assertIn("ANALYSIS_PMI_APPROXIMATE only applies to streamed reports", logs.output[0])
+
+    def test_bigram_skills_are_reported(self):
+        """Test that a bigram range reports multi-word skills."""
+        response = self.client.post("/report/", {"top_k": 5, "ngram_range": [2, 2]}, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        report = AnalysisReport.objects.get(pk=response.data["id"])
+        tfidf = report.results.get(name="tfidf.skills").result
+        self.assertIn("apache kafka", [s["skill"] for s in tfidf["backend"]])
+
+    def test_invalid_params_are_rejected(self):
+        """Test that invalid values return 400 without creating a report."""
+        for body in ({"top_k": 0}, {"top_k": "many"}, {"ngram_range": [2, 1]}, {"ngram_range": "1-2"}):
+            response = self.client.post("/report/", body, format="json")
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn("error", response.data)
+        self.assertFalse(AnalysisReport.objects.exists())
+
+    def test_snapshot_report_matches_database_report(self):
+        """Test that a report read from the Arrow snapshot equals one read through the ORM."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        results = {}
+        for enabled in (False, True):
+            with self.settings(ANALYSIS_SNAPSHOT_ENABLED=enabled, ANALYSIS_SNAPSHOT_DIR=directory):
+                if enabled:
+                    call_command("snapshot_job_descriptions", stdout=StringIO())
+                    with mock.patch("report.views.AnalysisService.build_queryset_analyst") as queryset_analyst:
+                        response = self.client.post("/report/", {"top_k": 5, "force": True}, format="json")
+                    queryset_analyst.assert_not_called()
+                else:
+                    response = self.client.post("/report/", {"top_k": 5, "force": True}, format="json")
+            report = AnalysisReport.objects.get(pk=response.data["id"])
+            results[enabled] = {r.name: r.result for r in report.results.all()}
+
+        self.assertEqual(results[True], results[False])
+
+
+class ReportDuplicatesTest(TestCase):
+    """Test cases for the near-duplicate clusters endpoint."""
+
+    def test_clusters_list_reposts(self):
+        """Test that reposts of one job form a cluster with their applications and JobDescriptions."""
+        posting = "Senior backend engineer, Python and Django on AWS, hybrid in Dublin, posted {}."
+        application = Application.objects.create(company="ACME", job_title="Engineer")
+        texts = [
+            JobDescriptionText.objects.create(text=posting.format("1 May"), application=application),
+            JobDescriptionText.objects.create(text=posting.format("1 May")),
+            JobDescriptionText.objects.create(text="Frontend developer with React and TypeScript."),
+        ]
+        jd = JobDescription.objects.create(job_text=texts[0], role="backend")
+
+        response = APIClient().get("/report/duplicates/", {"threshold": 0.9})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["clusters"], [[
+            {"job_text_id": texts[0].id, "application_id": application.id, "job_description_id": jd.id},
+            {"job_text_id": texts[1].id, "application_id": None, "job_description_id": None},
+        ]])
+        self.assertEqual(APIClient().get("/report/duplicates/", {"threshold": 2}).status_code, 400)
+
+
+@override_settings(ANALYSIS_SKILL_TOKENIZER="structured", ANALYSIS_TOKEN_CACHE_PATH="", ANALYSIS_AGGREGATE_TABLES=True)
+class ReportDailyBucketsTest(TestCase):
+    """Test cases for date-range reports served from the day buckets."""
+
+    def setUp(self):
+        """Create JDs on two days."""
+        self.client = APIClient()
+        for day, databases in (("2025-03-01", ["mysql"]), ("2025-03-02", ["redis", "mysql"]), ("2025-03-02", [])):
+            jd = JobDescription.objects.create(
+                job_text=JobDescriptionText.objects.create(text="JD text"), role="backend", level="Senior",
+                databases=databases, salary_eur_min=50000.0,
+            )
+            jd.created_at = make_aware(datetime.fromisoformat(f"{day}T10:00:00"))
+            jd.save()
+
+    def test_daily_endpoint_merges_buckets(self):
+        """Test that the endpoint sums the buckets of the requested days."""
+        response = self.client.get("/report/daily/", {"start": "2025-03-02", "end": "2025-03-31"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["jobs"], 2)
+        self.assertEqual(response.data["frequencies"]["databases"], {"mysql": 1, "redis": 1})
+        self.assertEqual(response.data["frequencies"]["level"], {"senior": 2})
+        self.assertEqual(response.data["numbers"]["salary_eur_min"], {50000.0: 2})
+
+        with self.assertNumQueries(4):
+            self.client.get("/report/daily/", {"start": "2025-03-01", "end": "2025-03-31"})
+
+    def test_invalid_dates_are_rejected(self):
+        """Test that malformed or reversed dates return 400."""
+        for params in ({}, {"start": "2025-03-02", "end": "March"}, {"start": "2025-03-02", "end": "2025-03-01"}):
+            response = self.client.get("/report/daily/", params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_whole_day_report_matches_recomputed_report(self):
+        """Test that a whole-day range report merged from buckets equals the recomputed one."""
+        body = {"start_at": "2025-03-02T00:00:00", "end_at": "2025-03-02T23:59:59", "force": True}
+        results = {}
+        for enabled in (False, True):
+            with self.settings(ANALYSIS_AGGREGATE_TABLES=enabled), \
+                    mock.patch("report.services.generate_report.aggregates.get_range_frequencies",
+                               wraps=aggregates.get_range_frequencies) as range_frequencies:
+                response = self.client.post("/report/", body, format="json")
+            self.assertEqual(range_frequencies.called, enabled)
+            report = AnalysisReport.objects.get(pk=response.data["id"])
+            results[enabled] = {r.name: r.result for r in report.results.all()}
+
+        self.assertEqual(results[True], results[False])
+        self.assertEqual(results[True]["freq.databases"], {"mysql": 1, "redis": 1})
+
+    def test_last_second_of_the_day_is_in_both_paths(self):
+        """Test that a JD created at 23:59:59.5 is in the whole-day report with and without buckets."""
+        jd = JobDescription.objects.create(
+            job_text=JobDescriptionText.objects.create(text="JD text"), role="backend", databases=["neo4j"],
+        )
+        jd.created_at = make_aware(datetime.fromisoformat("2025-03-02T23:59:59.500000"))
+        jd.save()
+        body = {"start_at": "2025-03-02T00:00:00", "end_at": "2025-03-02T23:59:59", "force": True}
+        results = {}
+        for enabled in (False, True):
+            with self.settings(ANALYSIS_AGGREGATE_TABLES=enabled):
+                response = self.client.post("/report/", body, format="json")
+            report = AnalysisReport.objects.get(pk=response.data["id"])
+            results[enabled] = report.results.get(name="freq.databases").result
+
+        self.assertEqual(results[True], results[False])
+        self.assertEqual(results[True], {"mysql": 1, "redis": 1, "neo4j": 1})
+
+    def test_tables_are_not_served_with_another_tokenizer(self):
+        """Test that reports are recomputed when the tables' structured skills would not match the tokenizer."""
+        body = {"start_at": "2025-03-02T00:00:00", "end_at": "2025-03-02T23:59:59", "force": True}
+        with self.settings(ANALYSIS_SKILL_TOKENIZER="spacy"), \
+                mock.patch("report.services.generate_report.aggregates.get_range_frequencies") as range_frequencies, \
+                mock.patch("report.services.generate_report.aggregates.get_PMI_networks") as pmi:
+            self.client.post("/report/", body, format="json")
+            self.client.post("/report/", {"force": True}, format="json")
+
+        range_frequencies.assert_not_called()
+        pmi.assert_not_called()
+
+    def test_daily_endpoint_requires_the_tables(self):
+        """Test that the endpoint refuses to serve unmaintained buckets."""
+        with self.settings(ANALYSIS_AGGREGATE_TABLES=False):
+            response = self.client.get("/report/daily/", {"start": "2025-03-01", "end": "2025-03-31"})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(ANALYSIS_SKILL_TOKENIZER="structured", ANALYSIS_TOKEN_CACHE_PATH="")
+class ReportReuseTest(TestCase):
+    """Test cases for fingerprinted report reuse."""
+
+    def setUp(self):
+        """Create two JDs."""
+        self.client = APIClient()
+        self.jds = [
+            JobDescription.objects.create(
+                job_text=JobDescriptionText.objects.create(text="JD text"), role=role, programming_languages=["python"],
+            )
+            for role in ("backend", "frontend")
+        ]
+
+    def post(self, body):
+        response = self.client.post("/report/", body, format="json")
+        self.assertIn(response.status_code, (200, 201))
+        return response
+
+    def test_identical_request_returns_existing_report(self):
+        """Test that repeating a request returns the first report without recomputing."""
+        first = self.post({"job_ids": [self.jds[0].id]})
+        self.assertEqual(first.status_code, 201)
+
+        with mock.patch("report.views.AnalysisService.generate_report") as generate:
+            second = self.post({"job_ids": [self.jds[0].id]})
+        generate.assert_not_called()
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data["id"], first.data["id"])
+        self.assertEqual(AnalysisReport.objects.count(), 1)
+
+    def test_force_recomputes(self):
+        """Test that `force` creates a new report for an identical request."""
+        first = self.post({})
+        second = self.post({"force": "true"})
+
+        self.assertEqual(second.status_code, 201)
+        self.assertNotEqual(second.data["id"], first.data["id"])
+        self.assertEqual(second.data["fingerprint"], first.data["fingerprint"])
+
+    def test_selection_edits_and_config_change_the_fingerprint(self):
+        """Test that other JDs, an edited JD or other parameters are not served from the old report."""
+        ids = {self.post({}).data["id"]}
+        ids.add(self.post({"job_ids": [self.jds[1].id]}).data["id"])
+        ids.add(self.post({"top_k": 3}).data["id"])
+        self.jds[1].programming_languages = ["rust"]
+        self.jds[1].save()
+        ids.add(self.post({}).data["id"])
+
+        self.assertEqual(len(ids), 4)
+        self.assertEqual(AnalysisReport.objects.count(), 4)
+
+    def test_pipeline_reuses_report(self):
+        """Test that the extraction pipeline returns the report of the same extracted JDs."""
+        application = Application.objects.create(company="ACME", job_title="Engineer")
+        JobDescriptionText.objects.filter(pk=self.jds[0].job_text_id).update(application=application)
+
+        with mock.patch("report.services.pipeline_service.process_extract", return_value=[self.jds[0]]):
+            first = PipelineService.run_extraction_pipeline(job_ids=[application.id])
+            second = PipelineService.run_extraction_pipeline(job_ids=[application.id])
+            forced = PipelineService.run_extraction_pipeline(job_ids=[application.id], force=True)
+
+        self.assertEqual(second.id, first.id)
+        self.assertNotEqual(forced.id, first.id)
+        # The extraction of the second run is timed on the reused report
+        self.assertEqual(ReportStageTiming.objects.filter(report=first, stage="llm.extraction").count(), 2)
+        # An API request for the same JDs with default parameters is served the pipeline's latest report
+        response = self.post({"job_ids": [self.jds[0].id]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], forced.id)
+
+
+@override_settings(ANALYSIS_SKILL_TOKENIZER="structured", ANALYSIS_TOKEN_CACHE_PATH="")
+class ReportSelectiveAnalysesTest(TestCase):
+    """Test cases for computing selected analyses and filling in the others."""
+
+    def setUp(self):
+        """Create JDs where python and django go together."""
+        self.client = APIClient()
+        self.jds = [
+            JobDescription.objects.create(
+                job_text=JobDescriptionText.objects.create(text="JD text"), role=role,
+                programming_languages=languages, frameworks_tools=tools,
+            )
+            for role, languages, tools in (
+                ("backend", ["python"], ["django"]),
+                ("backend", ["python"], ["django"]),
+                ("data", ["sql"], ["spark"]),
+            )
+        ]
+
+    def test_only_requested_analyses_are_computed(self):
+        """Test that unrequested analyses are neither run nor stored."""
+        with mock.patch("analysis.tools.analyst.Analyst.assess_swiss_knife_job") as swiss_knife, \
+                mock.patch("analysis.tools.analyst.Analyst.get_pos_tags_tokens") as pos:
+            response = self.client.post(
+                "/report/", {"analyses": ["graph.skills", "freq.role"], "min_cofreq": 1}, format="json"
+            )
+        swiss_knife.assert_not_called()
+        pos.assert_not_called()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["analyses"], ["freq.role", "graph.skills"])
+        self.assertIn("swiss_knife", response.data["missing_analyses"])
+        graph = next(r["result"] for r in response.data["results"] if r["name"] == "graph.skills")
+        self.assertEqual([(edge["source"], edge["target"]) for edge in graph], [("django", "python"), ("spark", "sql")])
+
+    def test_aggregate_served_analyses_do_not_read_the_rows(self):
+        """Test that a report answered from the aggregate tables streams no JobDescription rows."""
+        with self.settings(ANALYSIS_AGGREGATE_TABLES=True, ANALYSIS_STREAM_CHUNK_SIZE=500):
+            call_command("rebuild_skill_aggregates", stdout=StringIO())
+            with mock.patch("analysis.tools.streaming.StreamingAnalyst._consume") as consume:
+                response = self.client.post(
+                    "/report/", {"analyses": ["graph.skills", "freq.databases"], "min_cofreq": 1}, format="json"
+                )
+        consume.assert_not_called()
+
+        self.assertEqual(response.status_code, 201)
+        graph = next(r["result"] for r in response.data["results"] if r["name"] == "graph.skills")
+        self.assertEqual([(edge["source"], edge["target"]) for edge in graph], [("django", "python"), ("spark", "sql")])
+        self.assertNotIn("prepare", [t["stage"] for t in response.data["timings"]])
+
+    def test_missing_analyses_are_filled_in_on_the_same_report(self):
+        """Test that the fill endpoint and a reusing request add results to the existing report."""
+        report_id = self.client.post("/report/", {"analyses": ["freq.role"]}, format="json").data["id"]
+
+        filled = self.client.post(f"/report/{report_id}/fill/", {"analyses": ["swiss_knife"]}, format="json")
+        self.assertEqual(filled.status_code, 200)
+        self.assertEqual(filled.data["analyses"], ["freq.role", "swiss_knife"])
+
+        reused = self.client.post("/report/", {"analyses": ["tfidf.skills"]}, format="json")
+        self.assertEqual(reused.status_code, 200)
+        self.assertEqual(reused.data["id"], report_id)
+        self.assertEqual(reused.data["analyses"], ["freq.role", "tfidf.skills", "swiss_knife"])
+
+        complete = self.client.post(f"/report/{report_id}/fill/", {}, format="json")
+        self.assertEqual(complete.data["missing_analyses"], [])
+        self.assertEqual(AnalysisReport.objects.count(), 1)
+
+    def test_fill_rejects_stale_reports(self):
+        """Test that a report is not filled in once its JDs changed."""
+        report_id = self.client.post(
+            "/report/", {"job_ids": [self.jds[0].id], "analyses": ["freq.role"]}, format="json"
+        ).data["id"]
+        self.jds[0].role = "frontend"
+        self.jds[0].save()
+
+        response = self.client.post(f"/report/{report_id}/fill/", {}, format="json")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(AnalysisReport.objects.get(pk=report_id).results.count(), 1)
+
+    def test_invalid_analyses_are_rejected(self):
+        """Test that unknown analyses and bad graph parameters return 400."""
+        for body in ({"analyses": ["freq.salary"]}, {"analyses": []}, {"min_cofreq": 0}):
+            response = self.client.post("/report/", body, format="json")
+            self.assertEqual(response.status_code, 400, body)
+        self.assertEqual(AnalysisReport.objects.count(), 0)
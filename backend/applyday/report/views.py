@@ -1,48 +1,112 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
-from django.forms.models import model_to_dict
-from django.utils.timezone import make_aware
-from datetime import datetime
+from datetime import date
+from django.conf import settings
 from rest_framework.decorators import action
 
 from .models import AnalysisReport
 from .serializers import  AnalysisReportSerializer
-from .services.generate_report import AnalysisService
-from analysis.tools.analyst import Analyst
+from .services.generate_report import AnalysisService, StaleReportError
+from .services.timing import StageRecorder
 from ai.services.extract_jd import process_extract
-from application.models import JobDescription, Application
+from analysis import aggregates, duplicates
+from application.models import JobDescription, JobDescriptionText
 from report.services.pipeline_service import PipelineService
 
 
 class ReportViewSet(viewsets.ModelViewSet):
 
 
-    queryset = AnalysisReport.objects.all().prefetch_related("results")
+    queryset = AnalysisReport.objects.all().prefetch_related("results", "timings")
     serializer_class = AnalysisReportSerializer
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        job_ids = request.data.get("job_ids")
-        start_at = request.data.get("start_at")
-        end_at = request.data.get("end_at")
-
-        if job_ids:
-            jds = JobDescription.objects.filter(id__in=job_ids)
-        elif start_at and end_at:
-            start = make_aware(datetime.fromisoformat(start_at))
-            end = make_aware(datetime.fromisoformat(end_at))
-            jds = JobDescription.objects.filter(created_at__range=(start, end))
-        else:
-            jds = JobDescription.objects.all()
-
-        jd_dicts = [model_to_dict(jd) for jd in jds]
-        ana = Analyst(jd_dicts)
-
-        report = AnalysisService.generate_report(ana)
+        try:
+            tfidf_params = AnalysisService.parse_tfidf_params(request.data)
+            graph_params = AnalysisService.parse_graph_params(request.data)
+            analyses = AnalysisService.parse_analyses(request.data)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        selection = {
+            "job_ids": request.data.get("job_ids"),
+            "start_at": request.data.get("start_at"),
+            "end_at": request.data.get("end_at"),
+        }
+        force = AnalysisService.parse_flag(request.data.get("force", False))
+
+        # Returns the report of an identical earlier request (with any missing analyses
+        # filled in) unless `force` is set
+        report, created = AnalysisService.create_report(
+            selection, tfidf_params=tfidf_params, graph_params=graph_params, analyses=analyses,
+            force=force, recorder=StageRecorder(),
+        )
+        return Response(
+            self.get_serializer(report).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
 
-        return Response(self.get_serializer(report).data, status=status.HTTP_201_CREATED)
+    @action(detail=True, methods=['post'], url_path='fill')
+    def fill(self, request, pk=None):
+        """Computes the requested `analyses` (default: all) missing from the report."""
+        report = self.get_object()
+        try:
+            analyses = AnalysisService.parse_analyses(request.data)
+            report = AnalysisService.fill_report(report, analyses=analyses)
+        except StaleReportError as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        # Re-read the results prefetched by get_object
+        report = self.get_queryset().get(pk=report.pk)
+        return Response(self.get_serializer(report).data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='daily')
+    def daily(self, request, *args, **kwargs):
+        """Merges the day-bucket aggregates of JDs created from `start` to `end` (YYYY-MM-DD, inclusive)."""
+        try:
+            start = date.fromisoformat(request.query_params.get("start", ""))
+            end = date.fromisoformat(request.query_params.get("end", ""))
+        except ValueError:
+            return Response({"error": "start and end must be dates (YYYY-MM-DD)"}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end:
+            return Response({"error": "start must not be after end"}, status=status.HTTP_400_BAD_REQUEST)
+        if not settings.ANALYSIS_AGGREGATE_TABLES:
+            return Response({"error": "Day buckets require ANALYSIS_AGGREGATE_TABLES"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(aggregates.get_daily_aggregates(start, end), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='duplicates')
+    def duplicate_clusters(self, request, *args, **kwargs):
+        """Lists clusters of near-duplicate JD texts with an estimated similarity of at least `threshold`."""
+        try:
+            threshold = duplicates.parse_threshold(request.query_params.get("threshold"))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        clusters = duplicates.clusters(threshold)
+        texts = JobDescriptionText.objects.in_bulk([text_id for cluster in clusters for text_id in cluster])
+        extracted = dict(
+            JobDescription.objects.filter(job_text_id__in=texts).values_list("job_text_id", "id")
+        )
+        return Response(
+            {
+                "threshold": threshold,
+                "clusters": [
+                    [
+                        {
+                            "job_text_id": text_id,
+                            "application_id": texts[text_id].application_id,
+                            "job_description_id": extracted.get(text_id),
+                        }
+                        for text_id in cluster
+                    ]
+                    for cluster in clusters
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
 
     @action(detail=False, methods=['post'], url_path='extract')
     def process_extract(self, request, *args, **kwargs):
@@ -50,13 +114,15 @@ class ReportViewSet(viewsets.ModelViewSet):
         start = request.data.get("start")
         end = request.data.get('end')
         ids = request.data.get("job_ids", [])
-        
+        reuse = request.data.get("reuse_duplicates")
+        reuse = None if reuse is None else AnalysisService.parse_flag(reuse)
+
         if ids:
-            process_extract(job_ids=ids)
+            process_extract(job_ids=ids, reuse_duplicates=reuse)
         elif start and end:
-            process_extract(start=start, end=end)
+            process_extract(start=start, end=end, reuse_duplicates=reuse)
         else:
-            process_extract()
+            process_extract(reuse_duplicates=reuse)
 
         return Response({"message": "Extraction completed"}, status=status.HTTP_200_OK)
     
@@ -65,9 +131,10 @@ class ReportViewSet(viewsets.ModelViewSet):
         job_ids = request.data.get("job_ids", [])
         resume_id = request.data.get("resume_id")
         languages = request.data.get("languages" )
+        force = AnalysisService.parse_flag(request.data.get("force", False))
 
 
-        report = PipelineService.run_extraction_pipeline(job_ids=job_ids or None)
+        report = PipelineService.run_extraction_pipeline(job_ids=job_ids or None, force=force)
         summary = PipelineService.run_insight_pipeline(report.id, resume_id, languages=languages)
 
         serializer = AnalysisReportSerializer(report)
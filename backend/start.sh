@@ -8,6 +8,24 @@ sleep 5
 echo "Running database migrations..."
 python manage.py migrate
 
+# Fill the incremental analysis aggregate tables on first start; signals keep them in sync afterwards.
+# Set ANALYSIS_REBUILD_AGGREGATES=True to force a full rebuild (e.g. after enabling them on an existing database)
+if [ "${ANALYSIS_AGGREGATE_TABLES:-False}" = "True" ] || [ "${ANALYSIS_AGGREGATE_TABLES}" = "true" ]; then
+    if [ "${ANALYSIS_REBUILD_AGGREGATES:-False}" = "True" ] || [ "${ANALYSIS_REBUILD_AGGREGATES}" = "true" ]; then
+        echo "Rebuilding analysis aggregate tables..."
+        python manage.py rebuild_skill_aggregates
+    else
+        echo "Filling empty analysis aggregate tables..."
+        python manage.py rebuild_skill_aggregates --if-empty
+    fi
+fi
+
+# Compact the Arrow snapshot of JobDescription used by reports
+if [ "${ANALYSIS_SNAPSHOT_ENABLED:-False}" = "True" ] || [ "${ANALYSIS_SNAPSHOT_ENABLED}" = "true" ]; then
+    echo "Writing JobDescription analytics snapshot..."
+    python manage.py snapshot_job_descriptions
+fi
+
 # Collect static files
 echo "Collecting static files..."
 python manage.py collectstatic --noinput